@@ -52,7 +52,6 @@ from ai_companion.graph.utils.chains import (
 from ai_companion.graph.utils.helpers import (                          # Helper functions
     get_chat_model,               # Gets configured Groq LLM (Llama 3.3)
     get_text_to_image_module,     # Gets FLUX image generator
-    get_text_to_speech_module,    # Gets ElevenLabs voice synthesizer
 )
 
 # Vector DB manager
@@ -163,6 +162,23 @@ def context_injection_node(state: AICompanionState):
     return {"apply_activity": apply_activity, "current_activity": schedule_context}
 
 
+def _reply_messages(state: AICompanionState):
+    """🪟 REPLY WINDOW - The messages a reply is written from (phone calls only see the latest few)
+
+    Every phone-call turn waits on this LLM call while the caller hears silence, so voice turns
+    send just the last settings.VAPI_MAX_HISTORY messages (older turns still reach the prompt
+    through the conversation summary). The saved thread itself is left untouched.
+    """
+    messages = state["messages"]
+    if state.get("interface") != "voice" or len(messages) <= settings.VAPI_MAX_HISTORY:
+        return messages
+    window = messages[-settings.VAPI_MAX_HISTORY :]
+    # Start the window on something the caller said, not halfway through Pepper's answer
+    while len(window) > 1 and not isinstance(window[0], HumanMessage):
+        window = window[1:]
+    return window
+
+
 async def conversation_node(state: AICompanionState, config: RunnableConfig):
     """
     💬 TEXT RESPONSE GENERATOR - The main "thinking" node that creates Pepper's replies
@@ -196,14 +212,14 @@ async def conversation_node(state: AICompanionState, config: RunnableConfig):
     # What is this chain? It's: Pepper's personality prompt + LLM + output parsing
     # Why pass summary? For long conversations, include previous chat summary
     # Located in: ai_companion/graph/utils/chains.py (get_character_response_chain function)
-    chain = get_character_response_chain(state.get("summary", ""))
+    chain = await get_character_response_chain(state.get("summary", ""))
     
     # STEP 3: Generate the response using ALL pepperilable context
     # This is where the magic happens! All context pieces come together
     response = await chain.ainvoke(
         {
-            # Everything that's been said in this conversation
-            "messages": state["messages"],
+            # Everything that's been said in this conversation (phone calls: the latest few)
+            "messages": _reply_messages(state),
             # What Pepper is currently doing ("coding", "reading papers", etc.)
             "current_activity": current_activity,
             # What she knows about you personally ("developer", "likes pizza", etc.)
@@ -231,7 +247,7 @@ async def image_node(state: AICompanionState, config: RunnableConfig):
     current_activity = ScheduleContextGenerator.get_current_activity()
     memory_context = state.get("memory_context", "")
 
-    chain = get_character_response_chain(state.get("summary", ""))  # For text caption
+    chain = await get_character_response_chain(state.get("summary", ""))  # For text caption
     text_to_image_module = get_text_to_image_module()  # FLUX image generator
 
     # Step 1: Create image scenario based on recent conversation
@@ -260,31 +276,29 @@ async def image_node(state: AICompanionState, config: RunnableConfig):
 async def audio_node(state: AICompanionState, config: RunnableConfig):
     """🎵 VOICE RESPONSE GENERATOR - Creates Pepper's voice notes
     
-    Two-step process:
-    1. Generate text response (same as conversation_node)
-    2. Convert text to speech using ElevenLabs TTS
+    Generates the text Pepper will SAY. The interface (Chainlit / WhatsApp) turns it into
+    speech with ElevenLabs when it sees workflow == "audio" - that way the MP3 bytes are never
+    written into the conversation checkpoint database, and the interface can start sending
+    audio as soon as synthesis begins instead of waiting for the whole graph run.
     
     Result: Pepper sends you a voice note instead of text!
     """
     current_activity = ScheduleContextGenerator.get_current_activity()
     memory_context = state.get("memory_context", "")
 
-    chain = get_character_response_chain(state.get("summary", ""))  # Generate text first
-    text_to_speech_module = get_text_to_speech_module()  # ElevenLabs TTS
+    chain = await get_character_response_chain(state.get("summary", ""))  # Generate the spoken text
 
-    # Step 1: Generate text response (same logic as conversation_node)
+    # Generate text response (same logic as conversation_node)
     response = await chain.ainvoke(
         {
-            "messages": state["messages"],      # Conversation history
+            "messages": _reply_messages(state), # Conversation history (phone calls: the latest few)
             "current_activity": current_activity, # What Pepper is doing
             "memory_context": memory_context,     # What she knows about you
         },
         config,
     )
-    # Step 2: Convert text to speech using Pepper's voice
-    output_audio = await text_to_speech_module.synthesize(response)  # Text → Audio bytes
 
-    return {"messages": response, "audio_buffer": output_audio}  # Text + audio data
+    return {"messages": AIMessage(content=response)}  # Text only - the interface voices it
 
 
 async def summarize_conversation_node(state: AICompanionState):
@@ -439,8 +453,9 @@ Once you provide it, I'll call you right away! 📱"""
         # STEP 3: INITIATE PHONE CALL VIA VAPI
         # Import Vapi client (import here to handle cases where Vapi isn't pepperilable)
         try:
-            from ai_companion.interfaces.vapi.vapi_client import vapi_client
-            
+            from ai_companion.interfaces.vapi.vapi_client import get_vapi_client
+
+            vapi_client = await get_vapi_client()  # Created on first use, then shared
             if vapi_client is None:
                 # LOG VAPI CLIENT INITIALIZATION FAILURE
                 import logging
@@ -475,13 +490,13 @@ I'm still here to help via messages! 💬"""
         except Exception as vapi_error:
             # HANDLE VAPI-SPECIFIC ERRORS
             import logging
-            logging.error(f"🚨 VAPI CALL ERROR: {str(vapi_error)}")
-            logging.error(f"   📱 Target phone: {user_phone}")
-            logging.error(f"   👤 User context: {voice_context.get('userName', 'Unknown') if 'voice_context' in locals() else 'Context not created'}")
-            logging.error(f"   📏 Context size: {len(str(voice_context)) if 'voice_context' in locals() else 0} characters")
-            # Include full exception details for debugging
-            import traceback
-            logging.error(f"   📚 Full traceback: {traceback.format_exc()}")
+            # logging.exception() = error message + full traceback in one record
+            # (the traceback is only formatted if the record is actually emitted)
+            logging.exception(
+                "🚨 VAPI CALL ERROR: %s | phone=%s user=%s",
+                vapi_error, user_phone,
+                voice_context.get('userName', 'Unknown') if 'voice_context' in locals() else 'Context not created',
+            )
             
             vapi_error_message = f"""❌ I encountered an issue while setting up your call.
             
@@ -538,14 +553,12 @@ Looking forward to talking with you! 📱✨"""
     except Exception as e:
         # GENERAL ERROR HANDLING - If anything unexpected goes wrong
         import logging
-        logging.error(f"🚨 VOICE CALLING NODE ERROR: {str(e)}")
-        logging.error(f"   📱 Phone number: {state.get('user_phone_number', 'Not provided')}")
-        logging.error(f"   🆔 User ID: {state.get('user_id', 'Not provided')}")
-        logging.error(f"   💬 Messages count: {len(state.get('messages', []))}")
-        logging.error(f"   🗺 State keys: {list(state.keys())}")
-        # Include full exception details for debugging
-        import traceback
-        logging.error(f"   📚 Full traceback: {traceback.format_exc()}")
+        # logging.exception() = error message + full traceback in one record
+        logging.exception(
+            "🚨 VOICE CALLING NODE ERROR: %s | phone=%s user_id=%s messages=%d state_keys=%s",
+            e, state.get('user_phone_number', 'Not provided'), state.get('user_id', 'Not provided'),
+            len(state.get('messages', [])), list(state.keys()),
+        )
         
         # Provide helpful WhatsApp response even if call fails
         error_message = f"""❌ I had trouble setting up your phone call.
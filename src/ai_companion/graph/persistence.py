@@ -0,0 +1,88 @@
+"""
+💾 pepper'S SHARED, PERSISTENT BRAIN - One compiled graph + one SQLite checkpointer per process
+
+WHAT IS THIS FILE?
+graph.py builds the blueprint; this file turns it into the graph the interfaces actually run -
+compiled ONCE with the SQLite memory (checkpointer) attached, then reused for every message.
+
+WHY NOT OPEN IT PER MESSAGE?
+Opening AsyncSqliteSaver re-opens the database file (plus its -wal/-shm files) and compile()
+rebuilds the whole LangGraph state machine. Doing that on every WhatsApp message or Chainlit
+turn added file-system work and CPU to every single reply for no benefit.
+
+WHY EVERY CHECKPOINT IS COMMITTED RIGHT AWAY:
+The saver commits after each checkpoint write - several per message as the graph moves
+router → response → summarize. With WAL + synchronous=NORMAL (below) a commit is just an
+append to the -wal file with no fsync, so batching a turn's writes would save very little -
+and holding them back would mean a crash or worker restart mid-turn loses the whole turn.
+Committing as it goes keeps every step LangGraph has finished safely on disk.
+
+USED BY:
+- Chainlit interface: on_chat_start, on_message, on_audio_end
+- WhatsApp interface: whatsapp_handler (webhook server's lifespan builds it at startup, closes it at shutdown)
+- Vapi interface: /vapi/chat/completions (one thread per phone call)
+All call get_graph() - conversations stay separate because every run has its own thread_id.
+"""
+
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from ai_companion.graph import graph_builder
+from ai_companion.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# FASTER, FRIENDLIER SQLITE - applied once when the connection opens
+# journal_mode=WAL = writes go to a log file, readers don't block the writer
+# synchronous=NORMAL = skip the per-commit fsync (still crash-safe in WAL mode)
+# busy_timeout=5000 = if the file is locked (e.g. another worker process), wait up to 5s instead of failing
+# cache_size=-65536 = keep up to 64MB of database pages in memory (negative = size in KB)
+# temp_store=MEMORY / mmap_size = keep temp tables in RAM, read the file via mmap
+# SQLite checkpoints the WAL back into the main file on its own every ~1000 pages
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# The exit stack holds the checkpointer's connection open until the process exits
+_exit_stack = AsyncExitStack()
+_checkpointer = None  # The one AsyncSqliteSaver behind the shared graph
+_graph = None
+_graph_lock = asyncio.Lock()
+
+
+async def get_graph():
+    """🧠 SHARED GRAPH - Returns Pepper's compiled workflow, building it on first use"""
+    global _checkpointer, _graph
+    if _graph is None:
+        async with _graph_lock:
+            # Check again - another handler may have built it while we waited for the lock
+            if _graph is None:
+                # AsyncSqliteSaver = Pepper's memory system (one database for every conversation)
+                short_term_memory = await _exit_stack.enter_async_context(
+                    AsyncSqliteSaver.from_conn_string(settings.SHORT_TERM_MEMORY_DB_PATH)
+                )
+                for pragma in SQLITE_PRAGMAS:
+                    await short_term_memory.conn.execute(pragma)
+                # checkpointer=short_term_memory = connect memory so Pepper remembers conversations
+                _checkpointer = short_term_memory
+                _graph = graph_builder.compile(checkpointer=short_term_memory)
+                # Introspect the compiled graph once - no recompiling just to see its layout
+                logger.info("Pepper graph ready: %s", ", ".join(_graph.get_graph().nodes))
+    return _graph
+
+
+async def close_graph():
+    """🔒 SHUTDOWN - Closes the SQLite connection behind the shared graph"""
+    global _checkpointer, _graph
+    async with _graph_lock:
+        await _exit_stack.aclose()
+        _checkpointer = None
+        _graph = None
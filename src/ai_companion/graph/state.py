@@ -1,41 +1,10 @@
-"""
-angGraph models agent workflows as graphs, using three main components:
-
-🔶 State - A shared data structure that tracks the current status of your app (workflow).
-
-🔶 Nodes - Python functions that define the agent behaviour. They take in the current state, perform actions, and return the updated state.
-
-🔶 Edges - Python functions that decide which Node runs next based on the State, allowing for conditional or fixed transitions (we'll see an example of conditional edge later 😉)
-
-By combining Nodes and Edges, you can build dynamic workflows, like Pepper! In the next section, we'll take a look at Pepper's graph and its Nodes and Edges.
-
-
-"""
+"""🧠 pepper'S STATE - The shared clipboard passed between graph nodes (see docs/graph_internals.md)."""
 from typing import Dict
 from langgraph.graph import MessagesState
 
 
 class AICompanionState(MessagesState):
-    """
-    🧠 pepper'S WORKING MEMORY - The "clipboard" that gets passed between all graph nodes
-    
-    This is like Pepper's scratch pad that accumulates information as your message 
-    flows through her brain. Each node can read from and write to these fields.
-    
-    Extends MessagesState to automatically get:
-    - messages: List[BaseMessage] - Full conversation history 
-    - This gives us chat context for free!
-
-    As we mentioned earlier, LangGraph keeps track of your app's current status using the State. Pepper's state has these attributes:
-
-    summary - The summary of the conversation so far (more on this in Lesson 3)
-
-    workflow - The current workflow Pepper is in. Can be "conversation", "image" or "audio". More on this when we talk about the Router Node.
-
-    audio_buffer - The buffer containing audio data for voice messages. This is something we'll cover in Speech Modules. 
-
-    image_path - Path to the current image being generated. More about this in Image Generation Module.
-    """
+    """🧠 pepper'S WORKING MEMORY - The "clipboard" that gets passed between all graph nodes"""
 
     # 💭 CONVERSATION MANAGEMENT
     summary: str           # Summary of the conversation so far
@@ -47,11 +16,6 @@ class AICompanionState(MessagesState):
                          # Values: "conversation" | "image" | "audio"
                          # This tells the graph which response node to execute
 
-    # 🎵 AUDIO PROCESSING
-    audio_buffer: bytes   # Raw audio data when user sends voice note
-                         # Gets filled by WhatsApp handler, processed by speech nodes
-                         # Empty for text messages
-
     # 🖼️ IMAGE GENERATION
     image_path: str       # File path where generated image is saved
                          # Used by WhatsApp handler to send image back to user
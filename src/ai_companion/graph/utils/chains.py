@@ -1,41 +1,7 @@
-"""
-🔗 pepper'S BRAIN ASSEMBLY LINE - Where prompts get connected to AI models to create "chains"
-
-WHAT IS THIS FILE?
-This file creates "chains" - pre-assembled combinations of:
-- PROMPT (the instructions for the AI)
-- MODEL (the AI that follows the instructions)  
-- OUTPUT PARSER (cleans up the AI's response)
-
-Think of it like assembling a sandwich:
-- Prompt = The recipe ("make a ham sandwich")
-- Model = The chef (AI that follows the recipe)
-- Parser = Quality control (removes burned edges)
-
-WHY ARE CHAINS IMPORTANT?
-Instead of manually connecting prompts + models + parsers every time,
-chains pre-package them for easy reuse. Like having pre-made meal kits!
-
-THE CHAIN CONCEPT:
-prompt | model | parser
-This "|" symbol means "pipe the output to the next step"
-Like: Instructions → AI → Clean Response
-
-HOW CHAINS ARE USED IN pepper:
-1. router_node calls get_router_chain() → decides text/image/audio
-2. conversation_node calls get_character_response_chain() → generates Pepper's personality
-3. All other response nodes use these same chains
-
-REAL EXAMPLE FLOW:
-You: "What are you up to?"
-→ get_router_chain(): ROUTER_PROMPT + Groq + RouterResponse = "image"
-→ get_character_response_chain(): CHARACTER_CARD_PROMPT + Groq + Parser = "I'm coding!"
-
-THE TWO MAIN CHAINS:
-🤖 get_router_chain() - Decides how to respond (text/image/audio)
-👩‍💻 get_character_response_chain() - Generates Pepper's personality responses
-"""
+"""🔗 pepper'S BRAIN ASSEMBLY LINE - Where prompts get connected to AI models to create "chains" (see docs/graph_internals.md)."""
 
+# LangChain message type for the optional conversation summary slot
+from langchain_core.messages import HumanMessage, SystemMessage
 # LangChain core components for building prompt templates
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 # Pydantic for structured output validation
@@ -44,60 +10,49 @@ from pydantic import BaseModel, Field
 # Our custom prompts (the "instructions" for the AI)
 from ai_companion.core.prompts import CHARACTER_CARD_PROMPT, ROUTER_PROMPT
 # Helper functions and parsers
-from ai_companion.graph.utils.helpers import AsteriskRemovalParser, get_chat_model
+from ai_companion.graph.utils.helpers import ASTERISK_PARSER, get_chat_model, get_or_create_persona_cache
+
+
+# pepper'S PERSONALITY PROMPT - Built once at import and shared by every conversation turn
+# The character card never changes, so there's no reason to rebuild it (or copy it into a
+# new multi-KB string) on every call. The summary gets its OWN optional system message slot:
+# - optional=True means the slot simply renders as nothing when there's no summary yet
+# - get_character_response_chain() fills it with .partial() only when a summary exists
+CHARACTER_RESPONSE_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        ("system", CHARACTER_CARD_PROMPT),                             # Pepper's complete personality
+        MessagesPlaceholder(variable_name="summary", optional=True),   # Earlier-conversation summary (if any)
+        MessagesPlaceholder(variable_name="messages"),                 # Current conversation messages
+    ]
+)
+
+
+# CACHED VARIANT - used when the character card lives in Gemini's context cache
+# Gemini won't accept a system prompt alongside cached content, so the per-turn
+# details the card normally carries go in a context note as the first message
+CACHED_CHARACTER_RESPONSE_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "human",
+            "[Context note - not part of the chat]\n"
+            "What you remember about this person:\n{memory_context}\n\n"
+            "Your current activity (only mention this if they ask what you're up to):\n{current_activity}",
+        ),
+        MessagesPlaceholder(variable_name="summary", optional=True),   # Earlier-conversation summary (if any)
+        MessagesPlaceholder(variable_name="messages"),                 # Current conversation messages
+    ]
+)
 
 
 class RouterResponse(BaseModel):
-    """
-    📋 STRUCTURED OUTPUT FORMAT - Forces the router to return valid responses only
-    
-    WHAT IS THIS?
-    A Pydantic model that defines exactly what the router AI can return.
-    Think of it as a form with strict validation rules.
-    
-    WHY USE STRUCTURED OUTPUT?
-    Without this, AI might return:
-    - "I think you want an image response" (too verbose)
-    - "img" (wrong format)
-    - "conversation or maybe image?" (indecisive)
-    
-    WITH STRUCTURED OUTPUT, AI must return:
-    - RouterResponse(response_type="image") ✅
-    - RouterResponse(response_type="conversation") ✅
-    - RouterResponse(response_type="audio") ✅
-    - RouterResponse(response_type="voice_call") ✅
-    
-    HOW IT WORKS:
-    1. AI generates its decision
-    2. LangChain forces it into this RouterResponse format
-    3. If invalid, AI tries again until it fits the schema
-    4. We get guaranteed valid output: response.response_type
-    """
+    """📋 STRUCTURED OUTPUT FORMAT - Forces the router to return valid responses only"""
     response_type: str = Field(
         description="The response type to give to the user. It must be one of: 'conversation', 'image', 'audio', or 'voice_call'"
     )
 
 
 def get_router_chain():
-    """
-    🤖 THE DECISION MAKER CHAIN - Assembles the router that decides response type
-    
-    WHAT IT BUILDS:
-    A complete "decision-making assembly line" that takes conversation messages
-    and returns a structured decision about how Pepper should respond.
-    
-    THE ASSEMBLY LINE:
-    1. PROMPT: Takes messages + ROUTER_PROMPT instructions
-    2. MODEL: Google Gemini 2.5 Flash analyzes and decides  
-    3. STRUCTURED OUTPUT: Forces response into RouterResponse format
-    
-    WHY TEMPERATURE 0.3?
-    - Temperature = "creativity level" (0 = robotic, 1 = chaotic)
-    - 0.3 = slightly creative but mostly consistent
-    - We want consistent routing decisions, not random creativity
-    
-    THE CHAIN COMPONENTS EXPLAINED:
-    """
+    """🤖 THE DECISION MAKER CHAIN - Assembles the router that decides response type"""
     
     # STEP 1: Get the AI model with specific settings
     # get_chat_model() returns Google Gemini 2.5 Flash (from helpers.py)
@@ -122,56 +77,35 @@ def get_router_chain():
     return prompt | model
 
 
-def get_character_response_chain(summary: str = ""):
-    """
-    👩‍💻 pepper'S PERSONALITY CHAIN - Assembles the response generator with Pepper's complete personality
-    
-    WHAT IT BUILDS:
-    The complete "Pepper personality generator" that takes conversation context
-    and produces responses that sound exactly like Pepper - witty, tech-savvy, human.
-    
-    THE ASSEMBLY LINE:
-    1. PROMPT: Pepper's personality + conversation context + optional summary
-    2. MODEL: Google Gemini 2.5 Flash generates response in Pepper's voice
-    3. PARSER: Removes asterisk formatting (*like this*) for clean output
-    
-    WHY NO STRUCTURED OUTPUT?
-    Unlike the router, we want creative, natural text responses.
-    No rigid format needed - just Pepper being herself.
-    
-    SUMMARY PARAMETER:
-    - Used for long conversations that have been compressed
-    - Gives Pepper context about what happened earlier
-    - Example: "User discussed work projects, asked about weekend plans"
-    """
+async def get_character_response_chain(summary: str = ""):
+    """👩‍💻 pepper'S PERSONALITY CHAIN - Assembles the response generator with Pepper's complete personality"""
     
     # STEP 1: Get the AI model with default creativity settings
     # No temperature specified = uses default (0.7) for more natural responses
     # No structured output = AI can respond freely in natural language
-    model = get_chat_model()
+    # When the persona cache is on, the model references Pepper's cached character card
+    # instead of receiving it as a system prompt on every call
+    cache_name = await get_or_create_persona_cache()
+    model = get_chat_model(cached_content=cache_name)
     
-    # STEP 2: Build the system message (Pepper's personality instructions)
-    # Start with CHARACTER_CARD_PROMPT (Pepper's complete identity)
-    system_message = CHARACTER_CARD_PROMPT
+    # STEP 2: Start from the shared personality prompt (built once at import)
+    prompt = CACHED_CHARACTER_RESPONSE_PROMPT if cache_name else CHARACTER_RESPONSE_PROMPT
+    summary_message = HumanMessage if cache_name else SystemMessage  # No system messages with a cache
 
     # STEP 3: Add conversation summary if pepperilable (for long conversations)
     # This gives Pepper context about what happened before the current messages
     # Helps maintain consistency across long chats that have been summarized
+    # The summary goes into its own system message instead of being glued onto the
+    # character card, so the card itself is never copied or re-parsed as a template
     if summary:
-        system_message += f"\n\nSummary of conversation earlier between Pepper and the user: {summary}"
-
-    # STEP 4: Create the prompt template with personality + messages
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", system_message),                       # Pepper's complete personality + summary
-            MessagesPlaceholder(variable_name="messages"),    # Current conversation messages
-        ]
-    )
+        prompt = prompt.partial(
+            summary=[summary_message(content=f"Summary of conversation earlier between Pepper and the user: {summary}")]
+        )
 
-    # STEP 5: Chain everything together with output cleaning
+    # STEP 4: Chain everything together with output cleaning
     # prompt | model | AsteriskRemovalParser means:
     # 1. Send prompt to model
     # 2. Model generates response  
     # 3. Parser cleans up formatting (removes *emphasis* marks)
     # Result: Clean, natural-sounding Pepper responses
-    return prompt | model | AsteriskRemovalParser()
+    return prompt | model | ASTERISK_PARSER
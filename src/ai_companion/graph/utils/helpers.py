@@ -1,247 +1,298 @@
-"""
-🛠️ pepper'S UTILITY TOOLBOX - Helper functions that keep everything running smoothly
-
-WHAT IS THIS FILE?
-This file contains "helper functions" - small, reusable utilities that other parts
-of Pepper need. Think of it as a toolbox with useful gadgets:
-- AI model configurator (wrench)
-- Text cleaner (sandpaper)
-- Module factories (assembly tools)
-
-WHY CENTRALIZE HELPERS?
-Instead of repeating the same code everywhere, we put common utilities here:
-- get_chat_model() used by: router_node, conversation_node, summarize_node
-- Text/image/speech modules used by: all response nodes
-- Output parsers used by: chains that need clean text
-
-THE FACTORY PATTERN:
-These functions are "factories" - they create and configure objects:
-- get_chat_model() → Creates configured Groq AI model
-- get_text_to_speech_module() → Creates ElevenLabs TTS client
-- get_text_to_image_module() → Creates FLUX image generator
-
-REAL USAGE EXAMPLES:
-router_node: model = get_chat_model(temperature=0.3)  # Low creativity
-conversation_node: model = get_chat_model()           # Default creativity  
-audio_node: tts = get_text_to_speech_module()         # Voice synthesis
-image_node: tti = get_text_to_image_module()          # Image generation
-
-THE HELPER CATEGORIES:
-🤖 AI MODEL FACTORIES - Create configured AI service clients
-🧹 TEXT PARSERS - Clean up AI output formatting
-🏭 MODULE FACTORIES - Create media processing modules
-"""
-
-# Regular expressions for text cleaning
-import re
+"""🛠️ pepper'S UTILITY TOOLBOX - Helper functions that keep everything running smoothly (see docs/graph_internals.md)."""
 
+# Async lock so concurrent turns don't all create the persona cache at once
+import asyncio
+# Logging for the (optional) Gemini persona cache
+import logging
+# Thread-safe construction of the shared chat models
+import threading
+# Monotonic clock for the persona cache's TTL window
+import time
+# Python optimization: cache factory results so each module is only built once
+from functools import lru_cache
+# Type hints for the streaming parser methods
+from typing import AsyncIterator, Iterator, Optional, Union
+
+# LangChain message type (streamed chunks can arrive as messages instead of plain strings)
+from langchain_core.messages import BaseMessage
 # LangChain components for output processing
 from langchain_core.output_parsers import StrOutputParser
-# Groq integration for fast LLM inference
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
-
-# Our custom modules for different AI capabilities
-from ai_companion.modules.image.image_to_text import ImageToText    # Describe images
-from ai_companion.modules.image.text_to_image import TextToImage    # Generate images  
-from ai_companion.modules.speech import TextToSpeech               # Convert text to voice
+from langchain_core.outputs import ChatGeneration
+
+# NOTE: The heavy SDK imports (Gemini, ElevenLabs, Together, Groq vision) live INSIDE
+# the factory functions below. Importing helpers.py just for remove_asterisk_content
+# shouldn't pay for loading every AI SDK. Combined with @lru_cache, each import
+# still only happens once - the first time that factory is called.
+
 # Configuration settings
 from ai_companion.settings import settings
 
+logger = logging.getLogger(__name__)
+
+
+# ONE MODEL PER (TEMPERATURE, CACHE) - callers only ever pass a few literal values (0.3, 0.7)
+# Reusing the instance keeps Gemini's client + auth setup out of every node call.
+# Safe to share: .with_structured_output() and prompt | model build NEW runnables around it
+_CHAT_MODELS: dict = {}  # (temperature, cached_content) -> ChatGoogleGenerativeAI
+_CHAT_LOCK = threading.Lock()
+
+
+def get_chat_model(temperature: float = 0.7, cached_content: Optional[str] = None):
+    """🤖 AI MODEL FACTORY - Creates a configured Google Gemini model for text generation"""
+
+    # FAST PATH: plain dict lookup, no lock - this is what every call after the first hits
+    key = (temperature, cached_content)
+    model = _CHAT_MODELS.get(key)
+    if model is not None:
+        return model
+
+    # SLOW PATH: double-checked locking - if two threads (e.g. asyncio.to_thread calls)
+    # race here, the second one finds the first one's model instead of building another
+    with _CHAT_LOCK:
+        model = _CHAT_MODELS.get(key)
+        if model is None:
+            # Lazy import - Gemini SDK only loads when a node first needs the model
+            from langchain_google_genai import ChatGoogleGenerativeAI
+
+            # cached_content = name of a Gemini context cache (see get_or_create_persona_cache)
+            # Only passed when set, so the plain model is built exactly as before
+            extra_kwargs = {"cached_content": cached_content} if cached_content else {}
+
+            # 🌐 GOOGLE GEMINI 2.5 FLASH FOR RELIABLE STRUCTURED OUTPUT
+            # Replaced Groq to fix tool calling and structured output issues
+            model = ChatGoogleGenerativeAI(
+                model=settings.TEXT_MODEL_NAME,      # "gemini-2.5-flash" from settings
+                api_key=settings.GOOGLE_API_KEY,     # Google API authentication
+                temperature=temperature,              # Creativity level (0.0-1.0)
+                max_tokens=None,                     # No token limit
+                timeout=None,                        # No timeout limit
+                max_retries=2,                       # Retry failed requests twice
+                **extra_kwargs,
+            )
+            _CHAT_MODELS[key] = model
+        return model
+
+
+# 💾 GEMINI PERSONA CACHE - Upload Pepper's character card ONCE per TTL window
+# Every conversation turn sends the same ~4KB personality prompt. With a context cache
+# Gemini stores it server-side and each call just references it by name - fewer input
+# tokens billed, fewer bytes on the wire, lower latency.
+# The per-turn parts of the card ({memory_context}, {current_activity}) can't live in
+# the cache, so they point at a context note the chain sends as the first message.
+PERSONA_CONTEXT_NOTE = "See the context note at the start of the conversation"
+_PERSONA_CACHE: dict = {}  # {"name": ... (None = creation failed), "expires_at": ...}
+_PERSONA_CACHE_LOCK = asyncio.Lock()
+# Refresh this many seconds BEFORE Gemini expires the cache, so no call uses a dead name
+_PERSONA_CACHE_REFRESH_MARGIN = 60
+
+
+async def get_or_create_persona_cache() -> Optional[str]:
+    """💾 PERSONA CACHE - Returns the name of Gemini's cached character card, or None if caching is off"""
+
+    ttl = settings.GEMINI_PERSONA_CACHE_TTL_SECONDS
+    if ttl <= 0:
+        return None  # Feature switched off - chains use the normal system prompt
+
+    # FAST PATH: a result (cache name OR a remembered failure) still valid for this TTL window
+    if _PERSONA_CACHE and _PERSONA_CACHE["expires_at"] > time.monotonic():
+        return _PERSONA_CACHE["name"]
+
+    async with _PERSONA_CACHE_LOCK:
+        if _PERSONA_CACHE and _PERSONA_CACHE["expires_at"] > time.monotonic():
+            return _PERSONA_CACHE["name"]
+
+        # Lazy imports - only needed when caching is actually enabled
+        from google import genai
+        from google.genai.types import CreateCachedContentConfig
+
+        from ai_companion.core.prompts import CHARACTER_CARD_PROMPT
+
+        persona = CHARACTER_CARD_PROMPT.format(
+            memory_context=PERSONA_CONTEXT_NOTE,
+            current_activity=PERSONA_CONTEXT_NOTE,
+        )
+        try:
+            # client.aio = the SDK's async API - the network call doesn't block the event loop
+            cache = await genai.Client(api_key=settings.GOOGLE_API_KEY).aio.caches.create(
+                model=settings.TEXT_MODEL_NAME,
+                config=CreateCachedContentConfig(system_instruction=persona, ttl=f"{ttl}s"),
+            )
+            cache_name = cache.name
+        except Exception as e:
+            # e.g. prompt below the model's minimum cacheable size - fall back to no cache.
+            # The failure is remembered for the TTL window too, so the next turns don't
+            # each pay for another doomed API call before answering
+            logger.warning("Could not create Gemini persona cache, sending the full prompt instead: %s", e)
+            cache_name = None
+
+        # Models bound to the previous (now expiring) cache are no longer needed
+        old_name = _PERSONA_CACHE.get("name")
+        if old_name:
+            with _CHAT_LOCK:
+                for key in [k for k in _CHAT_MODELS if k[1] == old_name]:
+                    del _CHAT_MODELS[key]
 
-def get_chat_model(temperature: float = 0.7):
-    """
-    🤖 AI MODEL FACTORY - Creates a configured Google Gemini model for text generation
-    
-    WHAT IT DOES:
-    Creates a ready-to-use AI model with all the right settings.
-    Like getting a pre-tuned race car instead of building one from scratch.
-    
-    🚀 GOOGLE GEMINI MODELS:
-    Returns ChatGoogleGenerativeAI with Gemini 2.5 Flash:
-    - EXCELLENT structured output support (fixes ReAct tool calling)
-    - Fast inference optimized for real-time chat
-    - Reliable tool calling and JSON format adherence
-    - Perfect for ReAct workflows requiring consistent schemas
-    
-    TEMPERATURE PARAMETER:
-    Controls AI creativity/randomness (0.0 to 1.0):
-    - 0.0 = Completely predictable, same response every time
-    - 0.3 = Slightly creative, good for consistent decisions (router)
-    - 0.7 = Balanced creativity, natural conversations (default)
-    - 1.0 = Maximum creativity, can be chaotic
-    
-    USAGE EXAMPLES:
-    - router_node uses temperature=0.3 (consistent routing decisions)
-    - conversation_node uses default 0.7 (natural personality)
-    - ReAct tool calling uses 0.0-0.3 (predictable tool usage)
-    
-    CONFIGURATION SOURCE:
-    All settings come from settings.py:
-    - API_KEY: Your Google API authentication 
-    - MODEL_NAME: "gemini-2.5-flash" (fast, reliable, structured output)
-    - TEMPERATURE: Creativity level for this specific use
-    """
-    
-    # 🌐 GOOGLE GEMINI 2.5 FLASH FOR RELIABLE STRUCTURED OUTPUT
-    # Replaced Groq to fix tool calling and structured output issues
-    return ChatGoogleGenerativeAI(
-        model=settings.TEXT_MODEL_NAME,      # "gemini-2.5-flash" from settings
-        api_key=settings.GOOGLE_API_KEY,     # Google API authentication
-        temperature=temperature,              # Creativity level (0.0-1.0)
-        max_tokens=None,                     # No token limit
-        timeout=None,                        # No timeout limit
-        max_retries=2,                       # Retry failed requests twice
-    )
+        _PERSONA_CACHE["name"] = cache_name
+        _PERSONA_CACHE["expires_at"] = time.monotonic() + max(ttl - _PERSONA_CACHE_REFRESH_MARGIN, 1)
+        return cache_name
 
 
+# Cache result so every node shares one TextToSpeech (and its API client) per process
+@lru_cache(maxsize=1)
 def get_text_to_speech_module():
-    """
-    🎵 VOICE SYNTHESIS FACTORY - Creates ElevenLabs text-to-speech client
-    
-    WHAT IT DOES:
-    Creates a configured ElevenLabs client that can convert Pepper's text responses
-    into natural-sounding speech using her specific voice.
-    
-    WHY ELEVENLABS?
-    - Most natural-sounding AI voices pepperilable
-    - Consistent voice identity (Pepper always sounds like Pepper)
-    - Supports emotional expression and tone variation
-    - High-quality audio output for professional feel
-    
-    HOW IT'S USED:
-    audio_node calls this to get a TTS client, then:
-    1. Generates text response (like conversation_node)
-    2. Converts text to speech using Pepper's voice
-    3. Returns audio buffer for WhatsApp voice message
-    
-    VOICE CONFIGURATION:
-    - Voice ID stored in settings.ELEVENLABS_VOICE_ID
-    - API key from settings.ELEVENLABS_API_KEY
-    - Model settings optimized for conversational speech
-    """
+    """🎵 VOICE SYNTHESIS FACTORY - Creates ElevenLabs text-to-speech client"""
+    from ai_companion.modules.speech import TextToSpeech               # Convert text to voice
+
     return TextToSpeech()
 
 
+# Cache result so every node shares one TextToImage (and its API client) per process
+@lru_cache(maxsize=1)
 def get_text_to_image_module():
-    """
-    🖼️ IMAGE GENERATION FACTORY - Creates FLUX text-to-image client
-    
-    WHAT IT DOES:
-    Creates a configured FLUX AI client that can generate photorealistic images
-    based on text descriptions of what Pepper is doing.
-    
-    WHY FLUX?
-    - State-of-the-art image quality (better than DALL-E 2)
-    - Fast generation (good for real-time responses)
-    - Excellent at photorealistic scenes
-    - Cost-effective through Together AI
-    
-    HOW IT'S USED:
-    image_node calls this to get an image generator, then:
-    1. Creates scenario prompt ("Pepper coding at her desk...")
-    2. Generates photorealistic image using FLUX
-    3. Saves image file and returns path for WhatsApp
-    
-    MODEL CONFIGURATION:
-    - Uses "black-forest-labs/FLUX.1-schnell-Free" model
-    - API access through Together AI platform
-    - Optimized for realistic lifestyle photography
-    """
+    """🖼️ IMAGE GENERATION FACTORY - Creates FLUX text-to-image client"""
+    from ai_companion.modules.image.text_to_image import TextToImage    # Generate images
+
     return TextToImage()
 
 
+# Cache result so every node shares one ImageToText (and its API client) per process
+@lru_cache(maxsize=1)
 def get_image_to_text_module():
-    """
-    👁️ VISION ANALYSIS FACTORY - Creates image-to-text client for understanding images
-    
-    WHAT IT DOES:
-    Creates a client that can "see" and describe images that users send to Pepper.
-    Like giving Pepper eyes to understand visual content.
-    
-    WHY IMAGE-TO-TEXT?
-    Users might send Pepper photos and expect her to understand them:
-    - "What do you think of my setup?" (with desk photo)
-    - "Look at this sunset!" (with sunset photo)  
-    - "Can you help me with this code?" (with screenshot)
-    
-    HOW IT WORKS:
-    1. User sends image to WhatsApp
-    2. This module analyzes the image content
-    3. Converts visual information to text description
-    4. Pepper can then respond contextually about the image
-    
-    MODEL USED:
-    - "llama-3.2-90b-vision-preview" (multimodal model)
-    - Can understand both images and text simultaneously
-    - Provides detailed, contextual descriptions
-    """
+    """👁️ VISION ANALYSIS FACTORY - Creates image-to-text client for understanding images"""
+    from ai_companion.modules.image.image_to_text import ImageToText    # Describe images
+
     return ImageToText()
 
 
 def remove_asterisk_content(text: str) -> str:
-    """
-    🧹 TEXT CLEANER - Removes asterisk-wrapped formatting from AI responses
-    
-    WHAT IT DOES:
-    Removes text wrapped in asterisks (*like this*) from AI responses.
-    Cleans up formatting that looks awkward in chat messages.
-    
-    WHY REMOVE ASTERISKS?
-    AI models often use asterisks for emphasis or actions:
-    - "I'm working on code *excitedly*" → "I'm working on code"
-    - "That's amazing! *claps hands*" → "That's amazing!"
-    - "*thinking* Let me check that..." → "Let me check that..."
-    
-    This makes responses feel more natural in WhatsApp conversations.
-    
-    HOW IT WORKS:
-    Uses regex pattern r"\\*.*?\\*" to find and remove:
-    - \\* = literal asterisk character
-    - .*? = any characters (non-greedy)
-    - \\* = closing asterisk
-    - .strip() removes extra whitespace
-    
-    EXAMPLES:
-    Input: "Hey! *waves* How are you doing *today*?"
-    Output: "Hey! How are you doing?"
-    
-    Input: "I'm *really* excited about this project!"
-    Output: "I'm excited about this project!"
-    """
-    return re.sub(r"\*.*?\*", "", text).strip()
+    """🧹 TEXT CLEANER - Removes asterisk-wrapped formatting from AI responses"""
+    # Short replies ("Got it!", "lol yeah") repeat a LOT - remember their cleaned form.
+    # Long replies skip the cache so it never holds on to multi-KB responses
+    if len(text) <= _CLEAN_CACHE_MAX_LENGTH:
+        return _clean_asterisks_cached(text)
+    return _clean_asterisks(text)
+
+
+def _clean_asterisks(text: str) -> str:
+    # FAST PATH: most replies have no asterisks at all, and a plain "in" check
+    # is much cheaper than running the regex engine over the whole response
+    if "*" not in text:
+        # Most replies also have no leading/trailing whitespace - checking the two
+        # edge characters is cheaper than .strip() scanning and copying the string
+        if not text or (not text[0].isspace() and not text[-1].isspace()):
+            return text
+        return text.strip()
+
+    # SCAN FOR *PAIRS* WITH str.find (runs in C, much faster than the regex engine)
+    # Each loop: keep the text up to the next *, then jump past its closing *
+    # An unmatched * (no closing partner) is kept as-is, along with everything after it
+    kept_parts = []
+    position = 0
+    while True:
+        opening = text.find("*", position)
+        if opening < 0:
+            kept_parts.append(text[position:])  # No more asterisks - keep the rest
+            break
+        kept_parts.append(text[position:opening])  # Keep the text before the *
+        closing = text.find("*", opening + 1)
+        if closing < 0:
+            # NO-OP CHECK: position still 0 means no *pair* was removed - the only
+            # asterisk is unpaired (Gemini does this), so the text is unchanged.
+            # Skip building and joining a copy of it
+            if position == 0:
+                return text.strip()
+            kept_parts.append(text[opening:])  # Unmatched * - keep it and the rest
+            break
+        position = closing + 1  # Skip the whole *action*
+
+    # One join at the end instead of growing a string piece by piece
+    return "".join(kept_parts).strip()
+
+
+# Safe to memoize: cleaning is deterministic and has no side effects
+_CLEAN_CACHE_MAX_LENGTH = 128
+_clean_asterisks_cached = lru_cache(maxsize=256)(_clean_asterisks)
+
+
+class AsteriskStreamFilter:
+    """✂️ STREAMING TEXT CLEANER - Removes *asterisk spans* from text that arrives in pieces"""
+
+    def __init__(self):
+        # inside = are we currently between an opening * and its closing *?
+        self.inside = False
+        # held = text after an opening * that we're holding back until we see the closing *
+        # (if the closing * never arrives, it gets released at the end - same as the regex)
+        self.held = ""
+        # started = have we sent any real text yet? (used to trim leading whitespace)
+        self.started = False
+
+    def feed(self, text: str) -> str:
+        # Splitting on "*" lets Python's C code do the scanning instead of a per-character loop
+        # Every boundary between two pieces is an asterisk that flips inside/outside
+        kept = []
+        for index, piece in enumerate(text.split("*")):
+            if index:
+                if self.inside:
+                    self.held = ""  # Closing * - the whole *action* gets dropped
+                self.inside = not self.inside
+            if self.inside:
+                self.held += piece
+            else:
+                kept.append(piece)
+        return self._trim_leading("".join(kept))
+
+    def flush(self) -> str:
+        # Stream ended with an unmatched * - give the held text back untouched
+        return self._trim_leading("*" + self.held) if self.inside else ""
+
+    def _trim_leading(self, text: str) -> str:
+        # Same job as .strip() at the start of the response (the end can't be known mid-stream)
+        if not self.started:
+            text = text.lstrip()
+            self.started = bool(text)
+        return text
+
+
+def _chunk_to_text(chunk: Union[str, BaseMessage]) -> str:
+    # Streamed chunks are either plain strings or AIMessageChunks - get the text either way
+    if isinstance(chunk, BaseMessage):
+        return ChatGeneration(message=chunk).text
+    return chunk
 
 
 class AsteriskRemovalParser(StrOutputParser):
-    """
-    🔧 CUSTOM OUTPUT PARSER - LangChain parser that automatically cleans asterisk formatting
-    
-    WHAT IT IS:
-    A custom LangChain output parser that extends the standard StrOutputParser
-    to automatically clean asterisk formatting from AI responses.
-    
-    WHY EXTEND STROUTPUTPARSER?
-    LangChain's StrOutputParser converts AI output to clean strings, but doesn't
-    handle formatting removal. This class adds that capability.
-    
-    HOW IT WORKS:
-    1. Inherits all functionality of StrOutputParser
-    2. Overrides the parse() method to add asterisk removal
-    3. super().parse(text) gets the standard string conversion
-    4. remove_asterisk_content() cleans the formatting
-    5. Returns clean, natural text
-    
-    USAGE IN CHAINS:
-    get_character_response_chain() uses this parser:
-    prompt | model | AsteriskRemovalParser()
-    
-    This ensures Pepper's responses are always clean and natural-looking.
-    
-    EXAMPLE TRANSFORMATION:
-    AI Output: "I'm *currently* debugging some Python *code*!"
-    After Parser: "I'm currently debugging some Python code!"
-    """
+    """🔧 CUSTOM OUTPUT PARSER - LangChain parser that automatically cleans asterisk formatting"""
     def parse(self, text):
         # First, use the parent class to convert to string
         # Then, remove asterisk formatting for clean output
         return remove_asterisk_content(super().parse(text))
+
+    # STREAMING SUPPORT - Clean each chunk as it arrives instead of waiting for the full reply
+    # Without these, a streamed chain would run parse() (and its .strip()) on every
+    # token separately. With them, clean text flows out as soon as it's known to be
+    # outside an *action*, so TTS / chat streaming can start before the LLM finishes.
+    def _transform(self, input: Iterator[Union[str, BaseMessage]]) -> Iterator[str]:
+        stream_filter = AsteriskStreamFilter()
+        for chunk in input:
+            cleaned = stream_filter.feed(_chunk_to_text(chunk))
+            if cleaned:
+                yield cleaned
+        tail = stream_filter.flush()
+        if tail:
+            yield tail
+
+    async def _atransform(self, input: AsyncIterator[Union[str, BaseMessage]]) -> AsyncIterator[str]:
+        stream_filter = AsteriskStreamFilter()
+        async for chunk in input:
+            cleaned = stream_filter.feed(_chunk_to_text(chunk))
+            if cleaned:
+                yield cleaned
+        tail = stream_filter.flush()
+        if tail:
+            yield tail
+
+
+# One shared parser for every chain - it keeps no per-call state (the streaming
+# filter is created fresh inside each _transform call), so there's no reason to
+# build a new parser object every time a character chain is assembled
+ASTERISK_PARSER = AsteriskRemovalParser()
@@ -55,16 +55,28 @@ THE THREE CHAINLIT EVENT HANDLERS:
 
 Each handler follows Pepper's standard processing pattern:
 1. Get user input (text from typing, image from upload, or audio from recording)
-2. Send input through Pepper's identical LangGraph brain (same workflow as WhatsApp production)
+2. Send input through Pepper's identical LangGraph brain via get_graph() - ONE compiled graph and
+   ONE SQLite checkpointer shared by all three handlers (conversations stay separate by thread_id)
 3. Display Pepper's response in web interface (text, image, or audio player)
 """
 
 # STANDARD LIBRARY IMPORTS - Python's built-in tools
 
-# BytesIO = Python's tool for handling file data in memory (like a temporary file holder)
-# When users upload audio/images, we need to hold the file data in memory while processing
-# Think of it like a clipboard that temporarily holds file contents while Pepper works on them
-from io import BytesIO
+# asyncio = run independent work (transcription, vision calls, TTS) at the same time
+import asyncio
+# hashlib = fingerprint uploaded images so repeat uploads reuse their description
+import hashlib
+# OrderedDict = remembers insertion order, which turns a dict into a simple LRU cache
+from collections import OrderedDict
+# nullcontext = a do-nothing "async with" used when the debug step is switched off
+from contextlib import nullcontext
+# dataclass = lightweight container for one recording's state (buffer + live transcript)
+from dataclasses import dataclass, field
+
+# Path = file path helper used to read uploaded images off the event loop
+from pathlib import Path
+# Optional = type hint for "this value or None"
+from typing import Optional
 
 # EXTERNAL LIBRARY IMPORTS - Third-party tools for specific functionality
 
@@ -73,24 +85,23 @@ from io import BytesIO
 # Like having a pre-built chat website that we just need to connect Pepper's brain to
 import chainlit as cl
 
+# httpx = HTTP client library; one shared AsyncClient = one pool of warm connections
+import httpx
+
 # LangChain message format - standardized way to represent chat messages
 # AIMessageChunk = pieces of AI responses during streaming (word-by-word display)
 # HumanMessage = wrapper that tells Pepper "this message came from a human user"
 # Same format used in WhatsApp interface, so Pepper's brain processes messages identically
 from langchain_core.messages import AIMessageChunk, HumanMessage
 
-# AsyncSqliteSaver is LangGraph's conversation memory system that uses SQLite database files.
-# This system stores conversation history so Pepper remembers what you talked about previously.
-# The "Async" version means it doesn't block other conversations while saving memory to disk.
-# This is identical to the WhatsApp interface - both use the same conversation persistence mechanism.
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
-
 # pepper'S CORE BRAIN COMPONENTS - The same AI modules used in WhatsApp interface
 
-# graph_builder is Pepper's complete workflow system that acts like a conductor orchestrating all AI modules.
+# get_graph() returns Pepper's complete workflow, compiled ONCE with its SQLite memory attached.
 # This contains the identical LangGraph workflow used everywhere: memory→router→context→response nodes.
-# This is the same brain that processes messages in WhatsApp interface, just with different input/output methods.
-from ai_companion.graph import graph_builder
+# The WhatsApp interface calls the same function, so both run the same brain the same way.
+from ai_companion.graph.persistence import get_graph
+# AsteriskStreamFilter = strips *actions* from streamed tokens before they're spoken
+from ai_companion.graph.utils.helpers import AsteriskStreamFilter
 
 # AI processing modules for different media types (same capabilities as WhatsApp)
 # These are Pepper's AI processing modules for different media types:
@@ -98,7 +109,7 @@ from ai_companion.graph import graph_builder
 # SpeechToText is Pepper's hearing system that transcribes voice recordings to text for processing.
 # TextToSpeech is Pepper's speaking system that converts Pepper's text responses to audio files.
 from ai_companion.modules.image import ImageToText
-from ai_companion.modules.speech import SpeechToText, TextToSpeech
+from ai_companion.modules.speech import SentenceAggregator, SpeechToText, TextToSpeech
 
 # settings is Pepper's configuration file that contains API keys, model choices, and database paths.
 # This configuration is shared across all interfaces so Chainlit and WhatsApp use the same AI models and settings.
@@ -112,10 +123,20 @@ from ai_companion.settings import settings
 # Think of it like keeping Pepper's brain modules "warmed up" and ready to process any user's message
 # IDENTICAL pattern used in WhatsApp interface for consistency and performance
 
+# SHARED HTTP CONNECTION POOL - one set of warm connections for every Groq call
+# Each brand-new HTTPS connection costs a TCP + TLS handshake (often 50-150ms).
+# Sharing one client means a voice turn's transcription and a later image analysis
+# (both api.groq.com) reuse the same open connections instead of dialing again.
+# TextToSpeech uses ElevenLabs' synchronous client, which has its own shared pool.
+http_client = httpx.AsyncClient(
+    timeout=60.0,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+)
+
 # speech_to_text = Pepper's hearing system using Whisper AI model via Groq API
 # Converts audio recordings (voice messages) into text that Pepper's LangGraph brain can understand
 # Same instance used in WhatsApp interface - consistent speech processing across all interfaces
-speech_to_text = SpeechToText()
+speech_to_text = SpeechToText(http_client=http_client)
 
 # text_to_speech = Pepper's speaking system using ElevenLabs API
 # Converts Pepper's text responses into realistic speech audio files
@@ -125,7 +146,41 @@ text_to_speech = TextToSpeech()
 # image_to_text = Pepper's vision system using multimodal AI models
 # Analyzes images and describes what Pepper "sees" in text format for LangGraph processing
 # Same instance used in WhatsApp interface - consistent image understanding across interfaces
-image_to_text = ImageToText()
+image_to_text = ImageToText(http_client=http_client)
+
+# FIXED VALUES USED ON EVERY TURN - defined once here instead of inside the handlers
+# IMAGE_ANALYSIS_PROMPT = what we ask Pepper's vision system about each uploaded image
+# AUDIO_MIME_MP3 = audio format (MP3) for every audio player in the chat
+IMAGE_ANALYSIS_PROMPT = "Please describe what you see in this image in the context of our conversation."
+AUDIO_MIME_MP3 = "audio/mpeg3"
+# SPOKEN_REPLY_NODES = graph nodes whose streamed tokens ARE Pepper's reply (voiced as they arrive)
+SPOKEN_REPLY_NODES = frozenset({"conversation_node", "audio_node"})
+# MP3_BYTES_PER_SECOND = how many bytes of Pepper's MP3 make one second of speech
+# The bitrate is the last part of the format name: "mp3_22050_32" = 32 kbit/s = 4,000 bytes/s
+# (settings.py rejects any TTS_OUTPUT_FORMAT that isn't mp3_<samplerate>_<kbps>)
+MP3_BYTES_PER_SECOND = int(settings.TTS_OUTPUT_FORMAT.rsplit("_", 1)[-1]) * 1000 // 8
+
+# IMAGE DESCRIPTION CACHE - Don't pay for the same vision call twice
+# Users often re-send the same screenshot or meme. Identical bytes give the same
+# fingerprint, so the repeat upload skips the multi-second vision API call entirely.
+# blake2b = fast built-in hash; OrderedDict keeps the most recently used entries last
+_IMAGE_DESCRIPTIONS: OrderedDict = OrderedDict()  # image fingerprint -> description
+_IMAGE_DESCRIPTIONS_MAX = 512
+
+
+async def describe_image(image_bytes: bytes) -> str:
+    """👁️ CACHED VISION - Describes an image, reusing the answer for images we've already seen"""
+    key = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+    description = _IMAGE_DESCRIPTIONS.get(key)
+    if description is not None:
+        _IMAGE_DESCRIPTIONS.move_to_end(key)  # Mark as recently used
+        return description
+
+    description = await image_to_text.analyze_image(image_bytes, IMAGE_ANALYSIS_PROMPT)
+    _IMAGE_DESCRIPTIONS[key] = description
+    if len(_IMAGE_DESCRIPTIONS) > _IMAGE_DESCRIPTIONS_MAX:
+        _IMAGE_DESCRIPTIONS.popitem(last=False)  # Forget the least recently used image
+    return description
 
 
 @cl.on_chat_start
@@ -176,6 +231,9 @@ async def on_chat_start():
     # 1 = the actual thread_id value (all demo users share thread 1)
     cl.user_session.set("thread_id", 1)
 
+    # WARM UP pepper'S BRAIN - open memory + compile now, so the first message doesn't wait for it
+    await get_graph()
+
 
 @cl.on_message
 async def on_message(message: cl.Message):
@@ -198,7 +256,7 @@ async def on_message(message: cl.Message):
     
     CROSS-SYSTEM CONNECTIONS:
     - image_to_text: SAME image analysis as WhatsApp interface
-    - graph_builder.compile(): IDENTICAL brain compilation as WhatsApp
+    - get_graph(): SAME compiled brain as WhatsApp (shared, compiled once)
     - AsyncSqliteSaver: SAME conversation persistence as WhatsApp
     - workflow decisions: SAME router_node logic from nodes.py
     
@@ -222,56 +280,42 @@ async def on_message(message: cl.Message):
     # Users can drag and drop images into the Chainlit chat interface
     # Same image processing logic as WhatsApp interface, just different file access method
     
-    # CHECK IF USER ATTACHED ANY FILES
-    # message.elements = list of attached files (images, documents, etc.)
-    # If empty list, user sent text only; if contains items, user attached files
-    if message.elements:
+    # COLLECT THE ATTACHED IMAGES
+    # message.elements = list of attached files (images, documents, etc.) - empty if text only
+    # isinstance(elem, cl.Image) = only process images - ignore PDFs, documents, etc.
+    images = [elem for elem in message.elements or [] if isinstance(elem, cl.Image)]
+    if images:
         
-        # LOOP THROUGH ALL ATTACHED FILES
-        # for elem in message.elements = examine each attached file one by one
-        for elem in message.elements:
-            
-            # CHECK IF THIS ATTACHMENT IS AN IMAGE
-            # isinstance(elem, cl.Image) = Python function that checks if elem is an image object
-            # Only process images - ignore other file types like PDFs, documents, etc.
-            if isinstance(elem, cl.Image):
-                
-                # READ THE UPLOADED IMAGE FILE FROM DISK
-                # elem.path = file path where Chainlit saved the uploaded image
-                # with open() = Python context manager that automatically closes files
-                # "rb" = read in binary mode (for image files, not text files)
-                # f.read() = read the entire image file into memory as bytes
-                with open(elem.path, "rb") as f:
-                    image_bytes = f.read()
-
-                # ANALYZE IMAGE USING pepper'S VISION SYSTEM
-                # Same image_to_text module and process as WhatsApp interface
-                # try/except = error handling in case image analysis fails
-                try:
-                    
-                    # PROCESS IMAGE THROUGH pepper'S VISION
-                    # await = wait for AI vision processing to complete (can take several seconds)
-                    # image_to_text.analyze_image() = SAME function used in WhatsApp interface
-                    # Takes: image data (bytes) and a prompt asking what to look for
-                    # Returns: text description of what Pepper sees in the image
-                    description = await image_to_text.analyze_image(
-                        image_bytes,  # The actual image data we read from file
-                        "Please describe what you see in this image in the context of our conversation.",
-                    )
-                    
-                    # ADD IMAGE ANALYSIS TO MESSAGE CONTENT
-                    # content += means "add this text to the end of existing content"
-                    # f"..." = f-string formatting to insert the description variable
-                    # Final content = user's text + "\n[Image Analysis: what Pepper saw]"
-                    content += f"\n[Image Analysis: {description}]"
-                    
-                # HANDLE IMAGE ANALYSIS ERRORS
-                # except Exception as e = catch any error that happened during image analysis
-                except Exception as e:
-                    # cl.logger.warning() = record this problem in Chainlit's log for debugging
-                    # f"..." = f-string to include the actual error message
-                    # If image analysis fails, log error but continue processing (graceful degradation)
-                    cl.logger.warning(f"Failed to analyze image: {e}")
+        # READ THE UPLOADED IMAGE FILES FROM DISK (WITHOUT BLOCKING OTHER USERS)
+        # elem.path = file path where Chainlit saved the uploaded image
+        # Path.read_bytes() = read the whole file in binary mode
+        # asyncio.to_thread() = do the disk read in a worker thread, so the event loop keeps
+        # serving other sessions' messages and audio chunks while the file loads
+        image_bytes_list = await asyncio.gather(
+            *(asyncio.to_thread(Path(elem.path).read_bytes) for elem in images)
+        )
+
+        # ANALYZE ALL IMAGES AT THE SAME TIME USING pepper'S VISION SYSTEM
+        # describe_image() = SAME image_to_text.analyze_image() as WhatsApp, plus a cache for repeats
+        # asyncio.gather() = start every vision call at once, then wait for all of them
+        # Each call takes several seconds, so 3 images now take ~1 call's time instead of 3
+        # return_exceptions=True = a failed image comes back as its error instead of cancelling the rest
+        # Results come back in the same order as the images were attached
+        descriptions = await asyncio.gather(
+            *(describe_image(image_bytes) for image_bytes in image_bytes_list),
+            return_exceptions=True,
+        )
+
+        for description in descriptions:
+            # HANDLE IMAGE ANALYSIS ERRORS
+            # If image analysis fails, log error but continue processing (graceful degradation)
+            if isinstance(description, Exception):
+                cl.logger.warning(f"Failed to analyze image: {description}")
+                continue
+
+            # ADD IMAGE ANALYSIS TO MESSAGE CONTENT
+            # Final content = user's text + "\n[Image Analysis: what Pepper saw]"
+            content += f"\n[Image Analysis: {description}]"
 
     # STEP 3: GET THE SESSION THREAD_ID (SET DURING CHAT INITIALIZATION)
     # thread_id = unique identifier for this conversation thread
@@ -283,81 +327,102 @@ async def on_message(message: cl.Message):
     # STEP 4: PROCESS THROUGH pepper'S BRAIN (IDENTICAL TO WHATSAPP PROCESSING)
     # Now we have the content text (+ image analysis), send it through Pepper's complete LangGraph workflow
     
-    # SHOW "THINKING" INDICATOR IN CHAINLIT UI
+    # OPTIONAL "RUN" STEP IN CHAINLIT UI (debugging aid)
     # async with = Python context manager that automatically handles setup/cleanup
-    # cl.Step(type="run") = shows a "thinking" or "processing" indicator in the web interface
-    # Like showing a spinning wheel while Pepper processes the message
-    async with cl.Step(type="run"):
+    # cl.Step(type="run") = shows a collapsible "Run" step in the web interface, but costs
+    # two extra WebSocket events (start/end) and a persisted record on every turn
+    # So it's opt-in: CHAINLIT_SHOW_STEPS=true turns it on, otherwise nullcontext() does nothing
+    step_context = cl.Step(type="run") if settings.CHAINLIT_SHOW_STEPS else nullcontext()
+    async with step_context:
         
-        # SETUP CONVERSATION MEMORY DATABASE CONNECTION
-        # async with = context manager that automatically handles opening/closing database
-        # AsyncSqliteSaver = Pepper's memory system that remembers conversation history
-        # .from_conn_string() = connect to SQLite database file at the specified path
-        # settings.SHORT_TERM_MEMORY_DB_PATH = file path where conversation history is stored
-        # IDENTICAL setup to WhatsApp interface - same memory system
-        async with AsyncSqliteSaver.from_conn_string(settings.SHORT_TERM_MEMORY_DB_PATH) as short_term_memory:
-            
-            # BUILD pepper'S COMPLETE WORKFLOW GRAPH
-            # graph_builder.compile() = creates Pepper's complete LangGraph workflow
-            # checkpointer=short_term_memory = connect the memory system so Pepper remembers conversations
-            # This creates the IDENTICAL workflow used in WhatsApp: memory→router→context→response nodes
-            graph = graph_builder.compile(checkpointer=short_term_memory)
+        # GET pepper'S COMPLETE WORKFLOW GRAPH (compiled once, shared by every message)
+        # get_graph() = the IDENTICAL workflow used in WhatsApp: memory→router→context→response nodes
+        # The SQLite memory connection behind it stays open, so there's no per-message setup
+        graph = await get_graph()
+        
+        # STREAM pepper'S RESPONSE IN REAL-TIME (UNIQUE TO CHAINLIT)
+        # Unlike WhatsApp (store-and-forward), Chainlit supports real-time streaming
+        # Users see Pepper "typing" her response word-by-word, like ChatGPT
+        
+        # BATCH TOKENS BEFORE SENDING THEM TO THE BROWSER
+        # Every msg.stream_token() call is a separate WebSocket frame + JSON encode.
+        # The LLM emits tiny 1-2 word chunks very fast, so sending each one alone means
+        # more time spent on frames than on text. Instead we collect tokens and send them
+        # together every ~30ms (or every 8 tokens) - still looks live to the user.
+        loop = asyncio.get_running_loop()
+        pending_tokens = []
+        last_flush = loop.time()
+
+        # pepper'S LATEST FULL STATE, delivered inside the stream itself (no database read afterwards)
+        final_values = {}
+        
+        # PROCESS MESSAGE AND STREAM RESPONSE
+        # async for = loop that processes streaming data as it arrives
+        # graph.astream() = stream Pepper's processing in real-time (vs ainvoke() which waits for completion)
+        async for mode, chunk in graph.astream(
+            # FIRST PARAMETER: The message data to process
+            {"messages": [HumanMessage(content=content)]},  # Wrap user's text in LangChain message format
             
-            # STREAM pepper'S RESPONSE IN REAL-TIME (UNIQUE TO CHAINLIT)
-            # Unlike WhatsApp (store-and-forward), Chainlit supports real-time streaming
-            # Users see Pepper "typing" her response word-by-word, like ChatGPT
+            # SECOND PARAMETER: Configuration for this processing run
+            {"configurable": {"thread_id": thread_id}},     # Use thread_id to isolate conversations
             
-            # PROCESS MESSAGE AND STREAM RESPONSE
-            # async for = loop that processes streaming data as it arrives
-            # graph.astream() = stream Pepper's processing in real-time (vs ainvoke() which waits for completion)
-            async for chunk in graph.astream(
-                # FIRST PARAMETER: The message data to process
-                {"messages": [HumanMessage(content=content)]},  # Wrap user's text in LangChain message format
-                
-                # SECOND PARAMETER: Configuration for this processing run
-                {"configurable": {"thread_id": thread_id}},     # Use thread_id to isolate conversations
-                
-                # THIRD PARAMETER: What type of streaming we want
-                stream_mode="messages",                          # Stream individual message chunks (word-by-word)
-            ):
-                # FILTER AND DISPLAY STREAMING TEXT
-                # chunk = each piece of streaming data from Pepper's workflow
-                # chunk[1]["langgraph_node"] = which node in the workflow produced this chunk
-                # "conversation_node" = we only want to stream text from the conversation node
-                # isinstance(chunk[0], AIMessageChunk) = check if this chunk contains AI text
-                if chunk[1]["langgraph_node"] == "conversation_node" and isinstance(chunk[0], AIMessageChunk):
-                    # STREAM TEXT TO USER'S BROWSER IN REAL-TIME
-                    # await = wait for this text chunk to be sent to user's browser
-                    # msg.stream_token() = add this text to the streaming message display
-                    # chunk[0].content = the actual text content from Pepper's response
-                    await msg.stream_token(chunk[0].content)
-
-            # GET pepper'S FINAL STATE AFTER PROCESSING COMPLETES
-            # After streaming completes, we need to see Pepper's final decisions (text/image/audio response)
-            # await = wait for state retrieval to complete
-            # graph.aget_state() = get the final state of Pepper's workflow
-            # config = same configuration (thread_id) to get the right conversation's state
-            # IDENTICAL to WhatsApp interface
-            output_state = await graph.aget_state(config={"configurable": {"thread_id": thread_id}})
+            # THIRD PARAMETER: What types of streaming we want
+            # "messages" = individual message chunks (word-by-word)
+            # "values" = Pepper's full state after each step - the last one is the final state
+            # With two modes, each item arrives as (mode, chunk)
+            stream_mode=["messages", "values"],
+        ):
+            # KEEP THE NEWEST STATE SNAPSHOT
+            # After the loop this holds the final state: workflow, messages, image_path
+            if mode == "values":
+                final_values = chunk
+                continue
+
+            # FILTER AND DISPLAY STREAMING TEXT
+            # chunk = (message_chunk, metadata) - each piece of streaming data from Pepper's workflow
+            # metadata["langgraph_node"] = which node in the workflow produced this chunk
+            # "conversation_node" = we only want to stream text from the conversation node
+            # type(...) is AIMessageChunk = check if this chunk contains AI text
+            # (an exact type comparison is cheaper than isinstance(), and this runs for EVERY token)
+            message_chunk, metadata = chunk
+            if metadata["langgraph_node"] == "conversation_node" and type(message_chunk) is AIMessageChunk:
+                # message_chunk.content = the actual text content from Pepper's response
+                pending_tokens.append(message_chunk.content)
+
+                # STREAM TEXT TO USER'S BROWSER IN REAL-TIME (ONE FRAME PER BATCH)
+                # msg.stream_token() = add this text to the streaming message display
+                if len(pending_tokens) >= 8 or loop.time() - last_flush > 0.03:
+                    await msg.stream_token("".join(pending_tokens))
+                    pending_tokens.clear()
+                    last_flush = loop.time()
+
+        # SEND WHATEVER IS LEFT IN THE LAST BATCH
+        if pending_tokens:
+            await msg.stream_token("".join(pending_tokens))
+
+        # pepper'S FINAL DECISION - straight from the streamed final state
+        # No graph.aget_state() call needed: the "values" stream already delivered it
+        workflow = final_values.get("workflow")
 
     # STEP 5: HANDLE MULTI-MODAL RESPONSES BASED ON WORKFLOW DECISION
     # Based on router_node's decision, display different types of responses in Chainlit UI
     # This logic matches WhatsApp interface but with Chainlit web elements instead of API calls
     
     # AUDIO RESPONSE - pepper WANTS TO SEND A VOICE MESSAGE
-    # output_state.values.get("workflow") = get router_node's decision from Pepper's final state
+    # workflow = router_node's decision, from the final state streamed above
     # "audio" = router_node decided Pepper should respond with voice
-    if output_state.values.get("workflow") == "audio":
+    if workflow == "audio":
         
         # EXTRACT AUDIO RESPONSE DATA FROM pepper'S STATE
-        # output_state.values["messages"] = list of all messages in conversation
+        # final_values["messages"] = list of all messages in conversation
         # [-1] = get the last message (Pepper's response)
         # .content = the actual text content of Pepper's response
-        response = output_state.values["messages"][-1].content
+        response = final_values["messages"][-1].content
         
-        # output_state.values["audio_buffer"] = the actual audio file data (bytes)
-        # This is Pepper's voice saying the response text (generated by audio_node using ElevenLabs)
-        audio_buffer = output_state.values["audio_buffer"]
+        # VOICE THE REPLY HERE, NOT IN THE GRAPH
+        # audio_node only writes the text - synthesizing out here keeps the MP3 bytes
+        # out of the checkpoint database (they'd be re-serialized on every later turn)
+        audio_buffer = await text_to_speech.synthesize(response)
         
         # CREATE CHAINLIT AUDIO ELEMENT FOR WEB DISPLAY
         # cl.Audio() = creates an audio player widget in the web interface
@@ -365,36 +430,40 @@ async def on_message(message: cl.Message):
         output_audio_el = cl.Audio(
             name="Audio",                # Label shown in the web interface
             auto_play=True,              # Start playing immediately when message appears
-            mime="audio/mpeg3",          # Audio format (MP3)
-            content=audio_buffer,        # The actual audio data from audio_node
+            mime=AUDIO_MIME_MP3,         # Audio format (MP3)
+            content=audio_buffer,        # Pepper's voice saying the response (ElevenLabs)
         )
         
         # SEND MESSAGE WITH TEXT + AUDIO TO WEB INTERFACE
-        # await = wait for message to be sent to user's browser
-        # cl.Message() = creates a message in the chat interface
+        # msg = the message object created at the start of this turn - reused instead of
+        # building a second cl.Message (nothing was streamed into it for a voice reply)
         # content=response = Pepper's text (user can read while listening)
         # elements=[output_audio_el] = attach the audio player to this message
-        await cl.Message(content=response, elements=[output_audio_el]).send()
+        msg.content = response
+        msg.elements = [output_audio_el]
+        await msg.send()
         
     # IMAGE RESPONSE - pepper WANTS TO SEND A GENERATED IMAGE
-    elif output_state.values.get("workflow") == "image":
+    elif workflow == "image":
         
         # EXTRACT IMAGE RESPONSE DATA FROM pepper'S STATE
-        # output_state.values["messages"][-1].content = Pepper's caption text for the image
-        response = output_state.values["messages"][-1].content
+        # final_values["messages"][-1].content = Pepper's caption text for the image
+        response = final_values["messages"][-1].content
         
         # CREATE CHAINLIT IMAGE ELEMENT FOR WEB DISPLAY
         # cl.Image() = creates an image display widget in the web interface
         # path = file path where image_node saved the generated image
         # display="inline" = show image directly in chat (not as downloadable attachment)
         # Same image content as WhatsApp, but displayed in web UI instead of sent via API
-        image = cl.Image(path=output_state.values["image_path"], display="inline")
+        image = cl.Image(path=final_values["image_path"], display="inline")
         
         # SEND MESSAGE WITH CAPTION + IMAGE TO WEB INTERFACE
-        # await = wait for message to be sent to user's browser
+        # msg = reuse this turn's message object, same as the audio reply above
         # content=response = Pepper's caption text
         # elements=[image] = attach the image display to this message
-        await cl.Message(content=response, elements=[image]).send()
+        msg.content = response
+        msg.elements = [image]
+        await msg.send()
         
     # TEXT RESPONSE - pepper WANTS TO SEND A REGULAR TEXT MESSAGE (MOST COMMON)
     else:
@@ -405,6 +474,63 @@ async def on_message(message: cl.Message):
         await msg.send()
 
 
+# LIVE TRANSCRIPT WHILE RECORDING - Show what Pepper heard so far, every few seconds
+# Instead of one Whisper call after the user stops talking, the growing recording is
+# re-transcribed every STT_PARTIAL_INTERVAL_SECONDS and shown as an interim message.
+# Whisper's last few words change between passes, so we only show words that two
+# passes in a row agree on ("LocalAgreement-2") - no flickering text.
+# The final transcription in on_audio_end (full recording) is still the one Pepper uses.
+# OFF BY DEFAULT: browser audio is a compressed container (header at the start), so a pass
+# can't send just the newest seconds - each one re-uploads everything recorded so far
+
+
+@dataclass
+class _Recording:
+    """🎙️ ONE VOICE RECORDING - Everything on_audio_chunk updates, stored under ONE session key
+
+    Audio chunks arrive dozens of times per second. Keeping the buffer and live-transcript
+    state together means each chunk does a single session lookup, then plain attribute access.
+    """
+    mime_type: str
+    started_at: float                                        # When the last interim pass started
+    buffer: bytearray = field(default_factory=bytearray)     # The recording so far
+    transcript: str = ""                                     # Last interim transcript
+    message: Optional[cl.Message] = None                     # Interim "🎙️ ..." chat message
+    task: Optional[asyncio.Task] = None                      # Interim Whisper pass in flight
+
+
+def _agreed_prefix(previous: str, current: str) -> str:
+    """🤝 LOCAL AGREEMENT - Returns the leading words two consecutive transcripts agree on"""
+    agreed = []
+    for previous_word, current_word in zip(previous.split(), current.split()):
+        if previous_word != current_word:
+            break
+        agreed.append(current_word)
+    return " ".join(agreed)
+
+
+async def _show_partial_transcript(recording: _Recording, audio_data: bytes):
+    """📝 INTERIM TRANSCRIPT - Transcribes the recording so far and shows the settled words"""
+    try:
+        text = await speech_to_text.transcribe(audio_data)
+    except Exception as e:
+        # Interim text is a nice-to-have - the final pass in on_audio_end still runs
+        cl.logger.warning(f"Partial transcription failed: {e}")
+        return
+
+    agreed = _agreed_prefix(recording.transcript, text)
+    recording.transcript = text
+    if not agreed:
+        return
+
+    if recording.message is None:
+        recording.message = cl.Message(author="You", content=f"🎙️ {agreed}…")
+        await recording.message.send()
+    else:
+        recording.message.content = f"🎙️ {agreed}…"
+        await recording.message.update()
+
+
 @cl.on_audio_chunk
 async def on_audio_chunk(chunk: cl.AudioChunk):
     """
@@ -433,36 +559,35 @@ async def on_audio_chunk(chunk: cl.AudioChunk):
     # True = user clicked record button, False = continuing to record
     if chunk.isStart:
         
-        # INITIALIZE AUDIO BUFFER FOR THIS RECORDING SESSION
-        # BytesIO() = creates a file-like object in memory to store audio data
-        # Like creating an empty audio file in memory that we'll fill as user records
-        buffer = BytesIO()
-        
-        # SET FILENAME BASED ON AUDIO FORMAT
-        # chunk.mimeType = audio format (like "audio/webm" or "audio/mp3")
-        # .split('/')[1] = extract file extension ("webm" from "audio/webm")
-        # f"input_audio.{...}" = create filename like "input_audio.webm"
-        # buffer.name = give the memory file a name (helps with debugging)
-        buffer.name = f"input_audio.{chunk.mimeType.split('/')[1]}"
-        
-        # STORE BUFFER IN USER'S SESSION
+        # INITIALIZE A NEW RECORDING FOR THIS SESSION
+        # _Recording = holds the audio buffer + live transcript state together
+        # buffer = a bytearray, a growable block of bytes that new chunks are appended to IN PLACE
+        # Unlike a BytesIO "memory file", there's no seek/read step at the end that copies
+        # the whole recording out again - multi-minute voice messages can be several MB
+        # chunk.mimeType = the audio format (kept for speech recognition)
         # cl.user_session.set() = save data that persists for this user's browser session
-        # "audio_buffer" = key name we'll use to retrieve this buffer later
-        # buffer = the actual BytesIO object that will collect audio chunks
-        cl.user_session.set("audio_buffer", buffer)
-        
-        # REMEMBER AUDIO FORMAT FOR LATER PROCESSING
-        # cl.user_session.set() = store the MIME type for when we process complete audio
-        # "audio_mime_type" = key name for retrieving format later
-        # chunk.mimeType = the audio format (needed for speech recognition)
-        cl.user_session.set("audio_mime_type", chunk.mimeType)
+        recording = _Recording(mime_type=chunk.mimeType, started_at=asyncio.get_running_loop().time())
+        cl.user_session.set("recording", recording)
+    else:
+        # CONTINUING CHUNK - ONE session lookup, everything else is attribute access
+        recording = cl.user_session.get("recording")
     
     # APPEND AUDIO DATA TO BUFFER (FOR ALL CHUNKS)
     # This happens for every chunk - first chunk AND continuing chunks
-    # cl.user_session.get("audio_buffer") = retrieve the BytesIO buffer we created
-    # .write(chunk.data) = append this chunk's audio data to the buffer
+    # .extend(chunk.data) = append this chunk's audio data to the end of the buffer
     # chunk.data = the actual audio bytes for this small piece of the recording
-    cl.user_session.get("audio_buffer").write(chunk.data)
+    recording.buffer.extend(chunk.data)
+
+    # KICK OFF AN INTERIM TRANSCRIPTION EVERY FEW SECONDS (0 = feature off)
+    # Only one interim pass runs at a time - if Whisper is still busy, skip this chunk
+    if settings.STT_PARTIAL_INTERVAL_SECONDS > 0:
+        now = asyncio.get_running_loop().time()
+        if now - recording.started_at >= settings.STT_PARTIAL_INTERVAL_SECONDS and (
+            recording.task is None or recording.task.done()
+        ):
+            recording.started_at = now
+            # bytes(...) = snapshot of the recording so far (the buffer keeps growing)
+            recording.task = asyncio.create_task(_show_partial_transcript(recording, bytes(recording.buffer)))
 
 
 @cl.on_audio_end
@@ -477,7 +602,7 @@ async def on_audio_end(elements):
     3. Generates voice response (full voice conversation)
     
     THE VOICE-TO-VOICE PIPELINE:
-    User Voice → Transcription → Pepper's Brain → Text Response → Voice Synthesis → Audio Reply
+    User Voice → Transcription → Pepper's Brain (streamed) → Sentence-by-sentence Voice Synthesis → Audio Reply
     
     COMPARED TO TEXT MESSAGES:
     - Input: Audio instead of text
@@ -487,60 +612,61 @@ async def on_audio_end(elements):
     CROSS-SYSTEM CONNECTIONS:
     - speech_to_text: SAME Whisper transcription as WhatsApp
     - graph processing: IDENTICAL workflow as on_message()
-    - text_to_speech: SAME ElevenLabs synthesis as audio_node
+    - text_to_speech: SAME ElevenLabs synthesis as the other interfaces
     - AsyncSqliteSaver: SAME conversation persistence
     
     WHY ALWAYS AUDIO RESPONSE?
     Voice conversations feel more natural when both sides use voice.
     We bypass the router_node decision and always synthesize audio responses.
     """
+    # cl.user_session.get("recording") = the recording on_audio_chunk filled in
+    recording = cl.user_session.get("recording")
+
+    # STEP 0: CLEAR THE LIVE TRANSCRIPT
+    # The user stopped talking - stop any interim Whisper pass and remove the interim message,
+    # the final transcription below (on the complete recording) replaces it
+    if recording.task is not None and not recording.task.done():
+        recording.task.cancel()
+    if recording.message is not None:
+        await recording.message.remove()
+        recording.message = None
+
     # STEP 1: GET THE COMPLETE AUDIO DATA FROM BUFFERED CHUNKS
     # Now that recording is complete, we need to process the full audio file
-    
-    # RETRIEVE THE AUDIO BUFFER FROM SESSION STORAGE
-    # cl.user_session.get("audio_buffer") = get the BytesIO buffer we filled during recording
-    # This contains all the audio chunks combined into one complete voice message
-    audio_buffer = cl.user_session.get("audio_buffer")
-    
-    # RESET BUFFER POSITION TO START
-    # .seek(0) = move to the beginning of the audio data
-    # Like rewinding a tape to the beginning before playing it
-    # Necessary because we were writing to the end, now we need to read from the start
-    audio_buffer.seek(0)
-    
-    # READ COMPLETE AUDIO FILE INTO MEMORY
-    # .read() = read all audio data from the buffer
-    # audio_data = the complete voice message as bytes, ready for processing
-    audio_data = audio_buffer.read()
+    # recording.buffer = all the audio chunks combined into one complete voice message
+    # bytes(...) = one copy into an immutable bytes object, ready for processing
+    audio_data = bytes(recording.buffer)
 
     # STEP 2: DISPLAY USER'S VOICE MESSAGE IN THE CHAT
     # Show the user's recording in the chat interface before processing it
     
     # CREATE AUDIO ELEMENT FOR USER'S VOICE MESSAGE
     # cl.Audio() = creates an audio player widget in the web interface
-    # mime="audio/mpeg3" = audio format for web browser playback
+    # mime=AUDIO_MIME_MP3 = audio format for web browser playback
     # content=audio_data = the actual audio recording data
-    input_audio_el = cl.Audio(mime="audio/mpeg3", content=audio_data)
+    input_audio_el = cl.Audio(mime=AUDIO_MIME_MP3, content=audio_data)
     
-    # SEND USER'S VOICE MESSAGE TO CHAT INTERFACE
-    # await = wait for message to appear in user's browser
+    # SEND USER'S VOICE MESSAGE TO CHAT INTERFACE (IN THE BACKGROUND)
+    # asyncio.create_task() = start sending now, but DON'T wait for the browser round-trip -
+    # transcription starts right away and runs while the user's audio bubble appears
     # cl.Message() = creates a message in the chat interface
     # author="You" = label this message as coming from the user (not Pepper)
     # content="" = no text content, just the audio
     # elements=[input_audio_el, *elements] = attach audio player + any other elements
     # *elements = spread operator to include any additional elements passed to function
-    await cl.Message(author="You", content="", elements=[input_audio_el, *elements]).send()
+    echo_task = asyncio.create_task(
+        cl.Message(author="You", content="", elements=[input_audio_el, *elements]).send()
+    )
 
     # STEP 3: TRANSCRIBE SPEECH TO TEXT (SAME MODULE AS WHATSAPP INTERFACE)
     # Convert the user's voice recording into text that Pepper's brain can process
     
-    # PROCESS AUDIO THROUGH pepper'S HEARING SYSTEM
-    # await = wait for speech recognition to complete (can take several seconds)
+    # START pepper'S HEARING SYSTEM IN THE BACKGROUND
     # speech_to_text.transcribe() = IDENTICAL function used in WhatsApp interface
-    # Takes: raw audio data (bytes)
-    # Returns: text string of what the user said in their voice message
-    # Uses Whisper AI model via Groq API (same as WhatsApp)
-    transcription = await speech_to_text.transcribe(audio_data)
+    # Takes: raw audio data (bytes), returns: text string of what the user said
+    # asyncio.create_task() = start transcription now WITHOUT waiting for it, so the
+    # graph/session setup below happens while Whisper is still working
+    transcribe_task = asyncio.create_task(speech_to_text.transcribe(audio_data))
 
     # STEP 4: PROCESS TRANSCRIPTION THROUGH pepper'S BRAIN (IDENTICAL TO TEXT PROCESSING)
     # Now we have text from the voice message, process it through same workflow as typed messages
@@ -550,63 +676,124 @@ async def on_audio_end(elements):
     # Same session isolation mechanism as text messages (thread_id = 1 for demo)
     thread_id = cl.user_session.get("thread_id")
 
-    # SETUP CONVERSATION MEMORY AND PROCESS THROUGH pepper'S WORKFLOW
-    # async with = context manager that automatically handles database connection cleanup
-    # AsyncSqliteSaver = same conversation memory system used for text messages
-    # settings.SHORT_TERM_MEMORY_DB_PATH = same database file as text message processing
-    async with AsyncSqliteSaver.from_conn_string(settings.SHORT_TERM_MEMORY_DB_PATH) as short_term_memory:
-        
-        # BUILD pepper'S COMPLETE WORKFLOW GRAPH
-        # graph_builder.compile() = creates Pepper's complete LangGraph workflow
-        # checkpointer=short_term_memory = connect memory system (same as on_message handler)
-        # IDENTICAL workflow: memory→router→context→response nodes
-        graph = graph_builder.compile(checkpointer=short_term_memory)
-        
-        # PROCESS TRANSCRIBED TEXT THROUGH COMPLETE WORKFLOW
-        # await = wait for Pepper's complete processing to finish
-        # graph.ainvoke() = run through complete workflow and wait for final result
-        # Note: Using ainvoke() instead of astream() because we don't need word-by-word streaming for voice
-        output_state = await graph.ainvoke(
-            # FIRST PARAMETER: The message data to process
-            {"messages": [HumanMessage(content=transcription)]},  # Transcribed user speech as LangChain message
-            
-            # SECOND PARAMETER: Configuration for this processing run
-            {"configurable": {"thread_id": thread_id}},           # Same thread isolation as text messages
-        )
+    # GET pepper'S SHARED WORKFLOW GRAPH (same compiled graph + memory as text messages)
+    graph = await get_graph()
+
+    # NOW WAIT FOR THE ECHO MESSAGE AND THE TRANSCRIPTION (can take several seconds)
+    # asyncio.gather() = wait for both background tasks; results come back in the same order
+    _, transcription = await asyncio.gather(echo_task, transcribe_task)
+
+    # STEP 5: VOICE pepper'S REPLY SENTENCE BY SENTENCE WHILE SHE'S STILL WRITING IT
+    # Waiting for the whole reply and THEN synthesizing it all means the user sits through
+    # LLM time + full TTS time. Instead we stream the graph and, as soon as a sentence is
+    # complete, hand it to ElevenLabs - so by the time the LLM finishes, most of the
+    # audio already exists and only the last sentence is left to synthesize.
+    #
+    # voice_filter = drops *actions* from the raw token stream (they'd be read aloud otherwise)
+    # sentences = collects tokens until a full sentence is ready to speak
+    # audio_tasks = one running synthesis per sentence, in speaking order
+    voice_filter = AsteriskStreamFilter()
+    sentences = SentenceAggregator()
+    audio_tasks = []
+    final_values = {}
+
+    # SHOW THE REPLY TEXT AS IT'S WRITTEN (the audio player is attached once it's ready)
+    # Same batching as on_message: one WebSocket frame per ~30ms / 8 tokens, not per token
+    msg = cl.Message(content="")
+    loop = asyncio.get_running_loop()
+    pending_tokens = []
+    last_flush = loop.time()
 
-    # STEP 5: CONVERT pepper'S TEXT RESPONSE TO SPEECH (SAME MODULE AS AUDIO_NODE)
-    # For voice conversations, we always respond with voice (more natural than text reply to voice)
-    
-    # EXTRACT pepper'S TEXT RESPONSE FROM WORKFLOW STATE
-    # output_state["messages"] = list of all messages in the conversation
+    async for mode, chunk in graph.astream(
+        # FIRST PARAMETER: The message data to process
+        {"messages": [HumanMessage(content=transcription)]},  # Transcribed user speech as LangChain message
+        
+        # SECOND PARAMETER: Configuration for this processing run
+        {"configurable": {"thread_id": thread_id}},           # Same thread isolation as text messages
+
+        # THIRD PARAMETER: word-by-word tokens + the final state (same modes as on_message)
+        stream_mode=["messages", "values"],
+    ):
+        if mode == "values":
+            final_values = chunk
+            continue
+
+        # Only the reply itself gets spoken - not the router's or memory extractor's LLM calls
+        message_chunk, metadata = chunk
+        if metadata["langgraph_node"] in SPOKEN_REPLY_NODES and type(message_chunk) is AIMessageChunk:
+            text = voice_filter.feed(message_chunk.content)
+            for sentence in sentences.push(text):
+                # START SYNTHESIZING THIS SENTENCE - but DON'T wait for it here
+                # asyncio.create_task() = fire it off and go straight back to reading tokens,
+                # so several sentences (and the LLM) are all in flight at the same time
+                audio_tasks.append(asyncio.create_task(text_to_speech.synthesize(sentence)))
+
+            # STREAM THE SAME (asterisk-free) TEXT TO THE BROWSER IN BATCHES
+            pending_tokens.append(text)
+            if len(pending_tokens) >= 8 or loop.time() - last_flush > 0.03:
+                await msg.stream_token("".join(pending_tokens))
+                pending_tokens.clear()
+                last_flush = loop.time()
+
+    # SEND WHATEVER IS LEFT IN THE LAST BATCH
+    if pending_tokens:
+        await msg.stream_token("".join(pending_tokens))
+
+    # EXTRACT pepper'S TEXT RESPONSE FROM THE FINAL STREAMED STATE
+    # final_values["messages"] = list of all messages in the conversation
     # [-1] = get the last message (Pepper's response)
     # .content = the actual text content of Pepper's response
-    response_text = output_state["messages"][-1].content
-    
-    # SYNTHESIZE pepper'S RESPONSE INTO SPEECH
-    # await = wait for text-to-speech conversion to complete
-    # text_to_speech.synthesize() = IDENTICAL function used in audio_node
-    # Takes: Pepper's response text
-    # Returns: audio buffer (bytes) of Pepper speaking the response
-    # Uses ElevenLabs API with Pepper's configured voice (same as audio_node)
-    audio_buffer = await text_to_speech.synthesize(response_text)
-
-    # STEP 6: SEND VOICE RESPONSE BACK TO USER
-    # Display both text and audio so user can read along while listening
-    
-    # CREATE AUDIO ELEMENT FOR pepper'S VOICE RESPONSE
-    # cl.Audio() = creates an audio player widget in the web interface
-    output_audio_el = cl.Audio(
-        name="Audio",                    # Label shown in the web interface
-        auto_play=True,                  # Start playing immediately when message appears
-        mime="audio/mpeg3",              # Audio format (MP3) for web browser playback
-        content=audio_buffer,            # The actual synthesized audio data
-    )
-    
-    # SEND MESSAGE WITH BOTH TEXT AND AUDIO TO WEB INTERFACE
-    # await = wait for message to be sent to user's browser
-    # cl.Message() = creates a message in the chat interface
-    # content=response_text = Pepper's text response (user can read while listening)
-    # elements=[output_audio_el] = attach the audio player to this message
-    # This creates a message with both readable text and playable audio
-    await cl.Message(content=response_text, elements=[output_audio_el]).send()
+    response_text = final_values["messages"][-1].content
+
+    # SPEAK WHATEVER IS LEFT (the last sentence usually has no trailing space)
+    # If no sentence was voiced during the stream (short reply, or image_node answered),
+    # the whole final reply is voiced here instead
+    if audio_tasks:
+        remaining = sentences.push(voice_filter.flush())
+        remaining.append(sentences.flush())
+    else:
+        remaining = [response_text]
+    for sentence in remaining:
+        if sentence:
+            audio_tasks.append(asyncio.create_task(text_to_speech.synthesize(sentence)))
+
+    # STEP 6: SEND VOICE RESPONSE BACK TO USER - FIRST SENTENCE FIRST
+    # One big MP3 can't start playing until the LAST sentence is synthesized and the whole
+    # file has crossed the WebSocket. Instead the reply is sent as a few clips that grow in
+    # size: sentence 1, then the next 2, then the next 4, then everything left. The first clip
+    # is usually ready by the time the LLM finishes, and each later clip has the whole
+    # playback time of the clips before it to finish synthesizing.
+
+    # FINISH THE STREAMED MESSAGE WITH THE FINAL TEXT (the audio players attach to it below)
+    # content=response_text = Pepper's final text (user can read while listening)
+    # msg.send() = finalize the message (same as on_message does after streaming)
+    msg.content = response_text
+    await msg.send()
+
+    # play_until = when (on the event loop's clock) the previous clip stops playing
+    clip_start, clip_size = 0, 1
+    play_until = loop.time()
+    while clip_start < len(audio_tasks):
+        clip_end = len(audio_tasks) if clip_size > 4 else clip_start + clip_size
+
+        # COLLECT THIS CLIP'S SENTENCES - gather() returns results in the order the tasks were
+        # created, so they stay in speaking order no matter which one finished first
+        # MP3 files are a plain sequence of frames, so the sentence audio joins into one playable clip
+        clip_audio = b"".join(await asyncio.gather(*audio_tasks[clip_start:clip_end]))
+
+        # DON'T TALK OVER HERSELF - every clip auto-plays as soon as it arrives,
+        # so wait until the previous one has finished before sending the next
+        await asyncio.sleep(max(0.0, play_until - loop.time()))
+
+        # CREATE AUDIO ELEMENT FOR THIS PART OF pepper'S VOICE RESPONSE
+        # cl.Audio() = creates an audio player widget in the web interface
+        # .send(for_id=msg.id) = attach the player to the reply message above
+        await cl.Audio(
+            name="Audio",                    # Label shown in the web interface
+            auto_play=True,                  # Start playing immediately when it appears
+            mime=AUDIO_MIME_MP3,             # Audio format (MP3) for web browser playback
+            content=clip_audio,              # The synthesized audio for these sentences
+        ).send(for_id=msg.id)
+
+        play_until = loop.time() + len(clip_audio) / MP3_BYTES_PER_SECOND
+        clip_start, clip_size = clip_end, clip_size * 2
@@ -18,8 +18,10 @@
 # - This file: Makes outbound calls TO users
 # - vapi_endpoints.py: Processes voice conversations when users talk
 
+import asyncio  # to_thread() = run the synchronous Vapi SDK without blocking other requests
 import os
 import logging
+import re  # Compiled pattern for phone number validation
 from typing import Dict, Optional, Any, List
 from datetime import datetime
 
@@ -34,6 +36,59 @@ except ImportError:
 # Import Pepper's settings (for API keys and configuration)
 from ai_companion.settings import settings
 
+# One logger for this whole file (logging caches loggers by name, so every VapiClient shares it)
+logger = logging.getLogger(__name__)
+
+# E.164 PHONE NUMBER - "+", a country code that never starts with 0, 8-15 digits in total
+# Compiled once here; match() then checks the whole number in a single C-level call
+# (a plain startswith('+') let "+abc" through to Vapi)
+_E164 = re.compile(r"\+[1-9]\d{7,14}")
+
+# VOICE ASSISTANT TEMPLATE - Everything about Pepper's phone assistant that never changes
+# create_voice_assistant() copies this and adds the endpoint URL, voice ID and greeting,
+# instead of rebuilding the whole nested dict from literals every time
+_ASSISTANT_CONFIG_TEMPLATE = {
+    # A fixed display name - the assistant is created once and reused, so there's no
+    # per-call timestamp to format (and Vapi only shows the name in its dashboard)
+    "name": "Pepper Voice Assistant",
+    
+    # MODEL CONFIGURATION - Use OUR Groq LLM instead of Vapi's default
+    # This is the key part that makes Vapi use YOUR existing AI brain!
+    # "url" (our endpoint) is added per client from RAILWAY_URL
+    "model": {
+        "provider": "custom-llm",  # Tell Vapi to use our custom endpoint
+        "model": "groq-llama-3.3-70b-versatile",  # Our actual model name
+        "temperature": 0.7,  # Conversational but not too random
+        "max_tokens": 150,  # Keep responses concise for voice (people don't like long speeches)
+    },
+    
+    # VOICE CONFIGURATION - Use same voice as WhatsApp voice messages
+    # This ensures Pepper sounds the same whether on WhatsApp or phone calls
+    # "voice_id" is added per client from ELEVENLABS_VOICE_ID
+    "voice": {
+        "provider": "11labs",
+        "stability": 0.5,  # Balanced voice stability
+        "similarity_boost": 0.8,  # High similarity to original voice
+        "style": 0.0,  # Natural style, not overly dramatic
+        "use_speaker_boost": True,  # Enhance voice quality
+        # Same latency/quality trade-off as Pepper's WhatsApp and Chainlit voice
+        "optimize_streaming_latency": settings.TTS_OPTIMIZE_STREAMING_LATENCY,
+    },
+    
+    # NOTE: System prompt is handled by our LangGraph workflow in /vapi/chat/completions endpoint
+    # Vapi just handles voice infrastructure, our endpoint handles conversation logic
+    
+    # CALL SETTINGS - Only parameters supported by Vapi SDK
+    "end_call_message": "Thanks for calling! I'll send you a summary on WhatsApp.",
+    
+    # NOTE: The following settings are handled at the account/phone number level in Vapi:
+    # - Recording (configured in Vapi dashboard)
+    # - Silence timeouts (handled by Vapi's default settings)
+    # - Background sound (managed by Vapi)
+    # - Client/server messages (configured via Vapi dashboard)
+}
+
+
 class VapiClient:
     """
     VAPI CLIENT WRAPPER - Pepper's phone dialing system
@@ -47,7 +102,8 @@ class VapiClient:
     - Check if calls are still active (get_call_status)
     
     📞 KEY FEATURES:
-    - Creates custom voice assistants for each call with relevant context
+    - Creates ONE voice assistant (the "template") and reuses it for every call
+    - Passes each call's context as per-call overrides instead of a new assistant
     - Uses your existing ElevenLabs voice for consistency
     - Passes WhatsApp conversation context to voice calls
     - Handles errors gracefully with helpful messages
@@ -86,41 +142,42 @@ class VapiClient:
         self.voice_id = settings.ELEVENLABS_VOICE_ID
         if not self.voice_id:
             self.voice_id = "uju3wxzG5OhpWcoi3SMy"  # Default ElevenLabs voice
-            logging.warning("⚠️ ELEVENLABS_VOICE_ID not found, using default voice")
+            logger.warning("⚠️ ELEVENLABS_VOICE_ID not found, using default voice")
         
         # GET RAILWAY URL FOR CUSTOM LLM ENDPOINT
         # This tells Vapi where to send voice conversations for processing
         self.railway_url = settings.RAILWAY_URL
         if not self.railway_url:
-            logging.warning("⚠️ RAILWAY_URL not found in settings, using default")
+            logger.warning("⚠️ RAILWAY_URL not found in settings, using default")
             self.railway_url = "https://pepper-whatsapp-agent-course-production.up.railway.app"
         
         # INITIALIZE VAPI CLIENT
         # This creates the actual connection to Vapi's service
         try:
             self.client = Vapi(token=self.api_key)
-            logging.info("✅ Vapi client initialized successfully")
+            logger.info("✅ Vapi client initialized successfully")
         except Exception as e:
-            logging.error(f"❌ Failed to initialize Vapi client: {str(e)}")
+            logger.error("❌ Failed to initialize Vapi client: %s", e)
             raise
         
-        # SET UP LOGGING
-        self.logger = logging.getLogger(__name__)
-        
-        # LOG CONFIGURATION FOR DEBUGGING
-        self.logger.info(f"📞 VAPI CLIENT CONFIGURED:")
-        self.logger.info(f" Phone Number ID: {self.phone_number_id}")
-        self.logger.info(f" Voice ID: {self.voice_id}")
-        self.logger.info(f" Railway URL: {self.railway_url}")
-        
-        # VALIDATE CONNECTION
-        # Test the connection by attempting to list phone numbers
+        # TEMPLATE ASSISTANT CACHE - Create Pepper's voice assistant once, not once per call
+        # Everything that changes per call (greeting, WhatsApp context) goes in assistantOverrides,
+        # so the assistant itself only depends on the voice and the Railway URL.
+        # _template_key = the (voice_id, railway_url) the cached assistant was built with
+        self._template_assistant_id: Optional[str] = None
+        self._template_key: Optional[tuple] = None
+        self._template_lock = asyncio.Lock()
+        
+        # LOG CONFIGURATION FOR DEBUGGING (one record, values filled in only if it's emitted)
+        logger.info(
+            "📞 VAPI CLIENT CONFIGURED: phone_number_id=%s voice_id=%s railway_url=%s",
+            self.phone_number_id, self.voice_id, self.railway_url,
+        )
+        
+        # CONNECTION NOT CHECKED YET
+        # validate_connection() makes a blocking network call, so it's NOT run here -
+        # get_vapi_client() runs it in a worker thread right after creating the client
         self._is_valid = False
-        try:
-            self.validate_connection()
-        except Exception as e:
-            self.logger.error(f"⚠️ Vapi connection validation failed: {str(e)}")
-            self.logger.error("⚠️ Voice calling will not be pepperilable")
     
     def validate_connection(self) -> bool:
         """
@@ -137,7 +194,7 @@ class VapiClient:
         try:
             # TEST API CONNECTION
             # Try to list phone numbers (simplest API call)
-            self.logger.info("🔍 Validating Vapi connection...")
+            logger.info("🔍 Validating Vapi connection...")
             
             # Make a simple API call to test credentials
             # Note: We're using the synchronous version for initialization
@@ -145,33 +202,36 @@ class VapiClient:
             
             # If we got here, connection is valid
             self._is_valid = True
-            self.logger.info("✅ Vapi connection validated successfully")
-            self.logger.info(f"   Found {len(phone_numbers) if phone_numbers else 0} phone numbers")
+            logger.info(
+                "✅ Vapi connection validated successfully: %d phone numbers",
+                len(phone_numbers) if phone_numbers else 0,
+            )
             
             # Verify our configured phone number exists
             if phone_numbers:
                 phone_ids = [str(pn.id) for pn in phone_numbers]
                 if self.phone_number_id not in phone_ids:
-                    self.logger.warning(f"⚠️ Configured phone number ID not found in Vapi account")
-                    self.logger.warning(f"   Configured: {self.phone_number_id}")
-                    self.logger.warning(f"   Pepperilable: {phone_ids}")
+                    logger.warning(
+                        "⚠️ Configured phone number ID not found in Vapi account: configured=%s pepperilable=%s",
+                        self.phone_number_id, phone_ids,
+                    )
             
             return True
             
         except Exception as e:
             self._is_valid = False
-            self.logger.error(f"❌ Vapi connection validation failed: {str(e)}")
             
-            # Provide helpful error messages based on common issues
+            # Provide helpful error messages based on common issues (one record: error + hint)
             error_msg = str(e).lower()
             if "unauthorized" in error_msg or "401" in error_msg:
-                self.logger.error("   → Check your VAPI_API_PRIVATE_KEY is correct")
+                hint = "Check your VAPI_API_PRIVATE_KEY is correct"
             elif "not found" in error_msg or "404" in error_msg:
-                self.logger.error("   → Check your VAPI_PHONE_NUMBER_ID is correct")
+                hint = "Check your VAPI_PHONE_NUMBER_ID is correct"
             elif "network" in error_msg or "connection" in error_msg:
-                self.logger.error("   → Check your internet connection")
+                hint = "Check your internet connection"
             else:
-                self.logger.error(f"   → Unexpected error: {str(e)}")
+                hint = "Unexpected error"
+            logger.error("❌ Vapi connection validation failed: %s → %s", e, hint)
             
             return False
     
@@ -184,6 +244,26 @@ class VapiClient:
         """
         return self._is_valid
     
+    async def get_template_assistant_id(self) -> str:
+        """
+        GET TEMPLATE ASSISTANT - Pepper's reusable voice assistant, created on first use
+        
+        🔗 REAL-WORLD ANALOGY: Instead of printing a brand new employee handbook before
+        every phone call, print it once and hand each caller's notes over separately
+        
+        📞 WHY: Creating an assistant is an extra round trip to Vapi (200-500ms) before
+        every call, and leaves a new assistant behind in the Vapi account each time.
+        A new template is only created if the voice or Railway URL changes.
+        """
+        template_key = (self.voice_id, self.railway_url)
+        if self._template_assistant_id is None or self._template_key != template_key:
+            async with self._template_lock:
+                # Check again - another call may have created it while we waited
+                if self._template_assistant_id is None or self._template_key != template_key:
+                    self._template_assistant_id = await self.create_voice_assistant({})
+                    self._template_key = template_key
+        return self._template_assistant_id
+
     async def create_voice_assistant(self, context: Dict[str, Any]) -> str:
         """
         CREATE VOICE ASSISTANT - Sets up Pepper's voice personality for a specific call
@@ -213,64 +293,32 @@ class VapiClient:
         try:
             # PREPARE VOICE ASSISTANT CONFIGURATION
             # This tells Vapi how to make Pepper sound and behave on phone calls
+            # Start from the static template and fill in only what depends on this client/call
+            # ({**template, ...} copies - the module-level template itself is never modified)
             assistant_config = {
-                "name": f"Pepper Voice Assistant - {datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                
-                # MODEL CONFIGURATION - Use OUR Groq LLM instead of Vapi's default
-                # This is the key part that makes Vapi use YOUR existing AI brain!
-                "model": {
-                    "provider": "custom-llm",  # Tell Vapi to use our custom endpoint
-                    "model": "groq-llama-3.3-70b-versatile",  # Our actual model name
-                    "url": f"{self.railway_url}/vapi/chat/completions",  # Our endpoint
-                    "temperature": 0.7,  # Conversational but not too random
-                    "max_tokens": 150,  # Keep responses concise for voice (people don't like long speeches)
-                },
-                
-                # VOICE CONFIGURATION - Use same voice as WhatsApp voice messages
-                # This ensures Pepper sounds the same whether on WhatsApp or phone calls
-                "voice": {
-                    "provider": "11labs",
-                    "voice_id": self.voice_id,  # Same voice for consistency
-                    "stability": 0.5,  # Balanced voice stability
-                    "similarity_boost": 0.8,  # High similarity to original voice
-                    "style": 0.0,  # Natural style, not overly dramatic
-                    "use_speaker_boost": True,  # Enhance voice quality
-                }, 
-                
-                # CONVERSATION SETUP
+                **_ASSISTANT_CONFIG_TEMPLATE,
+                "model": {**_ASSISTANT_CONFIG_TEMPLATE["model"], "url": f"{self.railway_url}/vapi/chat/completions"},
+                "voice": {**_ASSISTANT_CONFIG_TEMPLATE["voice"], "voice_id": self.voice_id},
                 # First thing Pepper says when the call connects
                 "first_message": self._create_first_message(context),
-                
-                # NOTE: System prompt is handled by our LangGraph workflow in /vapi/chat/completions endpoint
-                # Vapi just handles voice infrastructure, our endpoint handles conversation logic
-                
-                # CALL SETTINGS - Only parameters supported by Vapi SDK
-                "end_call_message": "Thanks for calling! I'll send you a summary on WhatsApp.",
-                
-                # NOTE: The following settings are handled at the account/phone number level in Vapi:
-                # - Recording (configured in Vapi dashboard)
-                # - Silence timeouts (handled by Vapi's default settings)
-                # - Background sound (managed by Vapi)
-                # - Client/server messages (configured via Vapi dashboard)
             }
             
             # CREATE ASSISTANT VIA VAPI API
             # This actually creates the voice assistant on Vapi's servers
-            assistant = self.client.assistants.create(**assistant_config)
+            # The Vapi SDK is synchronous - asyncio.to_thread() keeps the HTTP wait off the event
+            # loop so WhatsApp webhooks and other conversations keep running meanwhile
+            assistant = await asyncio.to_thread(self.client.assistants.create, **assistant_config)
             assistant_id = assistant.id
             
-            self.logger.info(f"✅ VOICE ASSISTANT CREATED: {assistant_id} for {context.get('userName', 'unknown user')}")
+            logger.info("✅ VOICE ASSISTANT CREATED: %s for %s", assistant_id, context.get('userName', 'unknown user'))
             return assistant_id
             
         except Exception as e:
-            self.logger.error(f"🚨 ASSISTANT CREATION ERROR: {str(e)}")
-            self.logger.error(f"   📋 Context provided: {context}")
-            self.logger.error(f"   🌐 Railway URL: {self.railway_url}")
-            self.logger.error(f"   🎤 Voice ID: {self.voice_id}")
-            self.logger.error(f"   📞 Phone Number ID: {self.phone_number_id}")
-            # Include full exception details for debugging
-            import traceback
-            self.logger.error(f"   📚 Full traceback: {traceback.format_exc()}")
+            # logger.exception() = error message + full traceback, formatted only if it's actually emitted
+            logger.exception(
+                "🚨 ASSISTANT CREATION ERROR: %s | context=%s railway_url=%s voice_id=%s phone_number_id=%s",
+                e, context, self.railway_url, self.voice_id, self.phone_number_id,
+            )
             raise
     
     def _create_first_message(self, context: Dict[str, Any]) -> str:
@@ -284,59 +332,15 @@ class VapiClient:
         user_name = context.get('userName', 'there')
         calling_reason = context.get('callingReason', 'You requested a callback')
         
-        # Create personalized greeting
-        greeting = f"Hi {user_name}! This is Pepper calling you back from WhatsApp."
-        
-        # Add context about why we're calling
-        if 'recent_context' in context and context['recent_context']:
-            greeting += f" I have our recent conversation context, so we can pick up right where we left off."
+        # Add context about why we're calling - picked BEFORE the greeting is built,
+        # so the whole greeting is assembled in one f-string instead of three += copies
+        if context.get('recent_context'):
+            reason = "I have our recent conversation context, so we can pick up right where we left off."
         else:
-            greeting += f" {calling_reason}."
-        
-        greeting += " How can I help you today?"
-        
-        return greeting
-    
-    def _create_system_prompt(self, context: Dict[str, Any]) -> str:
-        """
-        CREATE SYSTEM PROMPT - Pepper's "job description" for phone calls
-        
-        🔗 REAL-WORLD ANALOGY: Like giving an employee a detailed job description
-        before they handle customer calls, including:
-        - What's their role and personality?
-        - What information do they have about this specific caller?
-        - How should they handle different situations?
-        """
-        user_name = context.get('userName', 'the caller')
-        recent_context = context.get('recentContext', 'No recent context pepperilable')
-        conversation_topic = context.get('conversationTopic', 'General conversation')
-        
-        system_prompt = f"""You are Pepper, a helpful AI assistant. You're currently on a phone call with {user_name}.
-
-RECENT CONTEXT FROM WHATSAPP:
-{recent_context}
+            reason = f"{calling_reason}."
 
-CONVERSATION TOPIC: {conversation_topic}
-
-PHONE CALL GUIDELINES:
-- Be conversational and natural (this is a phone call, not text messages)
-- Reference the WhatsApp conversation naturally when relevant
-- Keep responses concise - people don't like long speeches on phone calls
-- If you need to share detailed information, offer to send it via WhatsApp
-- Be the same helpful, friendly Pepper they know from messaging
-- If the caller asks about something not in your context, politely ask them to elaborate
-- End responses with questions to keep the conversation flowing naturally
-
-PERSONALITY:
-- Warm and friendly, like talking to a good friend
-- Professional but not formal or robotic
-- Genuinely interested in helping
-- Patient and good at listening
-- Quick to understand and respond appropriately
-
-REMEMBER: This is a continuation of your WhatsApp relationship with this user. They called because they wanted to talk, so make it a great conversation!"""
-        
-        return system_prompt
+        # Create personalized greeting
+        return f"Hi {user_name}! This is Pepper calling you back from WhatsApp. {reason} How can I help you today?"
     
     async def make_outbound_call(self, to_number: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -351,9 +355,9 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
         4. Provides a reference number for tracking the call
         
         📞 TECHNICAL PROCESS:
-        1. Create a voice assistant configured with user context
+        1. Reuse Pepper's template voice assistant (created on the first call)
         2. Set up the call with Vapi (who to call, which assistant to use)
-        3. Pass WhatsApp context via variableValues
+        3. Pass WhatsApp context + personalized greeting via assistant overrides
         4. Initiate the actual phone call
         5. Return call details for tracking
         
@@ -364,34 +368,32 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
         Returns:
             call_details: Information about the initiated call
         """
+        # STEP 1: VALIDATE PHONE NUMBER - before anything else is logged, built or sent
+        # fullmatch() = the WHOLE string must be a valid E.164 number (no trailing junk)
+        # Raised outside the try below: a bad number is the caller's mistake, not a reason
+        # to forget the cached template assistant
+        if not to_number or not _E164.fullmatch(to_number):
+            logger.error("❌ INVALID PHONE NUMBER: '%s' (expected E.164 format: +14155552671)", to_number)
+            raise ValueError(f"Invalid phone number: {to_number}")
+
         try:
             # CHECK CONNECTION STATUS FIRST
             if not self.is_connected():
-                self.logger.error(f"❌ VAPI NOT CONNECTED - Cannot make calls")
-                self.logger.error(f"   Run validate_connection() to test credentials")
+                logger.error("❌ VAPI NOT CONNECTED - Cannot make calls (run validate_connection() to test credentials)")
                 raise Exception("Vapi client is not properly connected. Check API credentials.")
             
-            # 📊 LOG CALL INITIATION DETAILS
-            self.logger.info(f"📞 INITIATING OUTBOUND CALL:")
-            self.logger.info(f"   📱 To: {to_number}")
-            self.logger.info(f"   👤 User: {context.get('userName', 'Unknown')}")
-            self.logger.info(f"   💬 Topic: {context.get('conversationTopic', 'General')}")
-            self.logger.info(f"   🔤 Context length: {len(str(context.get('recentContext', '')))} chars")
-            
-            # STEP 1: VALIDATE PHONE NUMBER
-            # Make sure we have a valid phone number to call
-            if not to_number or not to_number.startswith('+'):
-                self.logger.error(f"❌ INVALID PHONE NUMBER: '{to_number}'")
-                self.logger.error(f"   Expected format: +1234567890")
-                raise ValueError(f"Invalid phone number: {to_number}")
-            
-            self.logger.info(f"✅ Phone number validation passed: {to_number}")
+            # 📊 LOG CALL INITIATION DETAILS (one record instead of one per field)
+            logger.info(
+                "📞 INITIATING OUTBOUND CALL: to=%s user=%s topic=%s context_chars=%d",
+                to_number,
+                context.get('userName', 'Unknown'),
+                context.get('conversationTopic', 'General'),
+                len(str(context.get('recentContext', ''))),
+            )
             
-            # STEP 2: CREATE VOICE ASSISTANT FOR THIS SPECIFIC CALL
-            # This sets up Pepper's voice personality with the user's context
-            self.logger.info(f"🤖 Creating voice assistant with context...")
-            assistant_id = await self.create_voice_assistant(context)
-            self.logger.info(f"✅ Voice assistant created: {assistant_id}")
+            # STEP 2: GET PEPPER'S VOICE ASSISTANT (created once, reused for every call)
+            # The user's context goes in assistant_overrides below, not into a new assistant
+            assistant_id = await self.get_template_assistant_id()
             
             # STEP 3: PREPARE CALL CONFIGURATION
             # This tells Vapi who to call, which assistant to use, and what context to provide
@@ -403,6 +405,8 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
                 # ASSISTANT OVERRIDES - Pass WhatsApp context to voice call
                 # This is like giving Pepper a "cheat sheet" before the call
                 "assistant_overrides": {
+                    # Personalized greeting for THIS caller (replaces the template's generic one)
+                    "first_message": self._create_first_message(context),
                     "variable_values": {
                         "userName": context.get("userName", ""),
                         "recentContext": context.get("recentContext", ""),
@@ -416,13 +420,7 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
             
             # STEP 4: MAKE THE ACTUAL PHONE CALL
             # This sends the call request to Vapi's servers
-            self.logger.info(f"📡 Sending call request to Vapi...")
-            self.logger.info(f"   📞 Phone Number ID: {self.phone_number_id}")
-            self.logger.info(f"   🎯 Target: {to_number}")
-            self.logger.info(f"   🤖 Assistant: {assistant_id}")
-            
-            call = self.client.calls.create(**call_config)
-            self.logger.info(f"✅ Vapi call request successful: {call.id}")
+            call = await asyncio.to_thread(self.client.calls.create, **call_config)  # Off the event loop
             
             # STEP 5: PREPARE RESPONSE WITH CALL DETAILS
             # Return information about the call for tracking and user feedback
@@ -436,24 +434,21 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
                 "estimated_ring_time": "10-15 seconds"
             }
             
-            self.logger.info(f"🎉 OUTBOUND CALL SUCCESSFULLY INITIATED:")
-            self.logger.info(f"   📞 Call ID: {call.id}")
-            self.logger.info(f"   📱 Calling: {to_number}")
-            self.logger.info(f"   🤖 Assistant: {assistant_id}")
-            self.logger.info(f"   ⏰ Timestamp: {datetime.now().isoformat()}")
-            self.logger.info(f"   📋 Expected caller ID: {call_details['expected_caller_id']}")
+            logger.info(
+                "🎉 OUTBOUND CALL SUCCESSFULLY INITIATED: call_id=%s to=%s assistant=%s caller_id=%s",
+                call.id, to_number, assistant_id, call_details['expected_caller_id'],
+            )
             
             return call_details
             
         except Exception as e:
-            self.logger.error(f"🚨 OUTBOUND CALL FAILED: {str(e)}")
-            self.logger.error(f"   📱 Target number: {to_number}")
-            self.logger.error(f"   👤 User context: {context.get('userName', 'Unknown')}")
-            self.logger.error(f"   📞 Phone Number ID: {self.phone_number_id}")
-            self.logger.error(f"   🌐 Railway URL: {self.railway_url}")
-            # Log the full exception details
-            import traceback
-            self.logger.error(f"   📚 Full traceback: {traceback.format_exc()}")
+            # Forget the template in case it was deleted on Vapi's side - the next call recreates it
+            self._template_assistant_id = None
+            # logger.exception() = error message + full traceback, formatted only if it's actually emitted
+            logger.exception(
+                "🚨 OUTBOUND CALL FAILED: %s | to=%s user=%s phone_number_id=%s railway_url=%s",
+                e, to_number, context.get('userName', 'Unknown'), self.phone_number_id, self.railway_url,
+            )
             # Re-raise with more context for debugging
             raise Exception(f"Failed to initiate call to {to_number}: {str(e)}")
     
@@ -468,7 +463,7 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
         how long they lasted, why they ended, etc.
         """
         try:
-            call = self.client.calls.get(call_id)
+            call = await asyncio.to_thread(self.client.calls.get, call_id)  # Off the event loop
             return {
                 "id": call.id,
                 "status": call.status,
@@ -478,10 +473,7 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
                 "updated_at": getattr(call, 'updatedAt', None)
             }
         except Exception as e:
-            self.logger.error(f"🚨 CALL STATUS CHECK FAILED: {str(e)}")
-            self.logger.error(f"   📞 Call ID: {call_id}")
-            import traceback
-            self.logger.error(f"   📚 Full traceback: {traceback.format_exc()}")
+            logger.exception("🚨 CALL STATUS CHECK FAILED: %s (call ID: %s)", e, call_id)
             return {"error": str(e), "call_id": call_id}
     
     async def list_recent_calls(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -495,7 +487,8 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
         call history to users
         """
         try:
-            calls = self.client.calls.list(limit=limit)
+            # list() inside the worker thread too, in case the SDK fetches pages lazily while iterating
+            calls = await asyncio.to_thread(lambda: list(self.client.calls.list(limit=limit)))
             call_list = []
             
             for call in calls:
@@ -512,40 +505,60 @@ REMEMBER: This is a continuation of your WhatsApp relationship with this user. T
             return call_list
             
         except Exception as e:
-            self.logger.error(f"🚨 LIST CALLS ERROR: {str(e)}")
+            logger.error("🚨 LIST CALLS ERROR: %s", e)
             return []
 
-# SINGLETON INSTANCE - One phone dialer for the whole application
+# SINGLETON FACTORY - One phone dialer for the whole application, created on first use
 # This creates a single VapiClient that can be used throughout Pepper
-# Like having one phone system for the entire office
-try:
-    # ATTEMPT TO CREATE VAPI CLIENT
-    # This will fail if required environment variables are missing
-    vapi_client = VapiClient()
-    logging.info("✅ Global Vapi client created successfully")
-    
-    # LOG CONNECTION STATUS
-    if vapi_client.is_connected():
-        logging.info("✅ Vapi connection validated - Voice calling is pepperilable")
-    else:
-        logging.warning("⚠️ Vapi client created but connection invalid - Voice calling disabled")
-        
-except ValueError as e:
-    # MISSING CONFIGURATION
-    logging.error(f"❌ Missing Vapi configuration: {str(e)}")
-    logging.error("   → Add required variables to your .env file")
-    logging.error("   → Voice calling will be disabled")
-    vapi_client = None
-    
-except ImportError as e:
-    # MISSING VAPI SDK
-    logging.error(f"❌ Vapi SDK not installed: {str(e)}")
-    logging.error("   → Run: pip install vapi_server_sdk")
-    logging.error("   → Voice calling will be disabled")
-    vapi_client = None
+# Like having one phone system for the entire office - but it's only switched on the first
+# time someone actually needs to make a call (or checks /vapi/health), not when this file
+# is imported. Only a client whose credentials checked out is kept: after a failure
+# (missing config, Vapi unreachable) the next caller simply tries again.
+_vapi_client: Optional[VapiClient] = None
+_vapi_client_lock = asyncio.Lock()
+
+
+async def get_vapi_client() -> Optional[VapiClient]:
+    """
+    GET VAPI CLIENT - Returns the shared VapiClient, or None if voice calling is unavailable
     
-except Exception as e:
-    # OTHER ERRORS
-    logging.error(f"❌ Failed to create global Vapi client: {str(e)}")
-    logging.error("   → Voice calling will be disabled")
-    vapi_client = None
\ No newline at end of file
+    🔗 REAL-WORLD ANALOGY: Like only turning on the office phone system the first time
+    someone picks up a handset, then leaving it on for everyone after that
+    """
+    global _vapi_client
+    if _vapi_client is not None:
+        return _vapi_client
+
+    async with _vapi_client_lock:
+        # Check again - another request may have connected it while we waited
+        if _vapi_client is not None:
+            return _vapi_client
+        try:
+            # ATTEMPT TO CREATE VAPI CLIENT
+            # This will fail if required environment variables are missing
+            client = VapiClient()
+            logger.info("✅ Global Vapi client created successfully")
+            
+            # VALIDATE CONNECTION - the Vapi SDK is synchronous, so the test call runs in a
+            # worker thread and every other conversation keeps going while it waits
+            if await asyncio.to_thread(client.validate_connection):
+                logger.info("✅ Vapi connection validated - Voice calling is pepperilable")
+                _vapi_client = client  # Only a working client is shared
+            else:
+                logger.warning("⚠️ Vapi client created but connection invalid - Voice calling disabled")
+            return client
+            
+        except ValueError as e:
+            # MISSING CONFIGURATION
+            logger.error("❌ Missing Vapi configuration: %s → Add required variables to your .env file (voice calling disabled)", e)
+            return None
+            
+        except ImportError as e:
+            # MISSING VAPI SDK
+            logger.error("❌ Vapi SDK not installed: %s → Run: pip install vapi_server_sdk (voice calling disabled)", e)
+            return None
+            
+        except Exception as e:
+            # OTHER ERRORS
+            logger.error("❌ Failed to create global Vapi client: %s (voice calling disabled)", e)
+            return None
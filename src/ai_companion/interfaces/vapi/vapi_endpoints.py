@@ -15,26 +15,49 @@
 # 🌐 KEY INSIGHT: Pepper's brain (LangGraph + Groq) doesn't know this is voice vs WhatsApp!
 # We just change the input/output format, but the AI processing stays identical.
 
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 import asyncio
 import logging
 from datetime import datetime
 import os
-import json
+import time
+import uuid
+
+# orjson = C-implemented JSON encoder (several times faster than the stdlib json module)
+# Used for the streaming chunks below - one JSON document per word of every spoken reply -
+# and (through ORJSONResponse) for every JSON response this router returns
+import orjson
+
+# Pepper's settings (reply cache size and lifetime)
+from ai_companion.settings import settings
+
+# One logger for this whole file - with lazy "%s" arguments, a record that isn't emitted
+# (e.g. DEBUG in production) costs a level check instead of building its f-string
+logger = logging.getLogger(__name__)
 
 # Import Pepper's existing brain components (no changes to these!)
 # This is like importing the "department experts" who will handle the actual work
 try:
     from ai_companion.graph.graph import graph
+    # get_graph() = the compiled graph WITH the SQLite checkpointer (same one WhatsApp/Chainlit use)
+    # - lets each phone call keep its own conversation state from turn to turn
+    from ai_companion.graph.persistence import get_graph
     from ai_companion.graph.state import AICompanionState
-    from langchain_core.messages import HumanMessage, AIMessage
+    from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk
+    from ai_companion.graph.utils.helpers import AsteriskStreamFilter
+    from ai_companion.modules.schedules.context_generation import ScheduleContextGenerator
+    # Reported by health_check() - decided once here instead of re-importing on every GET
+    _GRAPH_STATUS = "pepperilable" if graph else "not_pepperilable"
 except ImportError as e:
-    logging.error(f"❌ Could not import Pepper's core components: {e}")
+    logger.error("❌ Could not import Pepper's core components: %s", e)
     # For development, we'll create a simple fallback
     graph = None
+    _GRAPH_STATUS = "import_error"
 
 # VAPI REQUEST/RESPONSE MODELS
 # These define the "language" that Vapi speaks when talking to our server
@@ -57,13 +80,21 @@ class VapiChatRequest(BaseModel):
     
     This follows OpenAI's chat completions format so Vapi can talk to us
     like we're OpenAI's GPT, but we secretly use Pepper's Groq LLM instead!
+    
+    ⚡ VALIDATE ONLY WHAT WE USE:
+    Vapi resends the WHOLE call history on every turn, but only the last message is read.
+    So messages stay plain dicts here (no model built per history entry - that work grew
+    with every turn of the call) and handle_voice_chat validates just the last one.
+    Fields we never read (e.g. "tools") aren't declared at all - extra="ignore" drops them.
     """
+    model_config = ConfigDict(extra="ignore")
+
     model: str                          # LLM model name (we ignore this, use our Groq)
-    messages: List[VapiChatMessage]     # Conversation history from voice call
+    messages: List[Dict[str, Any]]      # Conversation history from voice call (validated: last one only)
     temperature: Optional[float] = 0.7   # How creative responses should be (0=robotic, 1=creative)
     stream: Optional[bool] = False       # Whether to stream response chunks (for real-time)
     max_tokens: Optional[int] = 150      # Maximum response length (keep voice responses concise!)
-    tools: Optional[List[Dict]] = None   # Pepperilable functions (for advanced features later)
+    call: Optional[Dict[str, Any]] = None  # Vapi's call object - its "id" is the same for every turn of one call
 
 class VapiChatChoice(BaseModel):
     """Single response choice in OpenAI format"""
@@ -72,6 +103,8 @@ class VapiChatChoice(BaseModel):
     finish_reason: str                 # Why the response ended ("stop", "length", etc.)
 
 class VapiChatResponse(BaseModel):
+    # NOTE: This model documents the response shape. handle_voice_chat builds the same
+    # shape as a plain dict with _completion_response() - no models to build and dump per reply
     """
     VAPI CHAT RESPONSE - What we send back to Vapi
     
@@ -87,7 +120,169 @@ class VapiChatResponse(BaseModel):
     choices: List[VapiChatChoice]     # Response options (usually just one)
     usage: Optional[Dict] = None      # Token usage info (optional)
 
-def stream_response_chunks(response_text: str):
+# VOICE REPLY CACHE - Skip the LLM when a caller says something Pepper just answered
+# Phone calls open with the same few lines over and over ("hello", "are you there?").
+# Only a call's OPENING turn is cached: later turns continue that call's own conversation
+# (see _voice_thread_id), so "yes" or "tell me more" there depends on what came before.
+# Opening words at the same point in Pepper's day get the same kind of answer - no need
+# to wait seconds for Groq.
+#
+# KEY = (the caller's words, lowercased with whitespace collapsed, Pepper's current activity)
+# Including the activity means a cached "what are you up to?" expires when her schedule moves on.
+# Exact matches only: a near-miss ("can you repeat that" vs "can you repeat the price")
+# can need a completely different answer, so no fuzzy/embedding matching here.
+#
+# OrderedDict = least recently used entry sits at the front, so it's the one evicted
+# (in-process memory: every uvicorn worker fills its own copy)
+# time.monotonic() = stamp for the TTL check (never jumps when the system clock changes)
+_voice_reply_cache: "OrderedDict[Tuple[str, Optional[str]], Tuple[float, str]]" = OrderedDict()
+
+
+def _voice_thread_id(request: "VapiChatRequest") -> str:
+    """
+    🧵 ONE THREAD PER PHONE CALL - The checkpointer thread_id for this call
+
+    Every turn of the same call gets the same id, so the graph continues the call's saved
+    state instead of starting from nothing each turn. Vapi's call id is used when it's sent;
+    otherwise the turn gets a random id of its own - no continuity, but never another
+    caller's thread (hashing message content would merge every call that opens with "Hello").
+    """
+    call_id = (request.call or {}).get("id")
+    if not call_id:
+        call_id = uuid.uuid4().hex
+    return f"voice_{call_id}"
+
+
+def _voice_reply_cache_key(voice_message: str) -> Tuple[str, Optional[str]]:
+    """🔑 CACHE KEY - Normalized words + what Pepper is doing right now"""
+    return " ".join(voice_message.lower().split()), ScheduleContextGenerator.get_current_activity()
+
+
+def _get_cached_voice_reply(key: Optional[Tuple[str, Optional[str]]]) -> Optional[str]:
+    """⚡ CACHE LOOKUP - Returns a still-fresh reply for these words, or None"""
+    if key is None:
+        return None  # Not an opening turn - never answered from the cache
+    entry = _voice_reply_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, reply = entry
+    if time.monotonic() - stored_at > settings.VAPI_REPLY_CACHE_TTL_SECONDS:
+        # Too old - forget it and let the LLM answer again
+        del _voice_reply_cache[key]
+        return None
+    _voice_reply_cache.move_to_end(key)  # Recently used = evicted last
+    return reply
+
+
+def _cache_voice_reply(key: Optional[Tuple[str, Optional[str]]], reply: str) -> None:
+    """💾 CACHE STORE - Remember this reply, evicting the least recently used beyond the limit"""
+    if key is None or settings.VAPI_REPLY_CACHE_SIZE <= 0:
+        return
+    _voice_reply_cache[key] = (time.monotonic(), reply)
+    _voice_reply_cache.move_to_end(key)
+    while len(_voice_reply_cache) > settings.VAPI_REPLY_CACHE_SIZE:
+        _voice_reply_cache.popitem(last=False)
+
+
+# NOTHING TO ANSWER - Vapi's speech-to-text sometimes sends an empty turn or a lone filler
+# sound as the caller's message. Running the whole graph on "uh" costs a full LLM call for a
+# reply that can only be "pardon?", so these get that reply directly.
+# FILLER_UTTERANCES = compared after lowercasing and trimming spaces and punctuation
+FILLER_UTTERANCES = frozenset({"", "uh", "um", "umm", "uhm", "hmm", "hm", "mm", "er", "ah", "eh"})
+DIDNT_CATCH_REPLY = "Sorry, I didn't catch that. Could you say it again?"
+
+
+def _is_filler(voice_message: str) -> bool:
+    """🔇 Is this turn silence or a lone filler sound (nothing for Pepper to answer)?"""
+    words = voice_message.strip(" \t\n.,!?…-").lower()
+    return len(words) < 2 or words in FILLER_UTTERANCES
+
+
+# REPLY CONCURRENCY LIMIT - At most VAPI_MAX_CONCURRENT_REPLIES graph runs at once
+# Without a limit, a burst of calls puts every turn on Groq at the same time and ALL callers
+# wait longer. With it, extra turns queue for a free slot, and once the queue is as long as
+# the number of slots, new turns get a short "busy" reply instead of waiting even longer.
+# _replies_in_flight = turns running + turns waiting for a slot
+# PER WORKER PROCESS: each uvicorn worker has its own semaphore (and its own reply cache), so
+# the machine-wide limit is WEB_CONCURRENCY x VAPI_MAX_CONCURRENT_REPLIES
+_reply_slots = asyncio.Semaphore(settings.VAPI_MAX_CONCURRENT_REPLIES)
+_replies_in_flight = 0
+BUSY_REPLY = "Sorry, I'm juggling a lot of calls right now. Could you say that again in a moment?"
+
+
+def _replies_saturated() -> bool:
+    """🚦 Is the queue already as long as the number of slots? (then don't queue another turn)"""
+    return _replies_in_flight >= 2 * settings.VAPI_MAX_CONCURRENT_REPLIES
+
+
+@asynccontextmanager
+async def _reply_slot():
+    """🎟️ REPLY SLOT - Waits for one of the limited graph-run slots and holds it for the block"""
+    global _replies_in_flight
+    _replies_in_flight += 1
+    try:
+        async with _reply_slots:
+            yield
+    finally:
+        _replies_in_flight -= 1
+
+
+# COMPLETE (NON-STREAMING) RESPONSE - same shape as VapiChatResponse, built as a plain dict
+# _COMPLETION_SHELL = the fields that are identical in every reply, built once at import
+_COMPLETION_SHELL = {"object": "chat.completion", "usage": None}
+
+
+def _completion_response(response_id: str, created: int, content: str, model: str = "groq-llama-3.3-70b-versatile") -> Dict[str, Any]:
+    """📨 ONE COMPLETE REPLY - OpenAI "chat.completion" dict, ready for ORJSONResponse"""
+    return {
+        **_COMPLETION_SHELL,
+        "id": response_id,
+        "created": created,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+    }
+
+
+# _ERROR_RESPONSE = the polite "something went wrong" reply, built once at import
+# The error path runs exactly when the server is already struggling - it only fills in id + created
+_ERROR_RESPONSE = _completion_response(
+    "error",
+    0,
+    "I'm having trouble processing your request right now. Could you try again, or send me a WhatsApp message instead?",
+    model="error-fallback",
+)
+
+
+# SERVER-SENT EVENTS SETUP - shared by both streaming paths below
+# SSE_HEADERS = don't cache the stream, keep the connection open while chunks flow
+SSE_HEADERS = {"Cache-Control": "no-cache", "Connection": "keep-alive"}
+# SPOKEN_REPLY_NODES = graph nodes whose streamed tokens ARE Pepper's reply
+# (the router's and memory extractor's LLM calls stream too, but must never be spoken)
+SPOKEN_REPLY_NODES = frozenset({"conversation_node", "audio_node"})
+
+
+def _sse_chunk(chunk_id: str, created: int, delta: Dict[str, str], finish_reason: Optional[str] = None) -> str:
+    """📦 ONE SSE CHUNK - An OpenAI "chat.completion.chunk" in Server-Sent Events format"""
+    chunk_data = {
+        "id": chunk_id, 
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": "groq-llama-3.3-70b-versatile",
+        "choices": [{
+            "index": 0,
+            "delta": delta,
+            "finish_reason": finish_reason
+        }]
+    }
+    # orjson returns bytes - decode back to str for the f-string
+    return f"data: {orjson.dumps(chunk_data).decode()}\n\n"
+
+
+def stream_response_chunks(response_text: str, created: int):
     """
     STREAMING RESPONSE GENERATOR - Converts complete response to OpenAI streaming format
     
@@ -95,56 +290,163 @@ def stream_response_chunks(response_text: str):
     
     🔗 REAL-WORLD ANALOGY: Instead of saying the whole sentence at once,
     we break it into words and send them one by one, like a teleprompter
-    """
-    import time
     
+    USED FOR: replies that already exist in full (cache hits, development fallback) -
+    fresh replies stream straight from the LLM in stream_graph_reply() below
+    """
     # Split response into words for streaming
     words = response_text.split()
+
+    # One id/timestamp for the whole response (OpenAI streams share the id across chunks too)
+    # created = the request's timestamp, read once in handle_voice_chat
+    chunk_id = f"chatcmpl-{created}"
     
     # Stream each word as a chunk
     for i, word in enumerate(words):
-        chunk_data = {
-            "id": f"chatcmpl-{int(time.time())}", 
-            "object": "chat.completion.chunk",
-            "created": int(time.time()),
-            "model": "groq-llama-3.3-70b-versatile",
-            "choices": [{
-                "index": 0,
-                "delta": {
-                    "content": word + (" " if i < len(words) - 1 else "")
-                },
-                "finish_reason": None
-            }]
-        }
-        
-        # Send chunk in SSE format
-        yield f"data: {json.dumps(chunk_data)}\n\n"
-        
-        # Small delay to simulate realistic streaming
-        # time.sleep(0.05)  # Uncomment for slower streaming
+        yield _sse_chunk(chunk_id, created, {"content": word + (" " if i < len(words) - 1 else "")})
     
     # Send final chunk with finish_reason
-    final_chunk = {
-        "id": f"chatcmpl-{int(time.time())}", 
-        "object": "chat.completion.chunk",
-        "created": int(time.time()),
-        "model": "groq-llama-3.3-70b-versatile",
-        "choices": [{
-            "index": 0,
-            "delta": {},
-            "finish_reason": "stop"
-        }]
-    }
-    yield f"data: {json.dumps(final_chunk)}\n\n"
+    yield _sse_chunk(chunk_id, created, {}, "stop")
     
     # Send termination signal
     yield "data: [DONE]\n\n"
 
+
+def _no_graph_reply(voice_message: str) -> str:
+    """🧪 DEVELOPMENT FALLBACK - What Pepper says when LangGraph failed to import"""
+    return f"I heard you say: '{voice_message}'. This is Pepper responding from a voice call! The LangGraph integration will make this much smarter."
+
+
+def _voice_graph_input(voice_message: str, conversation_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """🧾 GRAPH INPUT + CONFIG - What one voice turn hands to LangGraph (streamed or not)"""
+    graph_input = {
+        "messages": [HumanMessage(content=voice_message)],
+        "interface": "voice",                # Track that this is from voice call
+        "conversation_id": conversation_id,  # Same for every turn of this call
+        # TODO: Add user_id when we have phone number mapping
+        # TODO: Add recent WhatsApp context when pepperilable
+    }
+    # thread_id = the checkpointer keeps this call's messages between turns, so
+    # only the NEW message is sent in - the history is already in the saved state
+    config = {"configurable": {"thread_id": conversation_id}}
+    return graph_input, config
+
+
+async def _process_voice_turn(
+    voice_message: str,
+    conversation_id: str,
+    cache_key: Optional[Tuple[str, Optional[str]]] = None,
+) -> str:
+    """
+    🧠 ONE VOICE TURN, NO HTTP - Runs Pepper's graph on what the caller said and returns her reply
+
+    The plain core of /chat/completions (complete, non-streamed replies): no request model,
+    no OpenAI response shell. The test endpoint calls it directly, and post-call processing
+    (handle_call_ended) can reuse it without looping back through HTTP.
+    """
+    graph_input, config = _voice_graph_input(voice_message, conversation_id)
+
+    # INVOKE pepper'S BRAIN (same as WhatsApp processing!)
+    # This is like asking the company expert to handle a phone call
+    logger.debug("🚀 CALLING LANGGRAPH WITH: %s", graph_input)
+    async with _reply_slot():  # Wait for a free slot (see _reply_slot above)
+        voice_graph = await get_graph()
+        response = await voice_graph.ainvoke(graph_input, config)
+    logger.debug("📥 LANGGRAPH RESPONSE: %s", response)
+
+    # EXTRACT pepper'S RESPONSE
+    # Get the response message that Pepper generated
+    if response and response.get("messages"):
+        pepper_response = response["messages"][-1].content
+        logger.debug("✅ EXTRACTED pepper RESPONSE: %s", pepper_response)
+        # Remember it for the next caller who says exactly this (fallbacks are never cached)
+        _cache_voice_reply(cache_key, pepper_response)
+        return pepper_response
+
+    pepper_response = "I'm sorry, I couldn't process that right now. Could you try again?"
+    logger.warning("⚠️ NO MESSAGES IN RESPONSE, USING FALLBACK: %s", pepper_response)
+    return pepper_response
+
+
+async def stream_graph_reply(graph_input: Dict[str, Any], config: Dict[str, Any], cache_key: Optional[Tuple[str, Optional[str]]], created: int):
+    """
+    🌊 LIVE STREAMING GENERATOR - Relays Pepper's reply to Vapi token by token AS THE LLM WRITES IT
+    
+    🎯 PURPOSE: Vapi starts speaking on the first chunk it receives. Waiting for
+    graph.ainvoke() to finish means the caller hears silence for the WHOLE generation;
+    streaming the graph means they hear Pepper as soon as her first words exist.
+    
+    🔗 REAL-WORLD ANALOGY: Like a live interpreter who starts translating as soon as
+    the speaker begins, instead of waiting for them to finish the whole speech
+    
+    📞 TECHNICAL DETAILS:
+    - graph.astream(stream_mode=["messages", "values"]) = tokens + the final state in one pass
+    - AsteriskStreamFilter drops *actions* mid-stream (Vapi would read them aloud)
+    - If no tokens were streamed (e.g. image_node answered), the final reply is sent in one chunk
+    - The finished reply goes into the voice reply cache, same as the non-streaming path
+    """
+    # One id/timestamp for the whole response (OpenAI streams share the id across chunks too)
+    # created = the request's timestamp, read once in handle_voice_chat
+    chunk_id = f"chatcmpl-{created}"
+
+    voice_filter = AsteriskStreamFilter()
+    streamed = False
+    final_values = {}
+
+    try:
+        # Hold a reply slot for as long as the LLM is generating (see _reply_slot above)
+        async with _reply_slot():
+            voice_graph = await get_graph()
+            async for mode, chunk in voice_graph.astream(graph_input, config, stream_mode=["messages", "values"]):
+                # KEEP THE NEWEST STATE SNAPSHOT - after the loop this holds Pepper's final reply
+                if mode == "values":
+                    final_values = chunk
+                    continue
+
+                message_chunk, metadata = chunk
+                if metadata["langgraph_node"] in SPOKEN_REPLY_NODES and type(message_chunk) is AIMessageChunk:
+                    text = voice_filter.feed(message_chunk.content)
+                    if text:
+                        streamed = True
+                        yield _sse_chunk(chunk_id, created, {"content": text})
+
+        # RELEASE ANY TEXT HELD BACK BY AN UNCLOSED *
+        tail = voice_filter.flush()
+        if tail:
+            yield _sse_chunk(chunk_id, created, {"content": tail})
+
+        if final_values.get("messages"):
+            pepper_response = final_values["messages"][-1].content
+            if not streamed:
+                yield _sse_chunk(chunk_id, created, {"content": pepper_response})
+            # Remember it for the next caller who says exactly this (fallbacks are never cached)
+            _cache_voice_reply(cache_key, pepper_response)
+        elif not streamed:
+            yield _sse_chunk(chunk_id, created, {"content": "I'm sorry, I couldn't process that right now. Could you try again?"})
+
+    except Exception as e:
+        # The 200 status is already sent - all we can do is apologise inside the stream
+        logger.exception("🚨 VOICE STREAM ERROR: %s", e)
+        if not streamed:
+            yield _sse_chunk(
+                chunk_id, created,
+                {"content": "I'm having trouble processing your request right now. Could you try again, or send me a WhatsApp message instead?"},
+            )
+
+    # Send final chunk with finish_reason, then the termination signal
+    yield _sse_chunk(chunk_id, created, {}, "stop")
+    yield "data: [DONE]\n\n"
+
 # CREATE ROUTER FOR VAPI ENDPOINTS
 # This is like creating a "phone department" within Pepper's office
-vapi_router = APIRouter(prefix="/vapi", tags=["vapi"])
+# default_response_class=ORJSONResponse = every dict these endpoints return is encoded by orjson
+# instead of FastAPI's default stdlib-json JSONResponse (handlers still just return dicts)
+# The per-call hot paths (/chat/completions, /webhook) go one step further: response_model=None
+# plus returning ORJSONResponse themselves - a returned Response is sent as-is, skipping
+# FastAPI's jsonable_encoder walk over the whole reply before orjson even sees it
+vapi_router = APIRouter(prefix="/vapi", tags=["vapi"], default_response_class=ORJSONResponse)
 
-@vapi_router.get("/health")
+@vapi_router.get("/health", response_model=None)
 async def vapi_health_check():
     """
     VAPI HEALTH CHECK - Test if voice calling system is operational
@@ -163,7 +465,9 @@ async def vapi_health_check():
     """
     try:
         # CHECK VAPI CLIENT STATUS
-        from ai_companion.interfaces.vapi.vapi_client import vapi_client
+        from ai_companion.interfaces.vapi.vapi_client import get_vapi_client
+
+        vapi_client = await get_vapi_client()  # Created on first use, then shared
         
         health_status = {
             "status": "checking",
@@ -222,15 +526,20 @@ async def vapi_health_check():
             health_status["message"] = "Voice calling system has issues. Check component details."
         
         # LOG HEALTH CHECK RESULT
-        logging.info(f"🏥 VAPI HEALTH CHECK: {health_status['status'].upper()}")
-        for component, details in health_status["components"].items():
-            if isinstance(details, dict) and "status" in details:
-                logging.info(f"   {component}: {details['status']}")
+        logger.info(
+            "🏥 VAPI HEALTH CHECK: %s (%s)",
+            health_status['status'].upper(),
+            ", ".join(
+                f"{component}={details['status']}"
+                for component, details in health_status["components"].items()
+                if isinstance(details, dict) and "status" in details
+            ),
+        )
         
         return health_status
         
     except Exception as e:
-        logging.error(f"🚨 VAPI HEALTH CHECK ERROR: {str(e)}")
+        logger.exception("🚨 VAPI HEALTH CHECK ERROR: %s", e)
         return {
             "status": "error",
             "timestamp": datetime.now().isoformat(),
@@ -238,7 +547,7 @@ async def vapi_health_check():
             "message": "Health check encountered an error"
         }
 
-@vapi_router.post("/test-call")
+@vapi_router.post("/test-call", response_model=None)
 async def test_voice_call(phone_number: str = None):
     """
     TEST VOICE CALL - Make a test call to verify system works
@@ -268,7 +577,9 @@ async def test_voice_call(phone_number: str = None):
             }
         
         # CHECK VAPI CLIENT
-        from ai_companion.interfaces.vapi.vapi_client import vapi_client
+        from ai_companion.interfaces.vapi.vapi_client import get_vapi_client
+
+        vapi_client = await get_vapi_client()
         
         if vapi_client is None:
             return {
@@ -287,9 +598,7 @@ async def test_voice_call(phone_number: str = None):
         }
         
         # LOG TEST CALL ATTEMPT
-        logging.info(f"🧪 TEST CALL INITIATED:")
-        logging.info(f"   📱 To: {phone_number}")
-        logging.info(f"   🎯 Purpose: System testing")
+        logger.info("🧪 TEST CALL INITIATED: to=%s purpose=System testing", phone_number)
         
         # MAKE TEST CALL
         call_result = await vapi_client.make_outbound_call(
@@ -304,13 +613,13 @@ async def test_voice_call(phone_number: str = None):
         }
         
     except Exception as e:
-        logging.error(f"🚨 TEST CALL ERROR: {str(e)}")
+        logger.exception("🚨 TEST CALL ERROR: %s", e)
         return {
             "status": "error",
             "message": f"Test call failed: {str(e)}"
         }
 
-@vapi_router.post("/chat/completions")
+@vapi_router.post("/chat/completions", response_model=None)
 async def handle_voice_chat(request: VapiChatRequest):
     """
     VAPI CHAT COMPLETIONS ENDPOINT - The "brain connection" for voice calls
@@ -331,40 +640,40 @@ async def handle_voice_chat(request: VapiChatRequest):
     - Process through existing workflow (same as WhatsApp messages)
     - Convert response back to Vapi's format (translate back)
     """
+    # READ THE CLOCK ONCE PER REQUEST
+    # The response id and "created" (streamed or complete, success or error) reuse this one reading
+    created = int(time.time())
+
     try:
-        # 📊 LOG INCOMING VAPI REQUEST DETAILS
-        logging.info(f"🎙️ VAPI CHAT REQUEST RECEIVED:")
-        logging.info(f"   📋 Model: {request.model}")
-        logging.info(f"   🌡️ Temperature: {request.temperature}")
-        logging.info(f"   📏 Max tokens: {request.max_tokens}")
-        logging.info(f"   📨 Message count: {len(request.messages)}")
-        logging.info(f"   📡 Stream mode: {request.stream}")
-        
-        # CRITICAL: Check if Vapi wants streaming response
-        if request.stream:
-            print(f"🚨 VAPI WANTS STREAMING BUT WE'RE SENDING COMPLETE RESPONSE!")
-            print(f"   This is likely why Vapi isn't speaking our responses!")
+        # 📊 LOG INCOMING VAPI REQUEST DETAILS (one record instead of one per field)
+        logger.info(
+            "🎙️ VAPI CHAT REQUEST RECEIVED: model=%s temperature=%s max_tokens=%s messages=%d stream=%s",
+            request.model, request.temperature, request.max_tokens, len(request.messages), request.stream,
+        )
         
         # STEP 1: EXTRACT VOICE MESSAGE (like transcribing a phone call)
         # Get the latest message from the voice conversation
         # This is like asking: "What did the caller just say?"
-        print(f"📨 FULL VAPI REQUEST: {request.model_dump()}")
+        # The full request dump is only built when DEBUG logging is actually on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📨 FULL VAPI REQUEST: %s", request.model_dump())
         if not request.messages:
-            logging.error("❌ VAPI REQUEST ERROR: No messages provided")
+            logger.error("❌ VAPI REQUEST ERROR: No messages provided")
             raise HTTPException(status_code=400, detail="No messages provided")
         
-        latest_message = request.messages[-1]
+        # Validate just the message we use (see VapiChatRequest)
+        latest_message = VapiChatMessage.model_validate(request.messages[-1])
         if latest_message.role != "user":
-            logging.error(f"❌ VAPI REQUEST ERROR: Last message role is '{latest_message.role}', expected 'user'")
+            logger.error("❌ VAPI REQUEST ERROR: Last message role is '%s', expected 'user'", latest_message.role)
             raise HTTPException(status_code=400, detail="Last message must be from user")
         
         voice_message_content = latest_message.content
         
-        # LOG THE VOICE MESSAGE DETAILS
-        logging.info(f"🎤 VOICE MESSAGE PROCESSED:")
-        logging.info(f"   📝 Content: {voice_message_content[:100]}{'...' if len(voice_message_content) > 100 else ''}")
-        logging.info(f"   📏 Length: {len(voice_message_content)} characters")
-        logging.info(f"   👤 Role: {latest_message.role}")
+        # LOG THE VOICE MESSAGE DETAILS (%.100s = first 100 characters, cut only if emitted)
+        logger.info(
+            "🎤 VOICE MESSAGE PROCESSED: %d chars from %s: %.100s",
+            len(voice_message_content), latest_message.role, voice_message_content,
+        )
         
         # STEP 2: PREPARE CONTEXT FOR pepper'S BRAIN
         # Create the same input format that WhatsApp messages use
@@ -372,116 +681,91 @@ async def handle_voice_chat(request: VapiChatRequest):
         
         # TODO: Later we'll add WhatsApp context passing here
         # TODO: Add user identification from phone number
-        # For now, we process the voice message as a standalone interaction
+        # Each phone call is its own conversation thread (see _voice_thread_id)
+        conversation_id = _voice_thread_id(request)
         
         # STEP 3: PROCESS THROUGH EXISTING LANGGRAPH WORKFLOW
         # Use Pepper's existing "brain" - same LangGraph that handles WhatsApp
         # The beauty: Pepper doesn't know this came from voice vs WhatsApp!
         
-        if graph is None:
+        if _is_filler(voice_message_content):
+            # NOTHING TO ANSWER - skip the graph entirely (see FILLER_UTTERANCES above)
+            pepper_response = DIDNT_CATCH_REPLY
+            logger.info("🔇 VOICE MESSAGE IS FILLER, NOT CALLING LANGGRAPH: %r", voice_message_content)
+        elif graph is None:
             # FALLBACK FOR DEVELOPMENT - Simple response if LangGraph not pepperilable
-            pepper_response = f"I heard you say: '{voice_message_content}'. This is Pepper responding from a voice call! The LangGraph integration will make this much smarter."
-            logging.warning("⚠️ VAPI FALLBACK: Using simple response - LangGraph not pepperilable")
-            logging.warning("   📋 This means Pepper's full brain is not connected to voice calls yet")
+            pepper_response = _no_graph_reply(voice_message_content)
+            logger.warning("⚠️ VAPI FALLBACK: Using simple response - LangGraph not pepperilable (Pepper's full brain is not connected to voice calls yet)")
         else:
-            # REAL PROCESSING - Use Pepper's actual brain
-            logging.info(f"🧠 PROCESSING THROUGH LANGGRAPH:")
-            logging.info(f"   🔗 Using Pepper's production brain for voice call")
-            logging.info(f"   📝 Input message: {voice_message_content[:50]}...")
-            
-            graph_input = {
-                "messages": [HumanMessage(content=voice_message_content)],
-                "interface": "voice",                # Track that this is from voice call
-                "conversation_id": f"voice_{datetime.now().isoformat()}",
-                # TODO: Add user_id when we have phone number mapping
-                # TODO: Add recent WhatsApp context when pepperilable
-            }
-            
-            # INVOKE pepper'S BRAIN (same as WhatsApp processing!)
-            # This is like asking the company expert to handle a phone call
-            print(f"🚀 CALLING LANGGRAPH WITH: {graph_input}")
-            response = await graph.ainvoke(graph_input)
-            print(f"📥 LANGGRAPH RESPONSE: {response}")
-            
-            # EXTRACT pepper'S RESPONSE
-            # Get the response message that Pepper generated
-            if response and response.get("messages"):
-                pepper_response = response["messages"][-1].content
-                print(f"✅ EXTRACTED pepper RESPONSE: {pepper_response}")
+            # CHECK THE VOICE REPLY CACHE FIRST (see _voice_reply_cache above)
+            # A hit answers in microseconds instead of a full LangGraph + Groq round-trip
+            # cache_key = None on later turns of a call - those are never cached
+            opening_turn = sum(1 for m in request.messages if m.get("role") == "user") == 1
+            cache_key = _voice_reply_cache_key(voice_message_content) if opening_turn else None
+            pepper_response = _get_cached_voice_reply(cache_key)
+            if pepper_response is not None:
+                logger.info("⚡ VOICE REPLY CACHE HIT: %.50s", cache_key[0])
+            elif _replies_saturated():
+                # TOO MANY TURNS ALREADY WAITING - answer right away instead of joining the queue
+                # (not cached: it's about load, not about what the caller said)
+                pepper_response = BUSY_REPLY
+                logger.warning("🚦 VOICE REPLY BUSY: %d turns running or waiting", _replies_in_flight)
             else:
-                pepper_response = "I'm sorry, I couldn't process that right now. Could you try again?"
-                print(f"⚠️ NO MESSAGES IN RESPONSE, USING FALLBACK: {pepper_response}")
-        
-        # STEP 4: FORMAT FOR VAPI (OpenAI-compatible format)
-        # Convert Pepper's response into the format Vapi expects
-        # This is like translating Pepper's written response into speech instructions
-        
-        # Create response in OpenAI chat completions format
-        response_message = VapiChatMessage(
-            role="assistant",
-            content=pepper_response
-        )
-        
-        response_choice = VapiChatChoice(
-            index=0,
-            message=response_message,
-            finish_reason="stop"
-        )
-        
-        vapi_response = VapiChatResponse(
-            id=f"vapi-{int(datetime.now().timestamp())}",
-            object="chat.completion",
-            created=int(datetime.now().timestamp()),
-            model="groq-llama-3.3-70b-versatile",  # Our actual model
-            choices=[response_choice]
-        )
+                # REAL PROCESSING - Use Pepper's actual brain
+                logger.info("🧠 PROCESSING THROUGH LANGGRAPH: %.50s...", voice_message_content)
+            
+                # STREAMING REQUEST? Relay the LLM's tokens as they're generated
+                # (Vapi starts speaking on the first chunk instead of after the whole reply)
+                if request.stream:
+                    logger.debug("🔄 STREAMING LANGGRAPH REPLY TO VAPI...")
+                    graph_input, config = _voice_graph_input(voice_message_content, conversation_id)
+                    return StreamingResponse(
+                        stream_graph_reply(graph_input, config, cache_key, created),
+                        media_type="text/event-stream",
+                        headers=SSE_HEADERS,
+                    )
+                
+                # COMPLETE REPLY - the shared core does the graph run (see _process_voice_turn)
+                pepper_response = await _process_voice_turn(voice_message_content, conversation_id, cache_key)
         
         # LOG SUCCESS FOR DEBUGGING
-        print(f"✅ VOICE RESPONSE SENT: {pepper_response[:100]}...")
+        logger.info("✅ VOICE RESPONSE SENT: %.100s...", pepper_response)
         
         # CHECK IF VAPI WANTS STREAMING RESPONSE
+        # Checked BEFORE building the complete-response models below - a streamed reply never uses them
+        # (Only cache hits and the development fallback get here - fresh replies streamed above)
         if request.stream:
-            print(f"🔄 STREAMING RESPONSE TO VAPI...")
+            logger.debug("🔄 STREAMING RESPONSE TO VAPI...")
             # Return streaming response in OpenAI SSE format
             return StreamingResponse(
-                stream_response_chunks(pepper_response), 
+                stream_response_chunks(pepper_response, created), 
                 media_type="text/event-stream",
-                headers={
-                    "Cache-Control": "no-cache",
-                    "Connection": "keep-alive"
-                }
+                headers=SSE_HEADERS,
             )
-        else:
-            # Return complete response (non-streaming)
-            response_dict = vapi_response.model_dump()
-            print(f"🔍 COMPLETE VAPI RESPONSE: {response_dict}")
-            return response_dict
+        
+        # STEP 4: FORMAT FOR VAPI (OpenAI-compatible format)
+        # Convert Pepper's response into the format Vapi expects
+        # This is like translating Pepper's written response into speech instructions
+        
+        # Create response in OpenAI chat completions format
+        # Built directly as a dict (no VapiChatMessage → VapiChatChoice → VapiChatResponse →
+        # model_dump() round-trip); the router's ORJSONResponse then encodes it with orjson
+        response_dict = _completion_response(f"vapi-{created}", created, pepper_response)
+        
+        # Return complete response (non-streaming)
+        logger.debug("🔍 COMPLETE VAPI RESPONSE: %s", response_dict)
+        return ORJSONResponse(response_dict)
         
     except Exception as e:
         # ERROR HANDLING - If anything goes wrong, provide graceful fallback
         # This is like a phone operator saying "Let me transfer you" when something goes wrong
-        logging.error(f"🚨 VOICE CALL PROCESSING ERROR: {str(e)}")
-        
-        # Return polite error response that gets spoken to caller
-        error_response = VapiChatResponse(
-            id=f"error-{int(datetime.now().timestamp())}",
-            object="chat.completion", 
-            created=int(datetime.now().timestamp()),
-            model="error-fallback",
-            choices=[VapiChatChoice(
-                index=0,
-                message=VapiChatMessage(
-                    role="assistant", 
-                    content="I'm having trouble processing your request right now. Could you try again, or send me a WhatsApp message instead?"
-                ),
-                finish_reason="stop"
-            )]
-        )
+        logger.exception("🚨 VOICE CALL PROCESSING ERROR: %s", e)
         
-        return error_response.model_dump()
+        # Return polite error response that gets spoken to caller (prebuilt - see _ERROR_RESPONSE)
+        return ORJSONResponse({**_ERROR_RESPONSE, "id": f"error-{created}", "created": created})
 
-@vapi_router.post("/webhook")
-async def handle_vapi_webhook(request: Request):
+@vapi_router.post("/webhook", response_model=None)
+async def handle_vapi_webhook(request: Request, background_tasks: BackgroundTasks):
     """
     VAPI WEBHOOK HANDLER - Receives call events and transcripts
     
@@ -499,66 +783,69 @@ async def handle_vapi_webhook(request: Request):
     - speech-started/ended: When user starts/stops talking
     - transcript: Real-time transcript updates (optional)
     """
+    # raw_body = the request bytes, read ONCE and kept for the error log below
+    raw_body = b""
     try:
         # EXTRACT WEBHOOK DATA
         # Get the event information that Vapi is sending us
-        webhook_data = await request.json()
-        event_type = webhook_data.get("message", {}).get("type", "unknown")
+        # orjson.loads() = parse the bytes with orjson (request.json() uses the stdlib json module)
+        raw_body = await request.body()
+        webhook_data = orjson.loads(raw_body)
+        # LOOK UP THE NESTED PARTS ONCE
+        # Every event keeps its details under "message" (and the call under "message.call") -
+        # grab them here instead of repeating the .get("message", {}).get("call", {}) chain per field
+        # "or {}" = also covers Vapi sending an explicit null
+        message = webhook_data.get("message") or {}
+        call_info = message.get("call") or {}
+        event_type = message.get("type", "unknown")
+        call_id = call_info.get("id", "unknown")
         
-        # 📊 LOG COMPREHENSIVE WEBHOOK DETAILS
-        logging.info(f"🔗 VAPI WEBHOOK RECEIVED:")
-        logging.info(f"   🏷️ Event type: {event_type}")
-        logging.info(f"   📞 Call ID: {webhook_data.get('message', {}).get('call', {}).get('id', 'unknown')}")
-        logging.info(f"   📏 Data size: {len(str(webhook_data))} characters")
-        logging.info(f"   ⏰ Timestamp: {datetime.now().isoformat()}")
-        logging.debug(f"   📋 Full webhook data: {webhook_data}")
+        # 📊 LOG WEBHOOK DETAILS (one record; the log line carries its own timestamp)
+        logger.info("🔗 VAPI WEBHOOK RECEIVED: event=%s call_id=%s", event_type, call_id)
+        # The whole payload is only stringified when DEBUG logging is actually on
+        logger.debug("   📋 Full webhook data: %s", webhook_data)
         
         # HANDLE DIFFERENT EVENT TYPES
         if event_type == "call-ended":
             # MOST IMPORTANT EVENT - Process completed call
-            logging.info(f"🏁 PROCESSING CALL-ENDED EVENT")
-            await handle_call_ended(webhook_data)
+            # background_tasks.add_task() = run it AFTER the 200 reply has gone out -
+            # Vapi only needs to know we received the event, not wait for the post-call work
+            logger.info("🏁 PROCESSING CALL-ENDED EVENT (in background)")
+            background_tasks.add_task(handle_call_ended, message)
             
         elif event_type == "call-started":
             # Call began - log for tracking
-            call_id = webhook_data.get("message", {}).get("call", {}).get("id", "unknown")
-            customer_number = webhook_data.get("message", {}).get("call", {}).get("customer", {}).get("number", "unknown")
-            logging.info(f"📞 CALL STARTED:")
-            logging.info(f"   🆔 Call ID: {call_id}")
-            logging.info(f"   📱 Customer: {customer_number}")
+            customer_number = (call_info.get("customer") or {}).get("number", "unknown")
+            logger.info("📞 CALL STARTED: call_id=%s customer=%s", call_id, customer_number)
             
         elif event_type in ["speech-started", "speech-ended"]:
             # User started/stopped talking - log for debugging
-            logging.debug(f"🗣️ SPEECH EVENT: {event_type}")
+            logger.debug("🗣️ SPEECH EVENT: %s", event_type)
             
         elif event_type == "transcript":
             # Real-time transcript update - could use for live processing later
-            transcript = webhook_data.get("message", {}).get("transcript", "")
-            transcript_role = webhook_data.get("message", {}).get("role", "unknown")
-            logging.debug(f"📝 TRANSCRIPT UPDATE:")
-            logging.debug(f"   🎤 Role: {transcript_role}")
-            logging.debug(f"   📝 Content: {transcript[:100]}{'...' if len(transcript) > 100 else ''}")
+            transcript = message.get("transcript", "")
+            transcript_role = message.get("role", "unknown")
+            logger.debug("📝 TRANSCRIPT UPDATE: role=%s %.100s", transcript_role, transcript)
             
         else:
             # Unknown event type - log for investigation
-            logging.info(f"❓ UNKNOWN WEBHOOK EVENT: {event_type}")
-            logging.info(f"   📋 Pepperilable keys: {list(webhook_data.get('message', {}).keys())}")
+            logger.info("❓ UNKNOWN WEBHOOK EVENT: %s (keys: %s)", event_type, list(message.keys()))
         
         # Always return success to Vapi
-        return {"status": "received", "event_type": event_type}
+        return ORJSONResponse({"status": "received", "event_type": event_type})
         
     except Exception as e:
         # ERROR HANDLING - Log error but don't fail the webhook
-        logging.error(f"🚨 WEBHOOK PROCESSING ERROR: {str(e)}")
-        logging.error(f"   🌐 Request URL: {request.url}")
-        logging.error(f"   📋 Request method: {request.method}")
-        logging.error(f"   📄 Raw request body: {await request.body() if hasattr(request, 'body') else 'unpepperilable'}")
-        # Include full exception details for debugging
-        import traceback
-        logging.error(f"   📚 Full traceback: {traceback.format_exc()}")
-        return {"status": "error", "message": str(e)}
-
-async def handle_call_ended(webhook_data: Dict[str, Any]):
+        # logger.exception() = error message + full traceback in one record
+        logger.exception(
+            "🚨 WEBHOOK PROCESSING ERROR: %s | %s %s body=%r",
+            # First 2 KiB only - a malformed multi-megabyte payload shouldn't flood the logs
+            e, request.method, request.url, raw_body[:2048],
+        )
+        return ORJSONResponse({"status": "error", "message": str(e)})
+
+async def handle_call_ended(message: Dict[str, Any]):
     """
     HANDLE CALL ENDED EVENT - Process completed phone call
     
@@ -577,30 +864,29 @@ async def handle_call_ended(webhook_data: Dict[str, Any]):
     3. Send summary back to WhatsApp (TODO)
     4. Store conversation in memory system (TODO)
     5. Process any tasks or follow-ups mentioned (TODO)
+    
+    📦 message = the webhook's "message" object (already unwrapped by handle_vapi_webhook)
     """
     try:
         # EXTRACT CALL DETAILS
-        call_info = webhook_data.get("message", {}).get("call", {})
+        call_info = message.get("call") or {}
         call_id = call_info.get("id", "unknown")
         
         # Get customer info (who we called)
-        customer_info = call_info.get("customer", {})
-        customer_number = customer_info.get("number", "unknown")
+        customer_number = (call_info.get("customer") or {}).get("number", "unknown")
         
         # Get call duration and status
         duration = call_info.get("duration", 0)  # Duration in seconds
         end_reason = call_info.get("endedReason", "unknown")
         
         # Get transcript if pepperilable
-        transcript = webhook_data.get("message", {}).get("transcript", "")
+        transcript = message.get("transcript") or ""
         
         # LOG CALL COMPLETION
-        logging.info(f"📞 CALL COMPLETED:")
-        logging.info(f"   Call ID: {call_id}")
-        logging.info(f"   Customer: {customer_number}")
-        logging.info(f"   Duration: {duration} seconds")
-        logging.info(f"   End Reason: {end_reason}")
-        logging.info(f"   Transcript Length: {len(transcript)} characters")
+        logger.info(
+            "📞 CALL COMPLETED: call_id=%s customer=%s duration=%ss end_reason=%s transcript_chars=%d",
+            call_id, customer_number, duration, end_reason, len(transcript),
+        )
         
         # TODO: PROCESS TRANSCRIPT AND CREATE SUMMARY
         # Here we would:
@@ -608,20 +894,22 @@ async def handle_call_ended(webhook_data: Dict[str, Any]):
         # 2. Extract any tasks or action items mentioned
         # 3. Send summary back to WhatsApp
         # 4. Store in memory system for future reference
+        # Steps 2-4 are independent network calls once the summary exists - run them side by side
+        # (async with asyncio.TaskGroup() as tg: tg.create_task(...) for each) instead of one after another
         
         if transcript:
             # For now, just log a simple summary
             summary = f"Call completed with {customer_number}. Duration: {duration}s. Transcript pepperilable."
-            logging.info(f"📋 CALL SUMMARY: {summary}")
+            logger.info("📋 CALL SUMMARY: %s", summary)
             
             # TODO: Send this summary back to WhatsApp
             # TODO: Process any action items from the call
             # TODO: Store conversation in long-term memory
         
     except Exception as e:
-        logging.error(f"🚨 CALL ENDED PROCESSING ERROR: {str(e)}")
+        logger.exception("🚨 CALL ENDED PROCESSING ERROR: %s", e)
 
-@vapi_router.get("/health")
+@vapi_router.get("/health", response_model=None)
 async def health_check():
     """
     HEALTH CHECK ENDPOINT - Simple endpoint to verify the service is running
@@ -631,24 +919,19 @@ async def health_check():
     🔗 REAL-WORLD ANALOGY: Like checking if the phone system is working
     by calling a test number that just says "The system is operational"
     """
-    try:
-        # Check if we can import core components
-        from ai_companion.graph.graph import graph
-        graph_status = "pepperilable" if graph else "not_pepperilable"
-    except ImportError:
-        graph_status = "import_error"
-    
+    # Whether Pepper's brain imported is fixed for the life of the process,
+    # so the status computed at import time (see the top of this file) is simply reported
     return {
         "status": "healthy",
         "service": "vapi-voice-integration",
         "timestamp": datetime.now().isoformat(),
-        "langgraph_status": graph_status,
+        "langgraph_status": _GRAPH_STATUS,
         "version": "1.0.0"
     }
 
 # DEVELOPMENT TESTING ENDPOINT
-@vapi_router.post("/test-chat")
-async def test_chat_endpoint(test_message: str = "Hello, this is a test call"):
+@vapi_router.post("/test-chat", response_model=None)
+async def test_chat_endpoint(test_message: str = "Hello, this is a test call", thread_id: Optional[str] = None):
     """
     TEST ENDPOINT - For development testing without Vapi
     
@@ -659,19 +942,29 @@ async def test_chat_endpoint(test_message: str = "Hello, this is a test call"):
     to test if the phone system is working correctly
     
     💡 USAGE: POST to /vapi/test-chat with {"test_message": "your message"}
+    Pass the returned thread_id back as ?thread_id=... to continue the same practice call
     """
-    # Create a fake Vapi request for testing
-    fake_request = VapiChatRequest(
-        model="gpt-4o",
-        messages=[VapiChatMessage(role="user", content=test_message)],
-        temperature=0.7
-    )
-    
-    # Process through our main chat handler
-    response = await handle_voice_chat(fake_request)
+    created = int(time.time())
+    # Each test is its own practice call unless the caller names one - concurrent testers
+    # never mix histories. The voice_test_ prefix keeps them apart from real calls' threads
+    thread_id = thread_id or uuid.uuid4().hex
+    conversation_id = f"voice_test_{thread_id}"
+
+    try:
+        if graph is None:
+            pepper_response = _no_graph_reply(test_message)
+        else:
+            # Process through the same core as real calls - no fake Vapi request round-trip
+            pepper_response = await _process_voice_turn(test_message, conversation_id)
+        response = _completion_response(f"vapi-{created}", created, pepper_response)
+    except Exception as e:
+        # Same polite error reply a real call would get (see handle_voice_chat)
+        logger.exception("🚨 TEST CHAT PROCESSING ERROR: %s", e)
+        response = {**_ERROR_RESPONSE, "id": f"error-{created}", "created": created}
     
     return {
         "test_message": test_message,
         "response": response,
+        "thread_id": thread_id,
         "note": "This is a test endpoint - not used by actual Vapi calls"
     }
\ No newline at end of file
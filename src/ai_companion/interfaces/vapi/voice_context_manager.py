@@ -21,11 +21,84 @@
 # - Ensures voice-Pepper knows what WhatsApp-Pepper was discussing
 
 import re
+import hashlib
 import logging
+from collections import OrderedDict, deque
+# lru_cache(maxsize=1) = build the shared VoiceContextManager once per process
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 
+# Module logger for the helper functions below (VoiceContextManager keeps its own self.logger)
+# Every call uses %-style arguments: the message is only formatted if the record is emitted
+logger = logging.getLogger(__name__)
+
+# NAME PATTERNS - every way of introducing yourself, compiled ONCE into a single pattern
+# One search per message walks the text once, instead of six re.search() calls each
+# looking their pattern up again in re's cache and scanning the whole message
+# - "I'm John" / "I am John" / "I'm called David" (the optional " called" is tried first)
+# - "My name is Sarah" / "Call me Mike" / "This is Jennifer" / "Name's Alex"
+# \b = must start a word, so "him tired" never reads as "I'm Tired"
+# re.IGNORECASE = no .lower() copy of each message needed
+_NAME_RE = re.compile(
+    r"\b(?:i'?m(?: called)? |i am(?: called)? |my name is |call me |this is |name'?s )([A-Z][a-z]+)",
+    re.IGNORECASE,
+)
+
+# CONTEXT_SCAN_WINDOW = how many of the latest messages a briefing reads
+# (the name has to be introduced within this window to be found)
+CONTEXT_SCAN_WINDOW = 50
+
+# _ROLE_MAP = message class → who said it, for the briefing
+# One dict lookup on type(message) instead of an isinstance() chain per message
+# Anything else (system/tool messages) isn't in the map and is skipped
+_ROLE_MAP = {HumanMessage: "User", AIMessage: "Pepper"}
+
+# BRIEFING CACHE - the expensive part of a briefing, remembered per conversation state
+# Key = (user_id, calling_reason, message count, fingerprint of the last 10 messages): any new
+# message changes the count and the fingerprint, so a changed chat never gets a stale briefing
+# Value = the briefing WITHOUT its timestamps (those are filled in fresh on every call)
+# OrderedDict = least recently used entries are dropped first once it holds _CONTEXT_CACHE_SIZE
+_CONTEXT_CACHE_SIZE = 1024
+_context_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+
+def _messages_fingerprint(messages: List[BaseMessage]) -> bytes:
+    """🔑 FINGERPRINT - 16-byte digest of the last 10 messages' text"""
+    return hashlib.blake2b(
+        b"\x00".join(str(message.content).encode() for message in messages[-10:]),
+        digest_size=16,
+    ).digest()
+
+
+# TOPIC KEYWORDS - simple keyword-based topic identification, built once at import
+TOPIC_KEYWORDS = {
+    "work": ["work", "job", "office", "meeting", "project", "boss", "colleague", "deadline", "presentation"],
+    "health": ["health", "doctor", "medicine", "pain", "sick", "wellness", "exercise", "diet"],
+    "travel": ["travel", "trip", "vacation", "flight", "hotel", "destination", "visit", "journey"],
+    "food": ["food", "restaurant", "recipe", "cooking", "eat", "meal", "dinner", "lunch"],
+    "technology": ["app", "phone", "computer", "software", "ai", "tech", "website", "internet"],
+    "personal": ["family", "friend", "relationship", "personal", "life", "home", "kids", "children"],
+    "shopping": ["buy", "purchase", "order", "shopping", "store", "price", "cost", "product"],
+    "entertainment": ["movie", "music", "game", "show", "book", "fun", "watch", "play"],
+    "education": ["learn", "study", "school", "course", "education", "teaching", "university"],
+    "finance": ["money", "bank", "budget", "investment", "financial", "cost", "payment", "price"],
+}
+
+# _KEYWORD_TOPICS = the same table turned around: keyword → every topic it counts for
+# ("cost" and "price" count for both shopping and finance)
+_KEYWORD_TOPICS: Dict[str, List[str]] = {}
+for _topic, _keywords in TOPIC_KEYWORDS.items():
+    for _keyword in _keywords:
+        _KEYWORD_TOPICS.setdefault(_keyword, []).append(_topic)
+
+# _TOPIC_RE = every keyword in ONE compiled alternation: a single finditer() pass walks the
+# text once in C, instead of ~80 separate "keyword in text" scans from Python
+# \b...\b = whole words only, so "happy" no longer counts as "app" or "great" as "eat"
+# re.IGNORECASE = matches "Meeting" / "AI" directly - no lowercased copy of the text needed
+_TOPIC_RE = re.compile(r"\b(" + "|".join(map(re.escape, _KEYWORD_TOPICS)) + r")\b", re.IGNORECASE)
+
 class VoiceContextManager:
     """
     VOICE CONTEXT MANAGER - Creates briefing documents for voice calls
@@ -47,6 +120,9 @@ class VoiceContextManager:
     - format_for_vapi(): Formats context for Vapi's variable system
     """
     
+    # __slots__ = the manager only ever holds its logger - no per-instance __dict__ needed
+    __slots__ = ("logger",)
+    
     def __init__(self):
         """Initialize the context manager with logging"""
         self.logger = logging.getLogger(__name__)
@@ -80,35 +156,60 @@ class VoiceContextManager:
         Returns:
             context: Dictionary with all context needed for voice call
         """
+        # READ THE CLOCK ONCE - both timestamps in the briefing reuse this one reading
+        # (log records carry their own time, so the log lines don't need one)
+        now = datetime.now().isoformat()
         try:
-            # 📊 LOG CONTEXT PREPARATION INITIATION
-            self.logger.info(f"📋 PREPARING VOICE CONTEXT FOR CALL:")
-            self.logger.info(f"   🆔 User ID: {user_id}")
-            self.logger.info(f"   💬 Messages provided: {len(messages) if messages else 0}")
-            self.logger.info(f"   📋 Calling reason: {calling_reason}")
-            self.logger.info(f"   ⏰ Start time: {datetime.now().isoformat()}")
+            # 📊 LOG CONTEXT PREPARATION INITIATION (one record instead of one per field)
+            self.logger.info(
+                "📋 PREPARING VOICE CONTEXT FOR CALL: user_id=%s messages=%d reason=%s",
+                user_id, len(messages) if messages else 0, calling_reason,
+            )
             
             # STEP 1: VALIDATE INPUT
             if not messages:
                 self.logger.warning("⚠️ No messages provided for voice context")
                 return self._create_empty_context(calling_reason)
             
-            # STEP 2: EXTRACT USER INFORMATION 
-            # Find the user's name from their messages
-            user_name = self.extract_user_name(messages)
+            # CACHED BRIEFING? Same user, same reason, same conversation → reuse the analysis
+            cache_key = (user_id, calling_reason, len(messages), _messages_fingerprint(messages))
+            cached = _context_cache.get(cache_key)
+            if cached is not None:
+                _context_cache.move_to_end(cache_key)  # Most recently used
+                self.logger.info("⚡ VOICE CONTEXT CACHE HIT: user=%s topic=%s", cached["userName"], cached["conversationTopic"])
+                return {**cached, "callInitiatedAt": now, "contextPreparedAt": now}
             
-            # STEP 3: ANALYZE CONVERSATION CONTENT
-            # Get recent messages for context (last 10 messages or all if fewer)
-            recent_messages = messages[-10:] if len(messages) > 10 else messages
+            # STEP 2 + 3: ONE PASS OVER THE RECENT HISTORY
+            # The last CONTEXT_SCAN_WINDOW messages are walked ONCE, collecting everything at the
+            # same time, instead of separate passes for the name, the summary, the topic and the
+            # last user message - a long-time user's thousands of messages cost the same as 50
+            user_name = None
+            last_user_message = None
+            # recent_messages = only the last 6 survive (summary uses 6, topic the last 5 of them)
+            recent_messages = deque(maxlen=6)
+            for message in messages[-CONTEXT_SCAN_WINDOW:]:
+                recent_messages.append(message)
+                if type(message) is HumanMessage:
+                    last_user_message = message.content
+                    # Find the user's name from their messages (first introduction wins - see _NAME_RE)
+                    if user_name is None:
+                        match = _NAME_RE.search(message.content)
+                        if match:
+                            user_name = match.group(1).title()  # Capitalize first letter
+                            self.logger.info("👤 USER NAME FOUND: %s", user_name)
+            if user_name is None:
+                self.logger.info("👤 No user name found in conversation")
             
-            # Create conversation summary
+            # Summary and topic only ever look at the short recent window collected above
+            recent_messages = list(recent_messages)
             conversation_summary = self.summarize_conversation(recent_messages)
-            
-            # Identify main topic
             main_topic = self.identify_conversation_topic(recent_messages)
             
-            # Get the most recent user message
-            last_user_message = self._get_last_user_message(messages)
+            # Most recent user message, cut to 200 characters for the briefing
+            if last_user_message is None:
+                last_user_message = "No recent user message found"
+            elif len(last_user_message) > 200:
+                last_user_message = last_user_message[:200] + "..."
             
             # STEP 4: BUILD COMPLETE CONTEXT DICTIONARY
             context = {
@@ -127,35 +228,40 @@ class VoiceContextManager:
                 
                 # CALL CONTEXT
                 "callingReason": calling_reason,
-                "callInitiatedAt": datetime.now().isoformat(),
+                "callInitiatedAt": now,
                 
                 # TECHNICAL CONTEXT
                 "interface": "voice_from_whatsapp",
-                "contextPreparedAt": datetime.now().isoformat()
+                "contextPreparedAt": now
+            }
+            
+            # REMEMBER THE BRIEFING (minus its timestamps) FOR THE NEXT CALL ON THIS CONVERSATION
+            _context_cache[cache_key] = {
+                field: value for field, value in context.items()
+                if field not in ("callInitiatedAt", "contextPreparedAt")
             }
+            if len(_context_cache) > _CONTEXT_CACHE_SIZE:
+                _context_cache.popitem(last=False)  # Drop the least recently used
             
-            # STEP 5: LOG COMPREHENSIVE CONTEXT CREATION SUCCESS
-            context_size = len(str(context))
-            self.logger.info(f"✅ VOICE CONTEXT PREPARED SUCCESSFULLY:")
-            self.logger.info(f"   👤 User: {context['userName']}")
-            self.logger.info(f"   💬 Topic: {context['conversationTopic']}")
-            self.logger.info(f"   📝 Messages: {context['messageCount']}")
-            self.logger.info(f"   📋 Reason: {calling_reason}")
-            self.logger.info(f"   📄 Summary length: {len(context['recentContext'])} chars")
-            self.logger.info(f"   🔢 Total context size: {context_size} chars")
-            self.logger.info(f"   ⏰ Preparation completed: {datetime.now().isoformat()}")
+            # STEP 5: LOG COMPREHENSIVE CONTEXT CREATION SUCCESS (one record instead of seven)
+            # Skipped entirely when INFO is filtered - str(context) stringifies the whole briefing
+            # just to measure it
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "✅ VOICE CONTEXT PREPARED: user=%s topic=%s messages=%d reason=%s summary_chars=%d context_chars=%d",
+                    context["userName"], context["conversationTopic"], context["messageCount"],
+                    calling_reason, len(context["recentContext"]), len(str(context)),
+                )
             
             return context
             
         except Exception as e:
-            self.logger.error(f"🚨 VOICE CONTEXT PREPARATION ERROR: {str(e)}")
-            self.logger.error(f"   🆔 User ID: {user_id}")
-            self.logger.error(f"   💬 Messages count: {len(messages) if messages else 0}")
-            self.logger.error(f"   🗺 Message types: {[type(msg).__name__ for msg in messages[:3]] if messages else 'None'}")
-            self.logger.error(f"   📋 Calling reason: {calling_reason}")
-            # Include full exception details for debugging
-            import traceback
-            self.logger.error(f"   📚 Full traceback: {traceback.format_exc()}")
+            # logger.exception() = error message + full traceback in one record
+            # (the traceback is only formatted if the record is actually emitted)
+            self.logger.exception(
+                "🚨 VOICE CONTEXT PREPARATION ERROR: %s | user_id=%s messages=%d reason=%s",
+                e, user_id, len(messages) if messages else 0, calling_reason,
+            )
             # Return minimal context to avoid breaking the call
             return self._create_empty_context(calling_reason)
     
@@ -175,33 +281,21 @@ class VoiceContextManager:
         try:
             # SEARCH THROUGH USER MESSAGES (HumanMessage = from user)
             for message in messages:
-                if isinstance(message, HumanMessage):
-                    content = message.content.lower()
-                    
-                    # PATTERN MATCHING FOR NAME EXTRACTION
+                if type(message) is HumanMessage:
+                    # PATTERN MATCHING FOR NAME EXTRACTION (see _NAME_RE above)
                     # Look for common ways people introduce themselves
-                    patterns = [
-                        r"i'?m ([A-Z][a-z]+)",           # "I'm John" or "I am John"
-                        r"my name is ([A-Z][a-z]+)",     # "My name is Sarah"
-                        r"call me ([A-Z][a-z]+)",        # "Call me Mike"
-                        r"this is ([A-Z][a-z]+)",        # "This is Jennifer"
-                        r"i'?m called ([A-Z][a-z]+)",    # "I'm called David"
-                        r"name'?s ([A-Z][a-z]+)",        # "Name's Alex"
-                    ]
-                    
-                    for pattern in patterns:
-                        match = re.search(pattern, content, re.IGNORECASE)
-                        if match:
-                            name = match.group(1).title()  # Capitalize first letter
-                            self.logger.info(f"👤 USER NAME FOUND: {name}")
-                            return name
+                    match = _NAME_RE.search(message.content)
+                    if match:
+                        name = match.group(1).title()  # Capitalize first letter
+                        self.logger.info("👤 USER NAME FOUND: %s", name)
+                        return name
             
             # NO NAME FOUND
             self.logger.info("👤 No user name found in conversation")
             return None
             
         except Exception as e:
-            self.logger.error(f"🚨 NAME EXTRACTION ERROR: {str(e)}")
+            self.logger.error("🚨 NAME EXTRACTION ERROR: %s", e)
             return None
     
     def summarize_conversation(self, messages: List[BaseMessage]) -> str:
@@ -224,30 +318,29 @@ class VoiceContextManager:
             
             # Take recent messages and create summary
             for message in messages[-6:]:  # Last 3 exchanges (6 messages)
-                if isinstance(message, HumanMessage):
-                    role = "User"
-                elif isinstance(message, AIMessage):
-                    role = "Pepper"
-                else:
+                role = _ROLE_MAP.get(type(message))  # See _ROLE_MAP above
+                if role is None:
                     continue  # Skip system messages
                 
                 # TRUNCATE LONG MESSAGES FOR SUMMARY
+                # One f-string builds the whole line - long messages are cut inside it
+                # (no separate slice + "..." concatenation), short ones are used as-is
                 content = message.content
                 if len(content) > 100:
-                    content = content[:97] + "..."
-                
-                recent_exchanges.append(f"{role}: {content}")
+                    recent_exchanges.append(f"{role}: {content[:97]}...")
+                else:
+                    recent_exchanges.append(f"{role}: {content}")
             
             # JOIN INTO READABLE SUMMARY
             if recent_exchanges:
                 summary = " | ".join(recent_exchanges)
-                self.logger.debug(f"📝 CONVERSATION SUMMARY: {summary[:200]}...")
+                self.logger.debug("📝 CONVERSATION SUMMARY: %.200s...", summary)
                 return summary
             else:
                 return "Recent conversation pepperilable but no clear exchanges found."
                 
         except Exception as e:
-            self.logger.error(f"🚨 CONVERSATION SUMMARY ERROR: {str(e)}")
+            self.logger.error("🚨 CONVERSATION SUMMARY ERROR: %s", e)
             return "Error creating conversation summary."
     
     def identify_conversation_topic(self, messages: List[BaseMessage]) -> str:
@@ -264,60 +357,33 @@ class VoiceContextManager:
             if not messages:
                 return "General conversation"
             
-            # COMBINE RECENT MESSAGE CONTENT
-            # Get text from last 5 messages to analyze
-            recent_content = " ".join([
-                msg.content for msg in messages[-5:] 
-                if hasattr(msg, 'content') and msg.content
-            ])
-            
-            content_lower = recent_content.lower()
-            
-            # TOPIC CLASSIFICATION BASED ON KEYWORDS
-            # Simple keyword-based topic identification
-            topics = {
-                "work": ["work", "job", "office", "meeting", "project", "boss", "colleague", "deadline", "presentation"],
-                "health": ["health", "doctor", "medicine", "pain", "sick", "wellness", "exercise", "diet"],
-                "travel": ["travel", "trip", "vacation", "flight", "hotel", "destination", "visit", "journey"],
-                "food": ["food", "restaurant", "recipe", "cooking", "eat", "meal", "dinner", "lunch"],
-                "technology": ["app", "phone", "computer", "software", "AI", "tech", "website", "internet"],
-                "personal": ["family", "friend", "relationship", "personal", "life", "home", "kids", "children"],
-                "shopping": ["buy", "purchase", "order", "shopping", "store", "price", "cost", "product"],
-                "entertainment": ["movie", "music", "game", "show", "book", "fun", "watch", "play"],
-                "education": ["learn", "study", "school", "course", "education", "teaching", "university"],
-                "finance": ["money", "bank", "budget", "investment", "financial", "cost", "payment", "price"]
-            }
-            
-            # FIND BEST MATCHING TOPIC
+            # TOPIC CLASSIFICATION BASED ON KEYWORDS (see TOPIC_KEYWORDS above)
+            # FIND BEST MATCHING TOPIC - _TOPIC_RE runs over each of the last 5 messages in turn,
+            # each hit credited to all its topics (no joined copy of all five texts is built)
             topic_scores = {}
-            for topic, keywords in topics.items():
-                score = sum(1 for keyword in keywords if keyword in content_lower)
-                if score > 0:
-                    topic_scores[topic] = score
+            for msg in messages[-5:]:
+                content = getattr(msg, "content", None)
+                if not content:
+                    continue
+                # findall() = the whole scan AND collecting the matched words happen in C;
+                # no Python-level match object is created per hit
+                for keyword in _TOPIC_RE.findall(content):
+                    # .lower() on the matched word only (a few characters) to find its topics
+                    for topic in _KEYWORD_TOPICS[keyword.lower()]:
+                        topic_scores[topic] = topic_scores.get(topic, 0) + 1
             
             if topic_scores:
                 # Return the topic with the highest score
                 best_topic = max(topic_scores, key=topic_scores.get)
-                self.logger.info(f"🎯 IDENTIFIED TOPIC: {best_topic.title()} (score: {topic_scores[best_topic]})")
+                self.logger.info("🎯 IDENTIFIED TOPIC: %s (score: %d)", best_topic.title(), topic_scores[best_topic])
                 return best_topic.title()
             else:
                 return "General conversation"
                 
         except Exception as e:
-            self.logger.error(f"🚨 TOPIC IDENTIFICATION ERROR: {str(e)}")
+            self.logger.error("🚨 TOPIC IDENTIFICATION ERROR: %s", e)
             return "General conversation"
     
-    def _get_last_user_message(self, messages: List[BaseMessage]) -> str:
-        """Get the most recent message from the user"""
-        try:
-            # Search backwards through messages to find last user message
-            for message in reversed(messages):
-                if isinstance(message, HumanMessage):
-                    return message.content[:200] + "..." if len(message.content) > 200 else message.content
-            return "No recent user message found"
-        except:
-            return "Error retrieving last message"
-    
     def _categorize_conversation_length(self, message_count: int) -> str:
         """Categorize the relationship based on message count"""
         if message_count <= 2:
@@ -345,9 +411,29 @@ class VoiceContextManager:
             "contextPreparedAt": datetime.now().isoformat()
         }
 
+# CALLING REASONS - (word in the message, reason), most important first
+CALLING_REASONS = (
+    ("urgent", "Urgent matter - user requested immediate callback"),
+    ("emergency", "Urgent matter - user requested immediate callback"),
+    ("discuss", "User wants to discuss something in detail"),
+    ("explain", "User needs detailed explanation"),
+    ("help", "User needs assistance with something"),
+    ("talk", "User prefers to talk rather than type"),
+)
+
+# _REASON_RE = all the reason words in one compiled pattern
+# \b only at the START of the word, so "talking", "helpful" and "discussed" still count
+_REASON_RE = re.compile(r"\b(" + "|".join(word for word, _ in CALLING_REASONS) + ")", re.IGNORECASE)
+
 # HELPER FUNCTIONS FOR EXTERNAL USE
 # These can be imported and used directly in other parts of the system
 
+@lru_cache(maxsize=1)
+def _get_shared_manager() -> VoiceContextManager:
+    """📋 SHARED CONTEXT MANAGER - One VoiceContextManager per process (it keeps no per-call state)"""
+    return VoiceContextManager()
+
+
 def prepare_voice_context_simple(messages: List[BaseMessage], user_id: Optional[str] = None) -> Dict[str, Any]:
     """
     SIMPLE VOICE CONTEXT PREPARATION - Convenience function for quick context creation
@@ -358,28 +444,23 @@ def prepare_voice_context_simple(messages: List[BaseMessage], user_id: Optional[
     📞 USAGE: For when you need voice context quickly without creating
     a full VoiceContextManager instance
     """
-    # 📊 LOG SIMPLE CONTEXT PREPARATION REQUEST
-    logger = logging.getLogger(__name__)
-    logger.info(f"🚀 SIMPLE VOICE CONTEXT REQUESTED:")
-    logger.info(f"   🆔 User ID: {user_id}")
-    logger.info(f"   💬 Message count: {len(messages) if messages else 0}")
-    logger.info(f"   ⏰ Request time: {datetime.now().isoformat()}")
+    # 📊 LOG SIMPLE CONTEXT PREPARATION REQUEST (the record carries its own timestamp)
+    logger.info("🚀 SIMPLE VOICE CONTEXT REQUESTED: user_id=%s messages=%d", user_id, len(messages) if messages else 0)
     
     try:
-        manager = VoiceContextManager()
-        context = manager.prepare_voice_context(messages, user_id)
+        context = _get_shared_manager().prepare_voice_context(messages, user_id)
         
-        logger.info(f"✅ SIMPLE CONTEXT PREPARATION SUCCESSFUL")
-        logger.info(f"   🔢 Context size: {len(str(context))} characters")
+        # str(context) stringifies the whole briefing - only when the line is actually logged
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✅ SIMPLE CONTEXT PREPARATION SUCCESSFUL: %d characters", len(str(context)))
         return context
         
     except Exception as e:
-        logger.error(f"🚨 SIMPLE CONTEXT PREPARATION FAILED: {str(e)}")
-        logger.error(f"   🆔 User ID: {user_id}")
-        logger.error(f"   💬 Messages: {len(messages) if messages else 0}")
-        # Include full exception details for debugging
-        import traceback
-        logger.error(f"   📚 Full traceback: {traceback.format_exc()}")
+        # logger.exception() = error message + full traceback in one record
+        logger.exception(
+            "🚨 SIMPLE CONTEXT PREPARATION FAILED: %s | user_id=%s messages=%d",
+            e, user_id, len(messages) if messages else 0,
+        )
         raise
 
 def extract_calling_reason_from_message(message_content: str) -> str:
@@ -389,23 +470,15 @@ def extract_calling_reason_from_message(message_content: str) -> str:
     🔗 REAL-WORLD ANALOGY: Like reading a message that says 
     "Can you call me about the project?" and extracting "about the project"
     """
-    # 📊 LOG CALLING REASON EXTRACTION
-    logger = logging.getLogger(__name__)
-    logger.debug(f"🎯 EXTRACTING CALLING REASON:")
-    logger.debug(f"   📝 Message: {message_content[:100]}{'...' if len(message_content) > 100 else ''}")
+    # 📊 LOG CALLING REASON EXTRACTION (%.100s = first 100 characters, cut only if emitted)
+    logger.debug("🎯 EXTRACTING CALLING REASON: %.100s", message_content)
     
-    content_lower = message_content.lower()
+    # Look for specific calling reasons - ONE scan collects every reason word present
+    # (re.IGNORECASE = no lowercased copy of the message needed)
+    found = {word.lower() for word in _REASON_RE.findall(message_content)}
     
-    # Look for specific calling reasons
-    if "urgent" in content_lower or "emergency" in content_lower:
-        return "Urgent matter - user requested immediate callback"
-    elif "discuss" in content_lower:
-        return "User wants to discuss something in detail"
-    elif "explain" in content_lower:
-        return "User needs detailed explanation"
-    elif "help" in content_lower:
-        return "User needs assistance with something"
-    elif "talk" in content_lower:
-        return "User prefers to talk rather than type"
-    else:
-        return "User requested callback from WhatsApp"
\ No newline at end of file
+    # The most important reason wins, whatever order the words appeared in
+    for word, reason in CALLING_REASONS:
+        if word in found:
+            return reason
+    return "User requested callback from WhatsApp"
\ No newline at end of file
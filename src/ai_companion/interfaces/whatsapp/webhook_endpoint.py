@@ -102,8 +102,13 @@ The docker-compose.yml file tells Docker to start this server automatically.
 
 # FastAPI: The web server framework that makes it easy to receive HTTP requests
 # This is like importing a "web server construction kit" 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+# ORJSONResponse: encodes JSON replies with orjson (C, SIMD-accelerated) instead of stdlib json
+from fastapi.responses import ORJSONResponse
+
 # whatsapp_router: The actual code that handles WhatsApp messages
 # This is defined in whatsapp_response.py - it contains all the functions
 # that process messages, download images, send responses, etc.
@@ -114,11 +119,45 @@ from ai_companion.interfaces.whatsapp.whatsapp_response import whatsapp_router
 # that process voice calls, create voice assistants, handle call webhooks, etc.
 from ai_companion.interfaces.vapi.vapi_endpoints import vapi_router
 
+# settings.WEBHOOK_API_DOCS decides whether the interactive API docs are served
+from ai_companion.settings import settings
+
+# get_graph / close_graph: Pepper's ONE compiled graph + SQLite checkpointer (see persistence.py)
+from ai_companion.graph.persistence import close_graph, get_graph
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    🔌 SERVER LIFESPAN - Opens Pepper's memory database once at startup, closes it at shutdown
+
+    Everything before `yield` runs once when the server (each worker) starts; everything after
+    runs once when it stops. Building the graph here means the first WhatsApp message or phone
+    call doesn't pay for opening SQLite and compiling LangGraph - and every request after it
+    reuses the same connection and compiled graph.
+    """
+    await get_graph()
+    yield
+    # Commit anything still pending and close the connection cleanly
+    await close_graph()
+
 
 # STEP 1: Create the web server
 # FastAPI() creates a new web server instance - like opening a new restaurant
 # This server will listen for HTTP requests from WhatsApp
-app = FastAPI()
+# openapi_url/docs_url/redoc_url=None = no /docs pages in production (settings.WEBHOOK_API_DOCS):
+# nobody browses them there, and the OpenAPI schema (every route + Pydantic model
+# introspected) is never built on a worker that only answers webhooks
+# default_response_class=ORJSONResponse = any route that returns a dict is encoded by orjson
+# (the routers below set the same default, so they behave identically wherever they're mounted)
+_docs = settings.WEBHOOK_API_DOCS
+app = FastAPI(
+    openapi_url="/openapi.json" if _docs else None,
+    docs_url="/docs" if _docs else None,
+    redoc_url="/redoc" if _docs else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,  # Open/close Pepper's memory database with the server (see above)
+)
 
 # STEP 2: Tell the server how to handle WhatsApp requests
 # app.include_router() connects WhatsApp message processing to this web server
@@ -120,25 +120,21 @@ import httpx
 # APIRouter = organizes related web endpoints together (like grouping related phone extensions)
 # Request = incoming data from WhatsApp (like an envelope with message contents)
 # Response = outgoing data back to WhatsApp (like a reply letter with status codes)
+# ORJSONResponse = JSON reply encoded with orjson (faster than the stdlib json module)
 from fastapi import APIRouter, Request, Response
+from fastapi.responses import ORJSONResponse
 
 # LangChain message format - standardized way to represent chat messages
 # HumanMessage = wrapper that tells Pepper "this message came from a human user"
 # Same format used in Chainlit interface, so Pepper's brain processes WhatsApp and web messages identically
 from langchain_core.messages import HumanMessage
 
-# AsyncSqliteSaver = LangGraph's conversation memory system using SQLite database
-# Stores conversation history so Pepper remembers what you talked about previously
-# AsyncSqliteSaver = version that doesn't block other conversations while saving memory
-# Think of it like Pepper's diary that she writes in without stopping her conversations
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
-
 # pepper'S CORE BRAIN COMPONENTS - The same AI modules used in Chainlit interface
 
-# graph_builder = Pepper's complete workflow system (the conductor that orchestrates all AI modules)
+# get_graph() = Pepper's complete workflow, compiled once with her SQLite conversation memory attached
 # Contains the IDENTICAL LangGraph workflow: memory→router→context→response nodes
-# Same brain that processes messages in Chainlit web interface, just different input/output methods
-from ai_companion.graph import graph_builder
+# Same brain (same function) that processes messages in Chainlit web interface
+from ai_companion.graph.persistence import get_graph
 
 # AI processing modules for different media types (same capabilities as Chainlit)
 # ImageToText = Pepper's vision system (analyzes photos users send via WhatsApp)
@@ -147,10 +143,6 @@ from ai_companion.graph import graph_builder
 from ai_companion.modules.image import ImageToText
 from ai_companion.modules.speech import SpeechToText, TextToSpeech
 
-# settings = Pepper's configuration file containing API keys, model choices, database paths
-# Shared across all interfaces so Chainlit and WhatsApp use same AI models and settings
-from ai_companion.settings import settings
-
 # CREATE LOGGER INSTANCE - Sets up error reporting for this specific file
 # __name__ = automatic variable containing this file's name ("whatsapp_response")
 # Think of this like creating a labeled logbook specifically for WhatsApp problems
@@ -183,7 +175,9 @@ image_to_text = ImageToText()
 # APIRouter() = creates a group of related web endpoints (like organizing related phone extensions)
 # This router gets connected to the main server in webhook_endpoint.py
 # Think of it like creating a "WhatsApp department" within Pepper's web server
-whatsapp_router = APIRouter()
+# default_response_class=ORJSONResponse = same orjson encoding as vapi_router for any dict reply
+# (whatsapp_handler itself answers with plain-text Response objects, which are sent as-is)
+whatsapp_router = APIRouter(default_response_class=ORJSONResponse)
 
 # LOAD WHATSAPP BUSINESS API CREDENTIALS FROM ENVIRONMENT VARIABLES
 # Environment variables = secure way to store secrets outside of code files
@@ -237,7 +231,7 @@ async def whatsapp_handler(request: Request) -> Response:
     4. Send appropriate response type via WhatsApp API
     
     CROSS-SYSTEM CONNECTIONS:
-    - graph_builder.compile(): IDENTICAL Pepper brain as Chainlit
+    - get_graph(): IDENTICAL Pepper brain as Chainlit (compiled once, shared by every message)
     - AsyncSqliteSaver: SAME conversation persistence mechanism
     - image_to_text/speech_to_text: SAME AI modules as Chainlit
     - Multi-modal responses: SAME workflow routing from router_node
@@ -420,79 +414,64 @@ async def whatsapp_handler(request: Request) -> Response:
             print(f"  📄 Content Length: {len(content)} chars")
             print()
             
-            # SETUP CONVERSATION MEMORY DATABASE CONNECTION
-            # async with = Python context manager that automatically handles opening/closing resources
-            # Like automatically locking/unlocking a file cabinet when you're done using it
-            # AsyncSqliteSaver = Pepper's memory system that remembers conversation history
-            # .from_conn_string() = connect to SQLite database file at the specified path
-            # settings.SHORT_TERM_MEMORY_DB_PATH = file path where conversation history is stored
+            # GET pepper'S SHARED WORKFLOW GRAPH + MEMORY DATABASE
+            # get_graph() = the compiled LangGraph workflow with the SQLite checkpointer attached
+            # It's opened and compiled ONCE per process (first message), then reused - no more
+            # re-opening the database file and recompiling the workflow on every WhatsApp message
+            # This is the IDENTICAL workflow used in Chainlit: memory→router→context→response nodes
             try:
-                print(f"🔍 CONNECTING TO MEMORY DATABASE:")
-                print(f"  📁 Database Path: {settings.SHORT_TERM_MEMORY_DB_PATH}")
+                graph = await get_graph()
+
+                # PREPARE GRAPH INPUT DATA
+                # VALIDATE PHONE NUMBER FORMAT
+                # WhatsApp sends numbers without + prefix, but Vapi needs E.164 format
+                formatted_phone = from_number
+                if not formatted_phone.startswith('+'):
+                    # Add + prefix if missing (WhatsApp sometimes omits it)
+                    formatted_phone = f"+{formatted_phone}"
+                    print(f"📱 PHONE NUMBER FORMATTING:")
+                    print(f"  Original: {from_number}")
+                    print(f"  Formatted: {formatted_phone}")
+                
+                graph_input = {
+                    "messages": [HumanMessage(content=content)],  # Wrap user's text in LangChain message format
+                    "user_phone_number": formatted_phone,         # Pass formatted phone number for voice calling
+                    "user_id": from_number,                       # Use original phone as user ID
+                    "interface": "whatsapp",                      # Track that this came from WhatsApp
+                }
+                graph_config = {"configurable": {"thread_id": session_id}}
+                
+                print(f"🔍 INVOKING LANGGRAPH WORKFLOW:")
+                print(f"  📨 Input: {len(graph_input)} keys")
+                print(f"  📱 Phone: {graph_input.get('user_phone_number')}")
+                print(f"  🆔 User ID: {graph_input.get('user_id')}")
+                print(f"  🌐 Interface: {graph_input.get('interface')}")
+                print(f"  🔧 Config: thread_id = {session_id}")
+                print(f"  🚀 Starting graph.ainvoke()...")
+                
+                # PROCESS USER MESSAGE THROUGH COMPLETE pepper WORKFLOW
+                # await = wait for Pepper's brain to complete processing (this takes time)
+                # graph.ainvoke() = run the message through Pepper's complete LangGraph workflow
+                await graph.ainvoke(graph_input, graph_config)
+                
+                print(f"✅ LANGGRAPH WORKFLOW COMPLETED SUCCESSFULLY")
+                
+                # HumanMessage(content=content) = tells Pepper "this text came from a human user"
+                # thread_id: session_id = each phone number gets its own conversation thread
+                # This is how Pepper keeps different users' conversations separate
+                
+                # GET pepper'S FINAL STATE AFTER PROCESSING
+                # After the workflow completes, we need to see what Pepper decided to do
+                # await = wait for state retrieval to complete
+                # graph.aget_state() = get the final state of Pepper's workflow
+                # config = same configuration (thread_id) to get the right conversation's state
+                print(f"🔍 RETRIEVING FINAL WORKFLOW STATE:")
+                print(f"  🔧 Config: thread_id = {session_id}")
+                
+                output_state = await graph.aget_state(config={"configurable": {"thread_id": session_id}})
+                print(f"✅ FINAL STATE RETRIEVED SUCCESSFULLY")
+                print(f"  📊 State Keys: {list(output_state.values.keys()) if output_state.values else 'None'}")
                 
-                async with AsyncSqliteSaver.from_conn_string(settings.SHORT_TERM_MEMORY_DB_PATH) as short_term_memory:
-                    print(f"✅ MEMORY DATABASE CONNECTED SUCCESSFULLY")
-                    
-                    # BUILD pepper'S COMPLETE WORKFLOW GRAPH
-                    # graph_builder.compile() = creates Pepper's complete LangGraph workflow
-                    # checkpointer=short_term_memory = connect the memory system so Pepper remembers conversations
-                    # This creates the IDENTICAL workflow used in Chainlit: memory→router→context→response nodes
-                    print(f"🔍 BUILDING LANGGRAPH WORKFLOW:")
-                    print(f"  🧠 Compiling graph with memory checkpointer...")
-                    
-                    graph = graph_builder.compile(checkpointer=short_term_memory)
-                    print(f"✅ LANGGRAPH WORKFLOW COMPILED SUCCESSFULLY")
-                    
-                    # PREPARE GRAPH INPUT DATA
-                    # VALIDATE PHONE NUMBER FORMAT
-                    # WhatsApp sends numbers without + prefix, but Vapi needs E.164 format
-                    formatted_phone = from_number
-                    if not formatted_phone.startswith('+'):
-                        # Add + prefix if missing (WhatsApp sometimes omits it)
-                        formatted_phone = f"+{formatted_phone}"
-                        print(f"📱 PHONE NUMBER FORMATTING:")
-                        print(f"  Original: {from_number}")
-                        print(f"  Formatted: {formatted_phone}")
-                    
-                    graph_input = {
-                        "messages": [HumanMessage(content=content)],  # Wrap user's text in LangChain message format
-                        "user_phone_number": formatted_phone,         # Pass formatted phone number for voice calling
-                        "user_id": from_number,                       # Use original phone as user ID
-                        "interface": "whatsapp",                      # Track that this came from WhatsApp
-                    }
-                    graph_config = {"configurable": {"thread_id": session_id}}
-                    
-                    print(f"🔍 INVOKING LANGGRAPH WORKFLOW:")
-                    print(f"  📨 Input: {len(graph_input)} keys")
-                    print(f"  📱 Phone: {graph_input.get('user_phone_number')}")
-                    print(f"  🆔 User ID: {graph_input.get('user_id')}")
-                    print(f"  🌐 Interface: {graph_input.get('interface')}")
-                    print(f"  🔧 Config: thread_id = {session_id}")
-                    print(f"  🚀 Starting graph.ainvoke()...")
-                    
-                    # PROCESS USER MESSAGE THROUGH COMPLETE pepper WORKFLOW
-                    # await = wait for Pepper's brain to complete processing (this takes time)
-                    # graph.ainvoke() = run the message through Pepper's complete LangGraph workflow
-                    await graph.ainvoke(graph_input, graph_config)
-                    
-                    print(f"✅ LANGGRAPH WORKFLOW COMPLETED SUCCESSFULLY")
-                    
-                    # HumanMessage(content=content) = tells Pepper "this text came from a human user"
-                    # thread_id: session_id = each phone number gets its own conversation thread
-                    # This is how Pepper keeps different users' conversations separate
-                    
-                    # GET pepper'S FINAL STATE AFTER PROCESSING
-                    # After the workflow completes, we need to see what Pepper decided to do
-                    # await = wait for state retrieval to complete
-                    # graph.aget_state() = get the final state of Pepper's workflow
-                    # config = same configuration (thread_id) to get the right conversation's state
-                    print(f"🔍 RETRIEVING FINAL WORKFLOW STATE:")
-                    print(f"  🔧 Config: thread_id = {session_id}")
-                    
-                    output_state = await graph.aget_state(config={"configurable": {"thread_id": session_id}})
-                    print(f"✅ FINAL STATE RETRIEVED SUCCESSFULLY")
-                    print(f"  📊 State Keys: {list(output_state.values.keys()) if output_state.values else 'None'}")
-                    
             except Exception as graph_error:
                 print(f"🚨 LANGGRAPH PROCESSING ERROR:")
                 print(f"  📱 User: {from_number}")
@@ -534,10 +513,10 @@ async def whatsapp_handler(request: Request) -> Response:
             # AUDIO RESPONSE - pepper WANTS TO SEND A VOICE MESSAGE
             if workflow == "audio":
                 
-                # GET AUDIO DATA FROM pepper'S AUDIO_NODE
-                # audio_buffer = the actual audio file data (bytes) that audio_node generated
-                # This is Pepper's voice saying the response_message text (ElevenLabs TTS)
-                audio_buffer = output_state.values["audio_buffer"]
+                # VOICE pepper'S REPLY
+                # audio_node only writes the text - we synthesize it here so the MP3 bytes
+                # never get stored in the checkpoint database alongside the conversation
+                audio_buffer = await text_to_speech.synthesize(response_message)
                 
                 # SEND VOICE MESSAGE TO USER
                 # await = wait for message delivery to complete
@@ -909,7 +888,7 @@ async def send_response(
     CROSS-SYSTEM CONNECTIONS IN pepper'S WORKFLOW:
     - Called by: whatsapp_handler() with output from Pepper's LangGraph state (lines 211, 218, 222)
     - Receives: response_text from conversation_node/image_node/audio_node
-    - Receives: media_content from state.audio_buffer or state.image_path
+    - Receives: media_content from text_to_speech.synthesize() or state.image_path
     - Uses: upload_media() for audio/image delivery to WhatsApp servers
     - Compares to: Chainlit's cl.Message/cl.Audio/cl.Image UI elements (same content, different delivery)
     
@@ -1123,7 +1102,7 @@ async def upload_media(media_content: BytesIO, mime_type: str) -> str:
     
     CROSS-SYSTEM CONNECTIONS IN pepper'S WORKFLOW:
     - Called by: send_response() for audio/image message types (lines 399, 449)
-    - Receives: Audio buffer from state.audio_buffer (audio_node output)
+    - Receives: Audio buffer from text_to_speech.synthesize() (audio_node's reply, voiced)
     - Receives: Image data from state.image_path (image_node output)
     - Returns: media_id that gets used in WhatsApp message payload by send_response()
     - Media source: IDENTICAL audio/image generation as Chainlit interface (same AI models)
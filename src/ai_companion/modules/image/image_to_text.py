@@ -28,10 +28,15 @@ from ai_companion.core.exceptions import ImageToTextError
 # Centralized configuration makes it easy to change models or settings across the system
 from ai_companion.settings import settings
 
+# httpx = the HTTP library the Groq SDK uses under the hood (for the shared connection pool)
+import httpx
+
 # Groq is the AI service that provides vision capabilities
 # Same company that provides Pepper's LLM processing and speech recognition
 # Offers fast, cost-effective access to advanced AI models including vision
-from groq import Groq
+# AsyncGroq = the async client, so awaiting a vision call frees the event loop for other
+# work (other users, other images analyzed at the same time) instead of blocking it
+from groq import AsyncGroq
 
 
 class ImageToText:
@@ -69,7 +74,7 @@ class ImageToText:
     # Environment variables keep API keys secure and out of source code
     REQUIRED_ENV_VARS = ["GROQ_API_KEY"]
 
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         """
         🔧 INITIALIZE pepper'S VISION SYSTEM - Set up image analysis capabilities
         
@@ -90,7 +95,12 @@ class ImageToText:
         # PREPARE CLIENT STORAGE (LAZY INITIALIZATION)
         # _client starts as None, gets created only when needed (singleton pattern)
         # This avoids creating expensive network connections during startup
-        self._client: Optional[Groq] = None
+        self._client: Optional[AsyncGroq] = None
+
+        # OPTIONAL SHARED HTTP CONNECTION POOL
+        # Interfaces can pass one httpx.AsyncClient to several modules so their API calls
+        # reuse warm connections (no new TCP + TLS handshake per call). None = Groq's own pool
+        self._http_client = http_client
         
         # SET UP LOGGING FOR THIS SPECIFIC MODULE
         # __name__ = "ai_companion.modules.image.image_to_text"
@@ -134,7 +144,7 @@ class ImageToText:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
     @property
-    def client(self) -> Groq:
+    def client(self) -> AsyncGroq:
         """
         🔌 GROQ CLIENT MANAGER - Creates and reuses connection to Groq's vision AI service
         
@@ -163,7 +173,7 @@ class ImageToText:
             # settings.GROQ_API_KEY comes from environment variables via settings.py
             # Groq() constructor creates authenticated connection to Groq's AI services
             # This is the expensive operation we only want to do once
-            self._client = Groq(api_key=settings.GROQ_API_KEY)
+            self._client = AsyncGroq(api_key=settings.GROQ_API_KEY, http_client=self._http_client)
         
         # RETURN CLIENT (EITHER NEWLY CREATED OR EXISTING)
         # Caller gets a working Groq client ready for image analysis
@@ -219,7 +229,7 @@ class ImageToText:
             ]
 
             # Make the API call
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=settings.ITT_MODEL_NAME,
                 messages=messages,
                 max_tokens=1000,
@@ -1,5 +1,9 @@
 # STANDARD LIBRARY IMPORTS - Python's built-in tools
 
+# asyncio.to_thread() runs the synchronous Together SDK call and the file write in a worker thread
+# so a multi-second image generation doesn't freeze every other conversation
+import asyncio
+
 # base64 handles binary data encoding/decoding for image files
 # Images from Together AI come as base64 strings that need conversion to bytes
 import base64
@@ -169,6 +173,12 @@ class TextToImage:
         # _together_client starts as None, gets created only when needed
         # Avoids expensive network connections during Pepper's startup
         self._together_client: Optional[Together] = None
+
+        # GROQ CHAINS ARE BUILT ON FIRST USE AND THEN REUSED (see scenario_chain / enhance_chain)
+        # Each ChatGroq owns its own HTTP connection pool, so building a new one per image
+        # meant a fresh TCP + TLS handshake to Groq on every request
+        self._scenario_chain = None
+        self._enhance_chain = None
         
         # SET UP LOGGING FOR IMAGE GENERATION DEBUGGING
         # Records successful generations and failures for production monitoring
@@ -230,6 +240,44 @@ class TextToImage:
         # Same client instance used for all of Pepper's image generation needs
         return self._together_client
 
+    @property
+    def scenario_chain(self):
+        """🎬 SCENARIO CHAIN - Prompt → Groq structured output (ScenarioPrompt), built once and reused"""
+        if self._scenario_chain is None:
+            llm = ChatGroq(
+                model=settings.TEXT_MODEL_NAME,
+                api_key=settings.GROQ_API_KEY,
+                temperature=0.4,
+                max_retries=2,
+            )
+            self._scenario_chain = (
+                PromptTemplate(
+                    input_variables=["chat_history"],
+                    template=IMAGE_SCENARIO_PROMPT,
+                )
+                | llm.with_structured_output(ScenarioPrompt)
+            )
+        return self._scenario_chain
+
+    @property
+    def enhance_chain(self):
+        """✨ ENHANCEMENT CHAIN - Prompt → Groq structured output (EnhancedPrompt), built once and reused"""
+        if self._enhance_chain is None:
+            llm = ChatGroq(
+                model=settings.TEXT_MODEL_NAME,
+                api_key=settings.GROQ_API_KEY,
+                temperature=0.25,
+                max_retries=2,
+            )
+            self._enhance_chain = (
+                PromptTemplate(
+                    input_variables=["prompt"],
+                    template=IMAGE_ENHANCEMENT_PROMPT,
+                )
+                | llm.with_structured_output(EnhancedPrompt)
+            )
+        return self._enhance_chain
+
     async def generate_image(self, prompt: str, output_path: str = "") -> bytes:
         """Generate an image from a prompt using Together AI."""
         if not prompt.strip():
@@ -238,7 +286,9 @@ class TextToImage:
         try:
             self.logger.info(f"Generating image for prompt: '{prompt}'")
 
-            response = self.together_client.images.generate(
+            # The Together SDK is synchronous - asyncio.to_thread() keeps the wait off the event loop
+            response = await asyncio.to_thread(
+                self.together_client.images.generate,
                 prompt=prompt,
                 model=settings.TTI_MODEL_NAME,
                 width=1024,
@@ -251,9 +301,7 @@ class TextToImage:
             image_data = base64.b64decode(response.data[0].b64_json)
 
             if output_path:
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(image_data)
+                await asyncio.to_thread(self._save_image, image_data, output_path)
                 self.logger.info(f"Image saved to {output_path}")
 
             return image_data
@@ -261,6 +309,13 @@ class TextToImage:
         except Exception as e:
             raise TextToImageError(f"Failed to generate image: {str(e)}") from e
 
+    @staticmethod
+    def _save_image(image_data: bytes, output_path: str) -> None:
+        """Write the image to disk (blocking - called through asyncio.to_thread)."""
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(image_data)
+
     async def create_scenario(self, chat_history: list = None) -> ScenarioPrompt:
         """Creates a first-person narrative scenario and corresponding image prompt based on chat history."""
         try:
@@ -268,24 +323,8 @@ class TextToImage:
 
             self.logger.info("Creating scenario from chat history")
 
-            llm = ChatGroq(
-                model=settings.TEXT_MODEL_NAME,
-                api_key=settings.GROQ_API_KEY,
-                temperature=0.4,
-                max_retries=2,
-            )
-
-            structured_llm = llm.with_structured_output(ScenarioPrompt)
-
-            chain = (
-                PromptTemplate(
-                    input_variables=["chat_history"],
-                    template=IMAGE_SCENARIO_PROMPT,
-                )
-                | structured_llm
-            )
-
-            scenario = chain.invoke({"chat_history": formatted_history})
+            # ainvoke() = async LLM call (invoke() would block the event loop for the whole request)
+            scenario = await self.scenario_chain.ainvoke({"chat_history": formatted_history})
             self.logger.info(f"Created scenario: {scenario}")
 
             return scenario
@@ -298,24 +337,7 @@ class TextToImage:
         try:
             self.logger.info(f"Enhancing prompt: '{prompt}'")
 
-            llm = ChatGroq(
-                model=settings.TEXT_MODEL_NAME,
-                api_key=settings.GROQ_API_KEY,
-                temperature=0.25,
-                max_retries=2,
-            )
-
-            structured_llm = llm.with_structured_output(EnhancedPrompt)
-
-            chain = (
-                PromptTemplate(
-                    input_variables=["prompt"],
-                    template=IMAGE_ENHANCEMENT_PROMPT,
-                )
-                | structured_llm
-            )
-
-            enhanced_prompt = chain.invoke({"prompt": prompt}).content
+            enhanced_prompt = (await self.enhance_chain.ainvoke({"prompt": prompt})).content
             self.logger.info(f"Enhanced prompt: '{enhanced_prompt}'")
 
             return enhanced_prompt
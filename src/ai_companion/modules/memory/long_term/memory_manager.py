@@ -1,5 +1,9 @@
 # STANDARD LIBRARY IMPORTS - Python's built-in tools for memory management
 
+# asyncio.to_thread() runs the synchronous vector database calls in a worker thread,
+# so embedding + Qdrant round-trips don't freeze every other conversation meanwhile
+import asyncio
+
 # logging is Python's system for recording what happens when Pepper processes memories
 # This helps us debug issues like "Why didn't Pepper remember what I told her yesterday?"
 import logging
@@ -265,7 +269,8 @@ class MemoryManager:
             # find_similar_memory() searches existing memories for similar content
             # Returns existing memory if we already have something very similar
             # Prevents storing "My name is John" multiple times
-            similar = self.vector_store.find_similar_memory(analysis.formatted_memory)
+            # asyncio.to_thread() = the embedding model + Qdrant client are synchronous, run them off the event loop
+            similar = await asyncio.to_thread(self.vector_store.find_similar_memory, analysis.formatted_memory)
             
             if similar:
                 # DUPLICATE FOUND - SKIP STORAGE
@@ -278,8 +283,9 @@ class MemoryManager:
             # Log successful storage for debugging and monitoring
             self.logger.info(f"Storing new memory: '{analysis.formatted_memory}'")
             
-            # Actually store the memory in vector database
-            self.vector_store.store_memory(
+            # Actually store the memory in vector database (in a worker thread, same as the search above)
+            await asyncio.to_thread(
+                self.vector_store.store_memory,
                 # TEXT: The formatted memory content to store
                 text=analysis.formatted_memory,
                 
@@ -1,4 +1,5 @@
+from .sentence_aggregator import SentenceAggregator
 from .speech_to_text import SpeechToText
 from .text_to_speech import TextToSpeech
 
-__all__ = ["SpeechToText", "TextToSpeech"]
+__all__ = ["SentenceAggregator", "SpeechToText", "TextToSpeech"]
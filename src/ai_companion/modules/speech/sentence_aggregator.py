@@ -0,0 +1,65 @@
+# STANDARD LIBRARY IMPORTS - Python's built-in tools
+
+# re = regular expressions, used to spot where a sentence ends
+import re
+
+# typing provides type hints for better code clarity and error prevention
+# List = a list of items, Optional = value that might be None
+from typing import List, Optional
+
+# SENTENCE BOUNDARY - ". ", "! ", "?! " etc., optionally followed by a closing quote/bracket
+# Requiring whitespace AFTER the punctuation means "3.5" or "ai.com" never count as an ending,
+# and a sentence that ends right at the edge of a chunk waits until the next chunk arrives
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s")
+
+# WORDS THAT END IN A DOT BUT DON'T END THE SENTENCE
+_ABBREVIATIONS = frozenset(
+    {"dr.", "mr.", "mrs.", "ms.", "prof.", "st.", "jr.", "sr.", "vs.", "etc.", "e.g.", "i.e."}
+)
+
+
+class SentenceAggregator:
+    """
+    ✂️ SENTENCE AGGREGATOR - Turns a stream of LLM tokens into complete sentences for TTS
+
+    WHAT IT DOES:
+    The LLM streams Pepper's reply a word or two at a time. Voice synthesis needs whole
+    sentences (half a sentence sounds robotic), but waiting for the WHOLE reply means the
+    user hears nothing until the LLM is completely done. This class sits in between:
+    push() tokens in, and every time a sentence is complete it comes back out, ready to speak.
+
+    RULES (same idea as Pipecat's SentenceAggregator):
+    - A sentence ends at . ! or ? followed by whitespace
+    - "Dr." / "Mr." / "e.g." don't end a sentence, and decimals like 3.5 never match
+    - Sentences shorter than min_length get merged with the next one (tiny clips sound choppy)
+
+    USED BY:
+    - Chainlit on_audio_end: the first sentence is voiced while the LLM writes the rest
+    """
+
+    def __init__(self, min_length: int = 10):
+        self.min_length = min_length
+        # buffer = text received since the last complete sentence was handed out
+        self.buffer = ""
+
+    def push(self, text: str) -> List[str]:
+        """Add streamed text, returning any sentences it completed (often none)"""
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self.buffer):
+            sentence = self.buffer[start:match.end()].strip()
+            last_word = sentence.rsplit(None, 1)[-1].lower().rstrip("\"')]")
+            # Too short or an abbreviation - keep going, it becomes part of the next sentence
+            if len(sentence) < self.min_length or last_word in _ABBREVIATIONS:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the stream has ended (the last sentence may lack a space)"""
+        remainder = self.buffer.strip()
+        self.buffer = ""
+        return remainder or None
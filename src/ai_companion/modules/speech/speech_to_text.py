@@ -1,5 +1,8 @@
 # STANDARD LIBRARY IMPORTS - Python's built-in tools for file and system operations
 
+# logging records when the English-only model is rejected and the fallback model takes over
+import logging
+
 # os provides access to operating system functions like environment variables
 # Used to safely access API keys and clean up temporary files
 import os
@@ -25,10 +28,27 @@ from ai_companion.settings import settings
 
 # GROQ IMPORT - AI service for speech recognition
 
+# httpx = the HTTP library the Groq SDK uses under the hood (for the shared connection pool)
+import httpx
+
 # Groq provides fast, cost-effective access to OpenAI's Whisper speech recognition models
 # Same service that powers Pepper's language processing and image analysis
 # Offers better performance and pricing than directly using OpenAI's API
-from groq import Groq
+# AsyncGroq = the async client, so the event loop keeps working while Whisper transcribes
+from groq import AsyncGroq, BadRequestError, NotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+def _is_model_unavailable(error: Exception) -> bool:
+    """Is this Groq error about the MODEL itself (unknown or decommissioned), not the audio?"""
+    if isinstance(error, NotFoundError):
+        return True
+    # Groq's error body: {"error": {"code": "model_decommissioned", ...}} (or just the inner dict)
+    body = getattr(error, "body", None)
+    if isinstance(body, dict):
+        body = body.get("error", body)
+    return isinstance(body, dict) and body.get("code") == "model_decommissioned"
 
 
 class SpeechToText:
@@ -73,7 +93,7 @@ class SpeechToText:
     # GROQ_API_KEY provides access to Whisper models via Groq's optimized infrastructure
     REQUIRED_ENV_VARS = ["GROQ_API_KEY"]
 
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         """
         🔧 INITIALIZE pepper'S HEARING SYSTEM - Set up speech recognition capabilities
         
@@ -94,7 +114,24 @@ class SpeechToText:
         # PREPARE CLIENT STORAGE (LAZY INITIALIZATION)
         # _client starts as None, gets created only when first voice message arrives
         # Avoids expensive network connections during Pepper's startup process
-        self._client: Optional[Groq] = None
+        self._client: Optional[AsyncGroq] = None
+
+        # OPTIONAL SHARED HTTP CONNECTION POOL
+        # Interfaces can pass one httpx.AsyncClient to several modules so their API calls
+        # reuse warm connections (no new TCP + TLS handshake per call). None = Groq's own pool
+        self._http_client = http_client
+
+        # PICK THE WHISPER MODEL ONCE (not on every voice message)
+        # English-only traffic: language="en" pinned, so Whisper skips language detection
+        # Multilingual traffic: the full model, and Whisper detects the language itself
+        # If Groq no longer serves the English-only model, transcribe() retries that one message
+        # on the multilingual setup (the choice made here is never changed after startup)
+        if settings.STT_ENGLISH_ONLY:
+            self.model_name = settings.STT_ENGLISH_MODEL_NAME
+            self.language_kwargs = {"language": "en"}
+        else:
+            self.model_name = settings.STT_MODEL_NAME
+            self.language_kwargs = {}  # No language = Whisper auto-detects it
 
     def _validate_env_vars(self) -> None:
         """
@@ -124,7 +161,7 @@ class SpeechToText:
             raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
     @property
-    def client(self) -> Groq:
+    def client(self) -> AsyncGroq:
         """
         🔌 GROQ CLIENT MANAGER - Creates and reuses connection to speech recognition service
         
@@ -155,13 +192,33 @@ class SpeechToText:
             # settings.GROQ_API_KEY comes from environment variables via settings.py
             # Groq() constructor creates authenticated connection to Groq's AI services
             # This is the expensive operation we only want to do once
-            self._client = Groq(api_key=settings.GROQ_API_KEY)
+            self._client = AsyncGroq(api_key=settings.GROQ_API_KEY, http_client=self._http_client)
         
         # RETURN CLIENT (EITHER NEWLY CREATED OR EXISTING)
         # Caller gets a working Groq client ready for speech recognition
         # Same client instance will be returned for all future calls (singleton)
         return self._client
 
+    async def _create_transcription(self, audio_file, model_name: str, language_kwargs: dict) -> str:
+        """🎙️ WHISPER API CALL - Sends one audio file to Groq with the given model"""
+        # CALL GROQ'S WHISPER SPEECH RECOGNITION API
+        # self.client gets our singleton Groq client (created once, reused)
+        # .audio.transcriptions.create() is the standard Whisper API call
+        return await self.client.audio.transcriptions.create(
+            # FILE: The actual audio file to transcribe
+            file=audio_file,
+
+            # MODEL: chosen in __init__ from settings (or the fallback model, see transcribe)
+            model=model_name,
+
+            # LANGUAGE: "en" for the English-only model, left out = let Whisper detect it
+            **language_kwargs,
+
+            # RESPONSE_FORMAT: Return plain text (not JSON or other formats)
+            # We just want the transcribed words, not metadata
+            response_format="text",
+        )
+
     async def transcribe(self, audio_data: bytes) -> str:
         """
         🎤 SPEECH TRANSCRIPTION ENGINE - Converts voice messages to text for Pepper's brain
@@ -231,26 +288,25 @@ class SpeechToText:
                 # "rb" = read binary mode (audio files are binary data, not text)
                 # with open() automatically closes file after API call completes
                 with open(temp_file_path, "rb") as audio_file:
-                    
-                    # CALL GROQ'S WHISPER SPEECH RECOGNITION API
-                    # self.client gets our singleton Groq client (created once, reused)
-                    # .audio.transcriptions.create() is the standard Whisper API call
-                    transcription = self.client.audio.transcriptions.create(
-                        # FILE: The actual audio file to transcribe
-                        file=audio_file,
-                        
-                        # MODEL: Whisper large v3 turbo (best balance of speed and accuracy)
-                        # "turbo" version is optimized for faster processing
-                        model="whisper-large-v3-turbo",
-                        
-                        # LANGUAGE: Optimize for English processing
-                        # Could support other languages by changing this parameter
-                        language="en",
-                        
-                        # RESPONSE_FORMAT: Return plain text (not JSON or other formats)
-                        # We just want the transcribed words, not metadata
-                        response_format="text",
-                    )
+                    try:
+                        transcription = await self._create_transcription(
+                            audio_file, self.model_name, self.language_kwargs
+                        )
+                    except (BadRequestError, NotFoundError) as e:
+                        # MODEL GONE (Groq retired or doesn't serve it) - retry THIS message on the
+                        # multilingual model with language auto-detection. Any other 400 (e.g. a
+                        # truncated clip) is a real error, and nothing here changes the shared
+                        # instance, so one bad request never affects other users' transcriptions
+                        if self.model_name == settings.STT_MODEL_NAME or not _is_model_unavailable(e):
+                            raise
+                        logger.warning(
+                            "Groq rejected STT model %s, retrying with %s: %s",
+                            self.model_name,
+                            settings.STT_MODEL_NAME,
+                            e,
+                        )
+                        audio_file.seek(0)  # Re-send the same recording from the start
+                        transcription = await self._create_transcription(audio_file, settings.STT_MODEL_NAME, {})
 
                 # VALIDATE API RESPONSE
                 # Check that Whisper actually returned transcribed text
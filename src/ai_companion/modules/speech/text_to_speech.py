@@ -1,9 +1,15 @@
 # STANDARD LIBRARY IMPORTS - Python's built-in tools
 
+# asyncio.to_thread = run ElevenLabs' blocking (synchronous) client off the event loop
+import asyncio
+
 # os provides access to operating system functions like environment variables
 # Used to safely access API keys stored as environment variables (not hardcoded)
 import os
 
+# lru_cache(maxsize=1) = build the shared ElevenLabs client once per process
+from functools import lru_cache
+
 # typing provides type hints for better code clarity and error prevention
 # Optional = value that might be None
 from typing import Optional
@@ -20,12 +26,33 @@ from ai_companion.settings import settings
 
 # ELEVENLABS IMPORTS - AI voice synthesis service
 
+# httpx = the HTTP library the ElevenLabs SDK uses under the hood (for the shared connection pool)
+import httpx
+
 # ElevenLabs is the AI service that creates realistic human-like speech from text
 # Specialized in high-quality voice synthesis with natural intonation and emotion
 # Much better than basic text-to-speech systems (sounds like a real person talking)
 from elevenlabs import ElevenLabs, Voice, VoiceSettings
 
 
+@lru_cache(maxsize=1)
+def _get_shared_client() -> ElevenLabs:
+    """🔌 SHARED ELEVENLABS CONNECTION - One client (and one warm connection pool) per process"""
+    # Every new HTTPS connection to api.elevenlabs.io costs a TCP + TLS handshake before any
+    # audio is made. Chainlit, WhatsApp and the graph each own a TextToSpeech, so they share
+    # this one client instead of each dialing their own connections.
+    # keepalive_expiry=120 = keep idle connections open for 2 minutes (httpx's default is 5s,
+    # shorter than the pause between two voice turns, so every turn used to re-handshake)
+    # max_keepalive_connections=16 = room for a reply's sentences being synthesized in parallel
+    return ElevenLabs(
+        api_key=settings.ELEVENLABS_API_KEY,
+        httpx_client=httpx.Client(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=120.0),
+        ),
+    )
+
+
 class TextToSpeech:
     """
     🗣️ pepper'S SPEAKING SYSTEM - Pepper's ability to speak text responses as realistic voice
@@ -161,11 +188,11 @@ class TextToSpeech:
         # self._client starts as None during initialization
         # Once created, this condition becomes False and we reuse existing client
         if self._client is None:
-            # CREATE NEW ELEVENLABS CLIENT WITH API KEY
+            # GET THE PROCESS-WIDE ELEVENLABS CLIENT
             # settings.ELEVENLABS_API_KEY comes from environment variables via settings.py
-            # ElevenLabs() constructor creates authenticated connection to voice synthesis service
-            # This is the expensive operation we only want to do once
-            self._client = ElevenLabs(api_key=settings.ELEVENLABS_API_KEY)
+            # _get_shared_client() builds the authenticated client once and every
+            # TextToSpeech reuses it (and its already-open connections)
+            self._client = _get_shared_client()
         
         # RETURN CLIENT (EITHER NEWLY CREATED OR EXISTING)
         # Caller gets a working ElevenLabs client ready for voice synthesis
@@ -223,43 +250,11 @@ class TextToSpeech:
         # try/except ensures graceful failure with helpful error messages
         # All errors get converted to TextToSpeechError for consistent handling
         try:
-            # STEP 1: GENERATE VOICE AUDIO USING ELEVENLABS
-            # self.client gets our singleton ElevenLabs client (created once, reused)
-            # .generate() is the main voice synthesis method
-            
-            audio_generator = self.client.generate(
-                # TEXT: The actual words for Pepper to speak
-                text=text,
-                
-                # VOICE CONFIGURATION: Defines how Pepper sounds
-                voice=Voice(
-                    # VOICE_ID: Specific voice identity that makes Pepper sound consistent
-                    # settings.ELEVENLABS_VOICE_ID comes from environment variables
-                    # This ensures Pepper always sounds like the same person
-                    voice_id=settings.ELEVENLABS_VOICE_ID,
-                    
-                    # VOICE SETTINGS: Fine-tune voice characteristics
-                    settings=VoiceSettings(
-                        # STABILITY: How consistent the voice sounds (0.5 = balanced)
-                        # Higher = more stable/consistent, Lower = more variable/expressive
-                        stability=0.5,
-                        
-                        # SIMILARITY_BOOST: How closely to match the original voice (0.5 = natural)
-                        # Higher = closer to training voice, Lower = more generalized
-                        similarity_boost=0.5
-                    ),
-                ),
-                
-                # MODEL: Which ElevenLabs model to use for synthesis
-                # settings.TTS_MODEL_NAME comes from configuration (like "eleven_monolingual_v1")
-                model=settings.TTS_MODEL_NAME,
-            )
-
-            # STEP 2: CONVERT GENERATOR TO COMPLETE AUDIO BYTES
-            # ElevenLabs returns a generator that produces audio chunks over time
-            # b"".join() combines all chunks into one complete audio file
-            # This is more efficient than loading everything into memory at once
-            audio_bytes = b"".join(audio_generator)
+            # GENERATE IN A WORKER THREAD
+            # The ElevenLabs client is synchronous - calling it directly would freeze the whole
+            # event loop (every other user, and the LLM still streaming the rest of this reply)
+            # for the entire synthesis. asyncio.to_thread() lets all of that keep running.
+            audio_bytes = await asyncio.to_thread(self._generate_audio, text)
             
             # VALIDATE AUDIO GENERATION SUCCEEDED
             # Check that ElevenLabs actually generated audio data
@@ -280,3 +275,46 @@ class TextToSpeech:
             # "from e" preserves original error details for debugging
             # str(e) converts any exception to readable error message
             raise TextToSpeechError(f"Text-to-speech conversion failed: {str(e)}") from e
+
+    def _generate_audio(self, text: str) -> bytes:
+        """🧵 BLOCKING SYNTHESIS - The actual ElevenLabs call (runs in a worker thread)"""
+        # STEP 1: GENERATE VOICE AUDIO USING ELEVENLABS
+        # self.client gets our singleton ElevenLabs client (created once, reused)
+        # .generate() is the main voice synthesis method
+        audio_generator = self.client.generate(
+            # TEXT: The actual words for Pepper to speak
+            text=text,
+            
+            # VOICE CONFIGURATION: Defines how Pepper sounds
+            voice=Voice(
+                # VOICE_ID: Specific voice identity that makes Pepper sound consistent
+                # settings.ELEVENLABS_VOICE_ID comes from environment variables
+                # This ensures Pepper always sounds like the same person
+                voice_id=settings.ELEVENLABS_VOICE_ID,
+                
+                # VOICE SETTINGS: Fine-tune voice characteristics
+                settings=VoiceSettings(
+                    # STABILITY: How consistent the voice sounds (0.5 = balanced)
+                    # Higher = more stable/consistent, Lower = more variable/expressive
+                    stability=0.5,
+                    
+                    # SIMILARITY_BOOST: How closely to match the original voice (0.5 = natural)
+                    # Higher = closer to training voice, Lower = more generalized
+                    similarity_boost=0.5
+                ),
+            ),
+            
+            # MODEL: Which ElevenLabs model to use for synthesis
+            # settings.TTS_MODEL_NAME comes from configuration (like "eleven_monolingual_v1")
+            model=settings.TTS_MODEL_NAME,
+
+            # SPEED OVER STUDIO QUALITY: a smaller MP3 (less to download and forward to the user)
+            # and ElevenLabs' latency optimizations (first audio arrives sooner)
+            output_format=settings.TTS_OUTPUT_FORMAT,
+            optimize_streaming_latency=settings.TTS_OPTIMIZE_STREAMING_LATENCY,
+        )
+
+        # STEP 2: CONVERT GENERATOR TO COMPLETE AUDIO BYTES
+        # ElevenLabs returns a generator that produces audio chunks over time
+        # b"".join() combines all chunks into one complete audio file
+        return b"".join(audio_generator)
@@ -33,6 +33,7 @@ THE SETTINGS CATEGORIES:
 """
 
 # Pydantic for type-safe settings management with automatic .env loading
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -119,9 +120,48 @@ class Settings(BaseSettings):
                                                          # Converts your voice messages to text
                                                          # Used by: WhatsApp voice message processing
     
+    STT_ENGLISH_MODEL_NAME: str = "whisper-large-v3-turbo"  # Speech-to-text model for English-only input
+                                                             # Pinning language="en" skips Whisper's language detection
+                                                             # If Groq no longer serves this model, that message is
+                                                             # retried on STT_MODEL_NAME with language auto-detection
+                                                             # Used by: SpeechToText when STT_ENGLISH_ONLY is on
+    
+    STT_ENGLISH_ONLY: bool = False                      # False = STT_MODEL_NAME + automatic language detection
+                                                         # True = force English with STT_ENGLISH_MODEL_NAME - only for
+                                                         # English-only users (other languages get an English-forced transcript)
+                                                         # Used by: SpeechToText (Chainlit + WhatsApp voice input)
+    
+    STT_PARTIAL_INTERVAL_SECONDS: float = 0.0           # Live transcript while recording (Chainlit voice input)
+                                                         # Re-transcribe the recording so far every N seconds
+                                                         # 0 = off (one transcription after recording ends)
+                                                         # COST: every pass re-uploads the WHOLE recording, so a
+                                                         # 20s note at 2.0 pays for ~10 extra Whisper calls
+    
     TTS_MODEL_NAME: str = "eleven_flash_v2_5"           # Text-to-speech model
                                                          # Converts Pepper's text to her voice
                                                          # Used by: audio_node for voice responses
+
+    TTS_OUTPUT_FORMAT: str = "mp3_22050_32"             # ElevenLabs audio format: codec_samplerate_kbps
+                                                         # 22kHz / 32kbps MP3 = 1/4 the bytes of the default
+                                                         # mp3_44100_128, still clear for a single speaking voice
+                                                         # MP3 ONLY: every player and upload is labelled audio/mpeg,
+                                                         # and Chainlit paces clips by the kbps in the name
+                                                         # Used by: TextToSpeech (Chainlit + WhatsApp voice replies)
+
+    @field_validator("TTS_OUTPUT_FORMAT")
+    @classmethod
+    def _check_mp3_format(cls, value: str) -> str:
+        # Catch e.g. pcm_16000 / ulaw_8000 at startup: their last number is a sample rate, not
+        # a bitrate, and the audio wouldn't be MP3 - fail loudly instead of pacing clips 100x off
+        codec, _, kbps = value.rpartition("_")
+        if not codec.startswith("mp3_") or not kbps.isdigit():
+            raise ValueError(f"TTS_OUTPUT_FORMAT must be an mp3_<samplerate>_<kbps> format, got {value!r}")
+        return value
+
+    TTS_OPTIMIZE_STREAMING_LATENCY: int = 3             # ElevenLabs latency optimization, 0 (off) to 4 (max)
+                                                         # 3 = fastest first audio with text normalization kept;
+                                                         # 4 also skips normalization and misreads numbers/dates
+                                                         # Used by: TextToSpeech + the Vapi phone voice
     
     TTI_MODEL_NAME: str = "black-forest-labs/FLUX.1-schnell-Free"  # Text-to-image model
                                                                     # Creates images from descriptions
@@ -150,6 +190,12 @@ class Settings(BaseSettings):
                                               # Rest get compressed into summary text
                                               # Used by: summarize_conversation_node
 
+    GEMINI_PERSONA_CACHE_TTL_SECONDS: int = 0  # Gemini context cache for Pepper's character card
+                                              # 0 = off (full prompt sent every turn), e.g. 3600 = refresh hourly
+                                              # Gemini only caches prompts above the model's minimum size (1024 tokens
+                                              # for 2.5 Flash) - a smaller card just logs one warning per TTL window
+                                              # Used by: get_character_response_chain via get_or_create_persona_cache
+
     # 💾 DATABASE PATHS - Where Pepper stores different types of data
     
     SHORT_TERM_MEMORY_DB_PATH: str = "/tmp/memory.db"  # Local database for conversation state
@@ -157,6 +203,18 @@ class Settings(BaseSettings):
                                                        # Different from Qdrant (long-term memory)
                                                        # Used by: conversation persistence
 
+    # 🖥️ CHAINLIT UI OPTIONS - Web interface extras
+    
+    CHAINLIT_SHOW_STEPS: bool = False        # True = show a "Run" step around each graph call
+                                             # Handy for debugging, but costs extra WebSocket events per turn
+                                             # Used by: Chainlit on_message
+
+    # 🌐 WEBHOOK SERVER OPTIONS - The FastAPI app behind WhatsApp + Vapi
+
+    WEBHOOK_API_DOCS: bool = False           # True = serve /docs, /redoc and /openapi.json
+                                             # Handy locally; off in production so no schema is built
+                                             # Used by: webhook_endpoint.py
+
     # 📞 VOICE CALLING CONFIGURATION (VAPI) - Enable "call me" functionality
     # Vapi is the service that handles actual phone calls when users request them
     
@@ -193,6 +251,26 @@ class Settings(BaseSettings):
                                              # Note: Uses Vapi's routing, not direct OpenAI
                                              # Used by: Vapi assistant during phone calls
 
+    VAPI_REPLY_CACHE_SIZE: int = 256         # Phone-call replies remembered for repeated questions
+                                             # ("hello", "are you there?") - 0 turns the cache off
+                                             # PER WORKER: each uvicorn worker keeps its own cache
+                                             # Used by: /vapi/chat/completions
+    
+    VAPI_REPLY_CACHE_TTL_SECONDS: int = 600  # How long a cached phone-call reply stays valid
+                                             # Keeps replies fresh as Pepper's day moves on
+                                             # Used by: /vapi/chat/completions
+
+    VAPI_MAX_CONCURRENT_REPLIES: int = 8     # Phone-call replies generated at the same time
+                                             # Extra callers wait for a free slot; once as many are
+                                             # waiting as running, new turns get a short "busy" reply
+                                             # PER WORKER: WEB_CONCURRENCY=2 allows 2 x this in total
+                                             # Used by: /vapi/chat/completions
+
+    VAPI_MAX_HISTORY: int = 8                # Latest messages of a phone call's thread sent with each reply
+                                             # Bounds the prompt (and the caller's wait) without an extra
+                                             # summarization LLM call on the reply path
+                                             # Used by: conversation_node / audio_node (nodes.py)
+
 
 # STEP 5: Create the global settings instance
 # This object gets imported by other files to access configuration